@@ -1,5 +1,7 @@
 import config
-import RPi.GPIO as GPIO
+from config import GPIO
+import numpy as np
+import time
 
 
 ScanMode = 0
@@ -65,46 +67,113 @@ CMD = {'CMD_WAKEUP' : 0x00,     # Completes SYNC and Exits Standby Mode 0000  00
        'CMD_RESET' : 0xFE,      # Reset to Power-Up Values 1111   1110 (FEh)
       }
 
+class DRDYTimeoutError(Exception):
+    pass
+
+# Decode raw 24-bit big-endian two's complement codes (n x 3 bytes) to int32
+def ADS1256_DecodeBuffer(raw):
+    raw = np.asarray(raw, dtype=np.uint8).reshape(-1, 3)
+    codes = (raw[:, 0].astype(np.int32) << 16) | (raw[:, 1].astype(np.int32) << 8) | raw[:, 2]
+    return (codes ^ 0x800000) - 0x800000
+
+# Preallocated ring buffer for RDATAC samples, kept as raw bytes until decoded
+class ADS1256_RingBuffer:
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.raw = np.zeros((capacity, 3), dtype=np.uint8)
+        self.head = 0       # next write slot
+        self.count = 0      # valid samples in buffer
+        self.overruns = 0   # samples overwritten before being read
+
+    def put(self, data):
+        self.raw[self.head] = data
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.overruns += 1
+
+    def latest(self, n=None):
+        if n is None or n > self.count:
+            n = self.count
+        idx = (self.head - n + np.arange(n)) % self.capacity
+        return ADS1256_DecodeBuffer(self.raw[idx])
+
+    def drain(self):
+        codes = self.latest()
+        self.clear()
+        return codes
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
 class ADS1256:
-    def __init__(self):
-        self.rst_pin = config.RST_PIN
-        self.cs_pin = config.CS_PIN
-        self.drdy_pin = config.DRDY_PIN
+    # Pins default to the single-board wiring in config; spi=None means config.SPI
+    def __init__(self, cs_pin=None, drdy_pin=None, rst_pin=None, spi=None):
+        self.rst_pin = config.RST_PIN if rst_pin is None else rst_pin
+        self.cs_pin = config.CS_PIN if cs_pin is None else cs_pin
+        self.drdy_pin = config.DRDY_PIN if drdy_pin is None else drdy_pin
+        self.spi = spi
+        self.spi_hz = None
+        self.continuous = False
+        self.ring = ADS1256_RingBuffer()
+        self.scan_stats = {}
 
     # Hardware reset
+    # RST only has to stay low for 4 tCLKIN; ReadChipID then waits on DRDY
     def ADS1256_reset(self):
         config.digital_write(self.rst_pin, GPIO.HIGH)
-        config.delay_ms(200)
+        config.delay_ms(1)
         config.digital_write(self.rst_pin, GPIO.LOW)
-        config.delay_ms(200)
+        config.delay_ms(1)
         config.digital_write(self.rst_pin, GPIO.HIGH)
     
     def ADS1256_WriteCmd(self, reg):
-        config.digital_write(self.cs_pin, GPIO.LOW)#cs  0
-        config.spi_writebyte([reg])
-        config.digital_write(self.cs_pin, GPIO.HIGH)#cs 1
+        config.spi_transaction([reg], cs_pin=self.cs_pin, spi=self.spi)
     
     def ADS1256_WriteReg(self, reg, data):
-        config.digital_write(self.cs_pin, GPIO.LOW)#cs  0
-        config.spi_writebyte([CMD['CMD_WREG'] | reg, 0x00, data])
-        config.digital_write(self.cs_pin, GPIO.HIGH)#cs 1
+        config.spi_transaction([CMD['CMD_WREG'] | reg, 0x00, data], cs_pin=self.cs_pin, spi=self.spi)
         
     def ADS1256_Read_data(self, reg):
-        config.digital_write(self.cs_pin, GPIO.LOW)#cs  0
-        config.spi_writebyte([CMD['CMD_RREG'] | reg, 0x00])
-        data = config.spi_readbytes(1)
-        config.digital_write(self.cs_pin, GPIO.HIGH)#cs 1
+        return self.ADS1256_ReadRegs(reg, 1)
 
-        return data
-        
-    def ADS1256_WaitDRDY(self):
-        for i in range(0,400000,1):
-            if(config.digital_read(self.drdy_pin) == 0):
-                
+    # RREG of count consecutive registers in one frame
+    def ADS1256_ReadRegs(self, reg, count):
+        rx = config.spi_transaction([CMD['CMD_RREG'] | reg, count - 1], config.T6_US,
+                                    [0x00] * count, cs_pin=self.cs_pin, spi=self.spi)
+        return rx[-count:]
+
+    # Raise the SPI clock as far as a MUX register write/readback still holds.
+    # Returns the chosen speed, or None if no candidate passed.
+    def ADS1256_TuneSPIClock(self, candidates=None):
+        if candidates is None:
+            candidates = config.SPI_SPEED_CANDIDATES
+        original = config.spi_get_speed(self.spi)
+        mux = self.ADS1256_Read_data(REG_E['REG_MUX'])[0]
+        chosen = None
+        for hz in sorted(candidates, reverse=True):
+            config.spi_set_speed(hz, self.spi)
+            ok = True
+            for pattern in (0x01, 0x23, 0x45, 0x67, 0x76, 0x10):
+                self.ADS1256_WriteReg(REG_E['REG_MUX'], pattern)
+                if self.ADS1256_Read_data(REG_E['REG_MUX'])[0] != pattern:
+                    ok = False
+                    break
+            if ok:
+                chosen = hz
                 break
-        if(i >= 400000):
-            print ("Time Out ...\r\n")
+        config.spi_set_speed(chosen if chosen is not None else original, self.spi)
+        self.ADS1256_WriteReg(REG_E['REG_MUX'], mux)
+        self.spi_hz = config.spi_get_speed(self.spi)
+        print("SPI clock: %d Hz" % self.spi_hz)
+        return chosen
         
+    # Sleep until DRDY falls; raises DRDYTimeoutError instead of spinning
+    def ADS1256_WaitDRDY(self, timeout_ms=None):
+        if not config.wait_drdy(self.drdy_pin, timeout_ms):
+            raise DRDYTimeoutError("DRDY did not go low within %s ms"
+                                   % (config.DRDY_TIMEOUT_MS if timeout_ms is None else timeout_ms))
         
     def ADS1256_ReadChipID(self):
         self.ADS1256_WaitDRDY()
@@ -114,23 +183,30 @@ class ADS1256:
         return id
         
     #The configuration parameters of ADC, gain and data rate
-    def ADS1256_ConfigADC(self, gain, drate):
+    # acal=False leaves ACAL off so the write does not start a self-calibration
+    def ADS1256_ConfigADC(self, gain, drate, acal=True):
         self.ADS1256_WaitDRDY()
         buf = [0,0,0,0,0,0,0,0]
-        buf[0] = (0<<3) | (1<<2) | (0<<1)
+        buf[0] = (0<<3) | ((1 if acal else 0)<<2) | (0<<1)
         buf[1] = 0x08
         buf[2] = (0<<5) | (0<<3) | (gain<<0)
         buf[3] = drate
         
-        config.digital_write(self.cs_pin, GPIO.LOW)#cs  0
-        config.spi_writebyte([CMD['CMD_WREG'] | 0, 0x03])
-        config.spi_writebyte(buf)
-        
-        config.digital_write(self.cs_pin, GPIO.HIGH)#cs 1
+        config.spi_transaction([CMD['CMD_WREG'] | 0, 0x03] + buf, cs_pin=self.cs_pin, spi=self.spi)
         config.delay_ms(1) 
 
 
 
+    # MUX register value for a channel in the current ScanMode, None if invalid
+    def ADS1256_MuxValue(self, Channal):
+        if(ScanMode == 0):
+            if Channal > 7:
+                return None
+            return (Channal<<4) | (1<<3)                #AINx - AINCOM
+        if Channal > 3:
+            return None
+        return ((2 * Channal) << 4) | (2 * Channal + 1) #DiffChannal AIN(2n)-AIN(2n+1)
+
     def ADS1256_SetChannal(self, Channal):
         if Channal > 7:
             return 0
@@ -147,61 +223,365 @@ class ADS1256:
             self.ADS1256_WriteReg(REG_E['REG_MUX'], (6 << 4) | 7) 	#DiffChannal   AIN6-AIN7
 
     def ADS1256_SetMode(self, Mode):
+        global ScanMode
         ScanMode = Mode
 
-    def ADS1256_init(self):
+    # OFC0..FSC2 as 6 raw register bytes
+    def ADS1256_ReadCalibration(self):
+        return self.ADS1256_ReadRegs(REG_E['REG_OFC0'], 6)
+
+    def ADS1256_WriteCalibration(self, regs):
+        config.spi_transaction([CMD['CMD_WREG'] | REG_E['REG_OFC0'], 0x05] + list(regs),
+                               cs_pin=self.cs_pin, spi=self.spi)
+
+    def ADS1256_SelfCalibrate(self):
+        if self.continuous:
+            self.ADS1256_StopReadContinuous()
+        self.ADS1256_WriteCmd(CMD['CMD_SELFCAL'])
+        self.ADS1256_WaitDRDY(config.CAL_TIMEOUT_MS)
+        return self.ADS1256_ReadCalibration()
+
+    def ADS1256_StoreCalibration(self, regs, gain, drate):
+        cache = config.load_cal_cache()
+        cache[str(self.cs_pin)] = {
+            'regs': list(regs),
+            'gain': gain,
+            'drate': drate,
+            'time': time.time(),
+            'temperature': config.board_temperature(),
+        }
+        config.save_cal_cache(cache)
+
+    # Explicit self-calibration at the current gain/data rate; result is cached
+    def ADS1256_Recalibrate(self):
+        regs = self.ADS1256_ReadRegs(REG_E['REG_STATUS'], 4)
+        cal = self.ADS1256_SelfCalibrate()
+        self.ADS1256_StoreCalibration(cal, regs[2] & 0x07, regs[3])
+        print("ADC self-calibration done")
+        return cal
+
+    # Cached OFC/FSC for this gain/data rate, None if missing, too old or
+    # taken at a board temperature too far from the current one
+    def ADS1256_CachedCalibration(self, gain, drate):
+        entry = config.load_cal_cache().get(str(self.cs_pin))
+        if entry is None or entry.get('gain') != gain or entry.get('drate') != drate:
+            return None
+        age = time.time() - entry.get('time', 0)
+        temp_now = config.board_temperature()
+        temp_then = entry.get('temperature')
+        temp_ok = temp_now is None or temp_then is None or abs(temp_now - temp_then) <= config.CAL_MAX_TEMP_DELTA
+        if 0 <= age <= config.CAL_MAX_AGE_S and temp_ok:
+            return entry['regs']
+        return None
+
+    # Write back the cached OFC/FSC if it still fits, otherwise recalibrate
+    def ADS1256_ApplyCalibration(self, gain, drate):
+        regs = self.ADS1256_CachedCalibration(gain, drate)
+        if regs is not None:
+            self.ADS1256_WriteCalibration(regs)
+            return False
+        self.ADS1256_Recalibrate()
+        return True
+
+    # Stop RDATAC and read the chip ID without a hardware reset; None if
+    # the chip does not answer
+    def ADS1256_Probe(self):
+        try:
+            self.ADS1256_WriteCmd(CMD['CMD_SDATAC'])
+            self.continuous = False
+            return self.ADS1256_ReadChipID()
+        except DRDYTimeoutError:
+            return None
+
+    # reset=False leaves the RST line alone, for chips whose reset is shared
+    # and owned by ADS1256_Array
+    def ADS1256_init(self, gain=None, drate=None, fast=True, reset=True):
+        if gain is None:
+            gain = ADS1256_GAIN_E['ADS1256_GAIN_1']
+        if drate is None:
+            drate = ADS1256_DRATE_E['ADS1256_30000SPS']
         if (config.module_init() != 0):
             return -1
-        self.ADS1256_reset()
-        id = self.ADS1256_ReadChipID()
+        id = None
+        if fast or not reset:
+            # A running chip only needs RDATAC stopped; skip the hardware reset
+            id = self.ADS1256_Probe()
+        if id != 3 and reset:
+            self.ADS1256_reset()
+            try:
+                id = self.ADS1256_ReadChipID()
+            except DRDYTimeoutError as e:
+                print("ID Read failed   (%s)" % e)
+                return -1
         if id == 3 :
             print("ID Read success  ")
         else:
             print("ID Read failed   ")
             return -1
-        self.ADS1256_ConfigADC(ADS1256_GAIN_E['ADS1256_GAIN_1'], ADS1256_DRATE_E['ADS1256_30000SPS'])
+        if config.SPI_AUTOTUNE:
+            self.ADS1256_TuneSPIClock()
+        regs = self.ADS1256_ReadRegs(REG_E['REG_STATUS'], 4)
+        # ACAL may be either way: it is off after a start from the cache
+        if fast and (regs[0] & 0x0A) == 0 and regs[2] == gain and regs[3] == drate:
+            self.ADS1256_ApplyCalibration(gain, drate)
+            return 0
+        cal = self.ADS1256_CachedCalibration(gain, drate)
+        if cal is not None:
+            # Configure without ACAL and load the cached OFC/FSC instead
+            self.ADS1256_ConfigADC(gain, drate, acal=False)
+            self.ADS1256_WriteCalibration(cal)
+        else:
+            # Writing ADCON/DRATE with ACAL set runs a self-calibration,
+            # so the chip is calibrated once DRDY falls again
+            self.ADS1256_ConfigADC(gain, drate)
+            self.ADS1256_WaitDRDY(config.CAL_TIMEOUT_MS)
+            self.ADS1256_StoreCalibration(self.ADS1256_ReadCalibration(), gain, drate)
         return 0
         
-    def ADS1256_Read_ADC_Data(self):
-        self.ADS1256_WaitDRDY()
-        config.digital_write(self.cs_pin, GPIO.LOW)#cs  0
-        config.spi_writebyte([CMD['CMD_RDATA']])
-        # config.delay_ms(10)
+    # RDATA without waiting for DRDY; caller must know a conversion is ready
+    def ADS1256_ReadData(self):
+        buf = config.spi_transaction([CMD['CMD_RDATA']], config.T6_US, [0x00] * 3,
+                                     cs_pin=self.cs_pin, spi=self.spi)[-3:]
+        return self.ADS1256_DecodeSample(buf)
 
-        buf = config.spi_readbytes(3)
-        config.digital_write(self.cs_pin, GPIO.HIGH)#cs 1
+    def ADS1256_DecodeSample(self, buf):
         read = (buf[0]<<16) & 0xff0000
         read |= (buf[1]<<8) & 0xff00
         read |= (buf[2]) & 0xff
         if (read & 0x800000):
-            read &= 0xF000000
+            read -= 0x1000000
         return read
+
+    def ADS1256_Read_ADC_Data(self):
+        self.ADS1256_WaitDRDY()
+        return self.ADS1256_ReadData()
  
+    # Select the input for the next conversion and restart the digital filter
+    def ADS1256_SelectInput(self, Channel):
+        mux = self.ADS1256_MuxValue(Channel)
+        if mux is None:
+            return
+        config.spi_transaction([CMD['CMD_WREG'] | REG_E['REG_MUX'], 0x00, mux, CMD['CMD_SYNC']],
+                               config.T11_US, [CMD['CMD_WAKEUP']], cs_pin=self.cs_pin, spi=self.spi)
+
+    # WREG MUX + SYNC + WAKEUP for the next input, then RDATA of the conversion
+    # that just finished, all inside one chip-select frame
+    def ADS1256_SelectInputAndRead(self, Channel):
+        mux = self.ADS1256_MuxValue(Channel)
+        rx = config.spi_transaction([CMD['CMD_WREG'] | REG_E['REG_MUX'], 0x00, mux, CMD['CMD_SYNC']],
+                                    config.T11_US, [CMD['CMD_WAKEUP'], CMD['CMD_RDATA']],
+                                    config.T6_US, [0x00] * 3, cs_pin=self.cs_pin, spi=self.spi)
+        return self.ADS1256_DecodeSample(rx[-3:])
+
+    # Enter read-data-continuous mode; DOUT then presents every conversion
+    # without a RDATA command, so each sample is a bare 3 byte read
+    def ADS1256_StartReadContinuous(self, Channel=None):
+        if self.continuous:
+            self.ADS1256_StopReadContinuous()
+        if Channel is not None:
+            self.ADS1256_SelectInput(Channel)
+        self.ADS1256_WaitDRDY()
+        self.ADS1256_WriteCmd(CMD['CMD_RDATAC'])
+        self.continuous = True
+
+    # Pull count conversions into the ring buffer (self.ring by default)
+    def ADS1256_ReadContinuous(self, count, ring=None):
+        if ring is None:
+            ring = self.ring
+        if not self.continuous:
+            self.ADS1256_StartReadContinuous()
+        for i in range(count):
+            self.ADS1256_WaitDRDY()
+            ring.put(config.spi_transaction([0x00] * 3, cs_pin=self.cs_pin, spi=self.spi))
+        return ring
+
+    def ADS1256_StopReadContinuous(self):
+        self.ADS1256_WaitDRDY()
+        self.ADS1256_WriteCmd(CMD['CMD_SDATAC'])
+        self.continuous = False
+
+    # Stream count samples of one channel and return them as int32 codes
+    def ADS1256_StreamChannel(self, Channel, count):
+        self.ring.clear()
+        self.ADS1256_StartReadContinuous(Channel)
+        self.ADS1256_ReadContinuous(count)
+        self.ADS1256_StopReadContinuous()
+        return self.ring.drain()
+
     def ADS1256_GetChannalValue(self, Channel):
+        if self.continuous:
+            # RREG/WREG/RDATA are ignored while RDATAC is active
+            self.ADS1256_StopReadContinuous()
         if(ScanMode == 0):# 0  Single-ended input  8 channel1 Differential input  4 channe 
             if(Channel>=8):
                 return 0
-            self.ADS1256_SetChannal(Channel)
-            self.ADS1256_WriteCmd(CMD['CMD_SYNC'])
-            # config.delay_ms(10)
-            self.ADS1256_WriteCmd(CMD['CMD_WAKEUP'])
-            # config.delay_ms(200)
-            Value = self.ADS1256_Read_ADC_Data()
         else:
             if(Channel>=4):
                 return 0
-            self.ADS1256_SetDiffChannal(Channel)
-            self.ADS1256_WriteCmd(CMD['CMD_SYNC'])
-            # config.delay_ms(10) 
-            self.ADS1256_WriteCmd(CMD['CMD_WAKEUP'])
-            # config.delay_ms(10) 
-            Value = self.ADS1256_Read_ADC_Data()
+        self.ADS1256_SelectInput(Channel)
+        Value = self.ADS1256_Read_ADC_Data()
         return Value
         
+    # Datasheet input cycling: once DRDY falls, switch the MUX to the next
+    # input and SYNC/WAKEUP, then RDATA still returns the previous input's
+    # conversion. Settling of input n+1 overlaps the readout of input n, so a
+    # scan costs one settle per channel plus a single priming conversion.
+    def ADS1256_ScanChannels(self, channels=None):
+        if channels is None:
+            channels = range(8) if ScanMode == 0 else range(4)
+        channels = list(channels)
+        n = len(channels)
+        values = [0] * n
+        stamps = [0.0] * n
+        if n == 0:
+            return values, stamps
+        if self.continuous:
+            self.ADS1256_StopReadContinuous()
+        t_start = time.monotonic()
+        self.ADS1256_WaitDRDY()
+        self.ADS1256_SelectInput(channels[0])
+        for i in range(n):
+            self.ADS1256_WaitDRDY()
+            # DRDY edge marks the end of channels[i]'s conversion
+            stamps[i] = time.monotonic()
+            if i + 1 < n:
+                values[i] = self.ADS1256_SelectInputAndRead(channels[i + 1])
+            else:
+                values[i] = self.ADS1256_ReadData()
+        duration = time.monotonic() - t_start
+        self.scan_stats = {
+            'channels': n,
+            'duration_s': duration,
+            'scan_hz': 1.0 / duration if duration > 0 else 0.0,
+            'sample_hz': n / duration if duration > 0 else 0.0,
+            'skew_s': stamps[-1] - stamps[0],
+        }
+        return values, stamps
+
     def ADS1256_GetAll(self):
         ADC_Value = [0,0,0,0,0,0,0,0]
-        for i in range(0,8,1):
-            ADC_Value[i] = self.ADS1256_GetChannalValue(i)
+        values, stamps = self.ADS1256_ScanChannels()
+        ADC_Value[:len(values)] = values
         return ADC_Value
+
+# Several ADS1256 chips read as one device whose channels are sensor columns.
+# Each chip converts on its own, so a scan starts every chip's input at once
+# and walks them in lockstep: the settling of all boards overlaps and the scan
+# time follows the longest per-board channel list, not the number of boards.
+class ADS1256_Array:
+    def __init__(self, boards=None, sensor_channels=None):
+        if boards is None:
+            boards = config.ADC_BOARDS
+        if sensor_channels is None:
+            sensor_channels = config.SENSOR_CHANNELS
+        self.adcs = [ADS1256(b['cs'], b['drdy'], b['rst'],
+                             config.get_spi(b.get('bus', 0), b.get('device', 0)))
+                     for b in boards]
+        self.names = list(sensor_channels)
+        self.mapping = [tuple(sensor_channels[name]) for name in self.names]
+        for board, ch in self.mapping:
+            if not 0 <= board < len(self.adcs):
+                raise ValueError("Sensor mapped to unknown ADC board %d" % board)
+        self.scan_stats = {}
+
+    def ADS1256_init(self, gain=None, drate=None, fast=True):
+        # A shared RST line resets every chip on it, so pulse those once up
+        # front, before any board is configured, and never from a chip's init
+        if (config.module_init() != 0):
+            return -1
+        if not fast or any(adc.ADS1256_Probe() != 3 for adc in self.adcs):
+            for rst in sorted(set(adc.rst_pin for adc in self.adcs)):
+                config.digital_write(rst, GPIO.HIGH)
+                config.delay_ms(1)
+                config.digital_write(rst, GPIO.LOW)
+                config.delay_ms(1)
+                config.digital_write(rst, GPIO.HIGH)
+        for i, adc in enumerate(self.adcs):
+            if adc.ADS1256_init(gain, drate, fast=True, reset=False) != 0:
+                print("ADC board %d (CS %d) init failed" % (i, adc.cs_pin))
+                return -1
+        # Chips on one bus share the SPI device; run it at the slowest board's clock
+        speeds = {}
+        for adc in self.adcs:
+            if adc.spi_hz is not None:
+                key = id(adc.spi)
+                speeds[key] = min(speeds.get(key, adc.spi_hz), adc.spi_hz)
+        for adc in self.adcs:
+            if id(adc.spi) in speeds:
+                config.spi_set_speed(speeds[id(adc.spi)], adc.spi)
+        return 0
+
+    def ADS1256_ConfigADC(self, gain, drate):
+        for adc in self.adcs:
+            adc.ADS1256_ConfigADC(gain, drate)
+
+    def ADS1256_SetMode(self, Mode):
+        self.adcs[0].ADS1256_SetMode(Mode)
+
+    # Per-board input lists for the given sensor columns, with the slot of
+    # every column in those lists
+    def ADS1256_Plan(self, channels):
+        plan = [[] for _ in self.adcs]
+        slots = []
+        for col in channels:
+            board, ch = self.mapping[col]
+            slots.append((board, len(plan[board])))
+            plan[board].append(ch)
+        return plan, slots
+
+    # Scan sensor columns (indexes into self.names, default all) and return
+    # (values, stamps) in the order asked for
+    def ADS1256_ScanChannels(self, channels=None):
+        if channels is None:
+            channels = range(len(self.names))
+        plan, slots = self.ADS1256_Plan(channels)
+        values = [[0] * len(p) for p in plan]
+        stamps = [[0.0] * len(p) for p in plan]
+        active = [b for b, p in enumerate(plan) if p]
+        if not active:
+            return [], []
+        for b in active:
+            if self.adcs[b].continuous:
+                self.adcs[b].ADS1256_StopReadContinuous()
+        t_start = time.monotonic()
+        for b in active:
+            self.adcs[b].ADS1256_WaitDRDY()
+            self.adcs[b].ADS1256_SelectInput(plan[b][0])
+        for i in range(max(len(plan[b]) for b in active)):
+            for b in active:
+                chans = plan[b]
+                if i >= len(chans):
+                    continue
+                adc = self.adcs[b]
+                adc.ADS1256_WaitDRDY()
+                stamps[b][i] = time.monotonic()
+                if i + 1 < len(chans):
+                    values[b][i] = adc.ADS1256_SelectInputAndRead(chans[i + 1])
+                else:
+                    values[b][i] = adc.ADS1256_ReadData()
+        duration = time.monotonic() - t_start
+        out = [values[b][i] for b, i in slots]
+        out_stamps = [stamps[b][i] for b, i in slots]
+        self.scan_stats = {
+            'boards': len(active),
+            'channels': len(out),
+            'duration_s': duration,
+            'scan_hz': 1.0 / duration if duration > 0 else 0.0,
+            'sample_hz': len(out) / duration if duration > 0 else 0.0,
+            'skew_s': max(out_stamps) - min(out_stamps),
+        }
+        return out, out_stamps
+
+    def ADS1256_StreamChannel(self, Channel, count):
+        board, ch = self.mapping[Channel]
+        return self.adcs[board].ADS1256_StreamChannel(ch, count)
+
+    def ADS1256_GetChannalValue(self, Channel):
+        board, ch = self.mapping[Channel]
+        return self.adcs[board].ADS1256_GetChannalValue(ch)
+
+    def ADS1256_GetAll(self):
+        values, stamps = self.ADS1256_ScanChannels()
+        return values
 ### END OF FILE ###
 
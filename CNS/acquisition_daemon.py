@@ -0,0 +1,245 @@
+"""
+Edinim/kontrol çekirdeğini GUI'den ayrı bir süreçte çalıştırır.
+
+Süreç son ölçümleri, sayacı ve röle durumlarını sabit yerleşimli bir
+paylaşımlı bellek kaydına (LatestValuesBoard) yazar; GUI yalnızca okur.
+Böylece matplotlib/reportlab/QTableWidget yükü örnekleme zamanlamasını
+etkilemez.
+
+Yerleşim (little-endian):
+    0    Q  seq        seqlock: yazım sırasında tek, bitince çift
+    8    Q  step_no    son yayımlanan adım
+    16   d  timestamp  son adımın zamanı (unix sn)
+    24   i  counter    başarı sayacı
+    28   i  status     STATUS_* değerleri
+    32   8B relays     [fan, rezistans, ...] 1=açık
+    40   15d values    T1..T13, AT1, AT2
+    160  Q  ack        okuyucunun işlediği son adım (okuyucu yazar)
+    168  RING_SIZE x (Q step_no, d timestamp, i counter, 15d values)
+Halka, turbo modda GUI birkaç adım geride kalsa bile satır kaybolmasın
+diye vardır; yazıcı okuyucu RING_SIZE adım geride kalırsa bekler.
+"""
+import time
+import struct
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+N_VALUES = 15
+N_RELAYS = 8
+RING_SIZE = 256
+
+STATUS_IDLE = 0
+STATUS_RUNNING = 1
+STATUS_FINISHED = 2
+STATUS_STOPPED = 3
+STATUS_ERROR = 4
+
+READ_SPINS = 100             # seqlock: bu kadar denemeden sonra işlemci bırakılır
+READ_RETRY_S = 0.001
+READ_TIMEOUT_S = 0.5
+
+_SEQ = struct.Struct('<Q')
+_RECORD = struct.Struct(f'<Qdii{N_RELAYS}B{N_VALUES}d')   # seq hariç, offset 8
+_ACK_OFFSET = 8 + _RECORD.size
+_SLOT = struct.Struct(f'<Qdi{N_VALUES}d')
+_RING_OFFSET = _ACK_OFFSET + 8
+BOARD_SIZE = _RING_OFFSET + RING_SIZE * _SLOT.size
+
+
+class BoardReadTimeout(Exception):
+    pass
+
+
+class LatestValuesBoard:
+    """Tek yazıcılı, seqlock korumalı son değerler panosu."""
+
+    def __init__(self, name=None, create=False):
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=BOARD_SIZE)
+            self.shm.buf[:BOARD_SIZE] = bytes(BOARD_SIZE)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self._last = None          # okuyucunun son tutarlı kopyası
+
+    # --- yazıcı (edinim süreci) ---
+    def publish(self, step_no, timestamp, counter, status, relays, values, new_step=True):
+        relays = (list(relays) + [0] * N_RELAYS)[:N_RELAYS]
+        values = (list(values) + [0.0] * N_VALUES)[:N_VALUES]
+        if new_step:
+            _SLOT.pack_into(self.buf, _RING_OFFSET + (step_no % RING_SIZE) * _SLOT.size,
+                            step_no, timestamp, counter, *values)
+        seq = _SEQ.unpack_from(self.buf, 0)[0]
+        _SEQ.pack_into(self.buf, 0, seq + 1)
+        _RECORD.pack_into(self.buf, 8, step_no, timestamp, counter, status, *relays, *values)
+        _SEQ.pack_into(self.buf, 0, seq + 2)
+
+    def set_status(self, status):
+        rec = self.read()
+        self.publish(rec['step_no'], rec['timestamp'], rec['counter'], status,
+                     rec['relays'], rec['values'], new_step=False)
+
+    def set_relays(self, relays):
+        rec = self.read()
+        self.publish(rec['step_no'], rec['timestamp'], rec['counter'], rec['status'],
+                     relays, rec['values'], new_step=False)
+
+    def reader_lag(self, step_no):
+        return step_no - _SEQ.unpack_from(self.buf, _ACK_OFFSET)[0]
+
+    def wait_for_reader(self, step_no, stop_event, poll=0.01):
+        # Halka dolmak üzereyse okuyucuyu bekle (geri basınç)
+        while self.reader_lag(step_no) >= RING_SIZE - 1 and not stop_event.is_set():
+            time.sleep(poll)
+
+    # --- okuyucu (GUI) ---
+    def read(self, timeout=READ_TIMEOUT_S):
+        """
+        Tutarlı bir kopya döner. Yazıcı kaydın ortasında kalırsa (ör. süreç
+        yazarken öldü) timeout saniye sonra son tutarlı kopya 'stale': True
+        ile döner; hiç kopya yoksa BoardReadTimeout.
+        """
+        spins = 0
+        deadline = None
+        while True:
+            s1 = _SEQ.unpack_from(self.buf, 0)[0]
+            if not s1 & 1:
+                raw = _RECORD.unpack_from(self.buf, 8)
+                if _SEQ.unpack_from(self.buf, 0)[0] == s1:
+                    break
+            spins += 1
+            if spins < READ_SPINS:
+                continue
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + timeout
+            elif now >= deadline:
+                if self._last is None:
+                    raise BoardReadTimeout(f"Pano {timeout} sn boyunca tutarsız (seq={s1})")
+                return dict(self._last, stale=True)
+            time.sleep(READ_RETRY_S)
+        self._last = {
+            'seq': s1,
+            'step_no': raw[0],
+            'timestamp': raw[1],
+            'counter': raw[2],
+            'status': raw[3],
+            'relays': list(raw[4:4 + N_RELAYS]),
+            'values': list(raw[4 + N_RELAYS:]),
+            'stale': False,
+        }
+        return dict(self._last)
+
+    def read_new_steps(self, last_step):
+        """last_step'ten sonraki adımları döner: [(step_no, timestamp, counter, values)], kayıp sayısı."""
+        latest = self.read()['step_no']
+        steps = []
+        lost = 0
+        for n in range(last_step + 1, latest + 1):
+            raw = _SLOT.unpack_from(self.buf, _RING_OFFSET + (n % RING_SIZE) * _SLOT.size)
+            if raw[0] != n:
+                lost += 1
+                continue
+            steps.append((raw[0], raw[1], raw[2], list(raw[3:])))
+        if latest > last_step:
+            _SEQ.pack_into(self.buf, _ACK_OFFSET, latest)
+        return steps, lost
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _daemon_main(board_name, settings_path, stop_event, pause_event, turbo, recipe=None,
+                 checkpoint_db=None, report_id=None, resume=None):
+    import sqlite3
+    import gpio_backend
+    import checkpoint
+    from control_core import ControlCore, SettingsWatcher
+
+    board = LatestValuesBoard(board_name)
+    watcher = SettingsWatcher(settings_path)
+    core = None
+    conn = None
+    checkpointer = None
+    if checkpoint_db is not None and report_id is not None:
+        conn = sqlite3.connect(checkpoint_db)
+        checkpoint.ensure_schema(conn)
+        checkpointer = lambda state: checkpoint.save(conn, report_id, state)
+
+    # Pano tek yazıcılıdır: adım ve röle iş parçacıkları sırayla yazar
+    publish_lock = threading.Lock()
+
+    def relays():
+        return [int(core.fan_state), int(core.rez_state)]
+
+    def on_step(t_str, vals, counter):
+        ts = core.last_time.timestamp() if core.last_time else time.time()
+        with publish_lock:
+            board.publish(core.step_no, ts, counter, STATUS_RUNNING, relays(), vals)
+        board.wait_for_reader(core.step_no, stop_event)
+
+    def on_relay(name, state):
+        # Adımlar arasındaki röle değişimleri de GUI'ye hemen yansır
+        with publish_lock:
+            board.set_relays(relays())
+
+    try:
+        core = ControlCore(watcher.get, gpio_backend.GPIO, on_step=on_step, recipe=recipe,
+                           checkpointer=checkpointer, on_relay=on_relay)
+        if resume is not None:
+            core.restore(resume)
+        with publish_lock:
+            board.set_status(STATUS_RUNNING)
+        completed = core.run(stop_event, pause_event, lambda: bool(turbo.value))
+        with publish_lock:
+            board.publish(core.step_no, time.time(), core.counter,
+                          STATUS_FINISHED if completed else (STATUS_ERROR if core.tripped() else STATUS_STOPPED),
+                          relays(), core.last_values, new_step=False)
+    except Exception as e:
+        print(f"Edinim süreci hatası: {e}")
+        with publish_lock:
+            board.set_status(STATUS_ERROR)
+    finally:
+        if conn is not None:
+            conn.close()
+        board.close()
+
+
+class AcquisitionProcess:
+    """GUI tarafı: süreci başlatır, komut olaylarını ve panoyu tutar."""
+
+    def __init__(self, settings_path, recipe=None, checkpoint_db=None, report_id=None, resume=None):
+        # fork, Qt iş parçacıklarının tuttuğu kilitleri ve açık SPI/GPIO tanıtıcılarını
+        # çocuğa kopyalar; spawn ile çocuk temiz başlar ve donanımı kendisi açar
+        ctx = mp.get_context('spawn')
+        self.ctx = ctx
+        self.board = LatestValuesBoard(create=True)
+        self.stop_event = ctx.Event()
+        self.pause_event = ctx.Event()
+        self.turbo = ctx.Value('b', 0)
+        self.process = ctx.Process(target=_daemon_main, daemon=True,
+                                   args=(self.board.name, settings_path, self.stop_event,
+                                         self.pause_event, self.turbo, recipe,
+                                         checkpoint_db, report_id, resume))
+
+    def start(self):
+        self.process.start()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def join(self, timeout=None):
+        self.process.join(timeout)
+
+    def close(self):
+        self.board.close()
+        try:
+            self.board.unlink()
+        except FileNotFoundError:
+            pass
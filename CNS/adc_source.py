@@ -0,0 +1,110 @@
+"""
+ADS1256 kartlarından ölçüm kaynağı (ACQ_SOURCE = 'adc').
+
+ControlCore simülatör yerine bu sınıfı kullanır: sensör sütunları
+config.ADC_BOARDS / config.SENSOR_CHANNELS eşlemesiyle ADS1256_Array
+üzerinden okunur, adım başına Oversampler ile indirgenir ve
+SensorConverter ile °C'ye çevrilir. SPI yolu ölçüm adımı, rezistans
+denetleyicisi ve güvenlik denetçisi arasında tek kilitle paylaşılır.
+
+Ortam örneğinin anı son dönüşümün DRDY anıdır (time.monotonic); okuma
+başarısız olursa eski örnek kalır ve güvenlik denetçisi 'stale' ile trip eder.
+Kilit bir ölçüm adımı boyunca tutulduğundan ambient_sample beklemez: kilit
+doluysa son yayınlanan örneği anıyla birlikte döner.
+"""
+import threading
+
+import numpy as np
+
+import ADS1256
+from conversion import SensorConverter, SENSOR_NAMES
+from oversampling import Oversampler
+
+AMBIENT_NAMES = ('AT1', 'AT2')
+
+
+class ADCSource:
+    """
+    adc: ADS1256_Array (başlatılmış); sampler: Oversampler
+    calculate_step(mask, desired_temp) simülatörle aynı biçimde
+    (15 değer, hedef sinyali) döner; pasif ya da eşlenmemiş sütunlar 0 okunur.
+    """
+
+    def __init__(self, adc, sampler, settings=None, calibration=None):
+        self.adc = adc
+        self.sampler = sampler
+        self.settings = settings
+        self.converter = SensorConverter(names=adc.names, calibration=calibration)
+        index = {name: i for i, name in enumerate(adc.names)}
+        self.columns = [index.get(name) for name in SENSOR_NAMES]
+        self.ambient_columns = [index[name] for name in AMBIENT_NAMES if name in index]
+        self.lock = threading.Lock()
+        self._ambient = (None, None)        # (°C, DRDY anı)
+        # Simülatörle aynı arayüz; gerçek fırında ısıtma röle üzerinden olur
+        self.rezistans_aktif = False
+        self.heater_duty = None
+        self.sogutma_modu = False
+
+    @classmethod
+    def from_settings(cls, settings):
+        adc = ADS1256.ADS1256_Array()
+        sampler = Oversampler.from_settings(adc, settings)
+        # Kartlar doğrudan aşırı örnekleme hızıyla başlatılır; kalibrasyon da bu hız için saklanır
+        if adc.ADS1256_init(*sampler.adc_config()) != 0:
+            raise RuntimeError("ADC kartları başlatılamadı")
+        return cls(adc, sampler, settings)
+
+    def _convert(self, adc_columns, codes):
+        # Dönüştürücü tüm sütunları bekler; okunmayanlar 0 kodla doldurulur
+        full = np.zeros(len(self.adc.names), dtype=np.float64)
+        full[adc_columns] = codes
+        return self.converter.convert(full)[adc_columns]
+
+    def _store_ambient(self, adc_columns, temps, stamps):
+        picked = [(t, s) for c, t, s in zip(adc_columns, temps, stamps) if c in self.ambient_columns]
+        if len(picked) == len(self.ambient_columns) and picked:
+            self._ambient = (float(np.mean([t for t, _ in picked])), max(s for _, s in picked))
+
+    def calculate_step(self, active_sensors_mask, desired_temp):
+        out = [0.0] * 15
+        wanted = [(j, c) for j, c in enumerate(self.columns) if active_sensors_mask[j] and c is not None]
+        if wanted:
+            adc_columns = [c for _, c in wanted]
+            with self.lock:
+                codes, _ = self.sampler.read(adc_columns)
+                stamps = self.sampler.last_stamps
+            temps = self._convert(adc_columns, codes)
+            for (j, _), t in zip(wanted, temps):
+                out[j] = float(t)
+            self._store_ambient(adc_columns, temps, stamps)
+        probes = [out[j] for j, _ in wanted if j < 13]
+        ambient = [out[j] for j, _ in wanted if j >= 13]
+        if probes:
+            target_hit = min(probes) >= desired_temp
+        else:
+            target_hit = bool(ambient) and sum(ambient) / len(ambient) >= desired_temp
+        return out, target_hit
+
+    def ambient_sample(self):
+        """(ortam °C, son DRDY anı). Okuma hatasında önceki örnek döner."""
+        if not self.ambient_columns or not self.lock.acquire(blocking=False):
+            return self._ambient
+        try:
+            codes, stamps = self.adc.ADS1256_ScanChannels(self.ambient_columns)
+        except ADS1256.DRDYTimeoutError as e:
+            print(f"Ortam kanalı okunamadı: {e}")
+            return self._ambient
+        finally:
+            self.lock.release()
+        self._store_ambient(self.ambient_columns, self._convert(self.ambient_columns, codes), stamps)
+        return self._ambient
+
+    def ambient_temperature(self):
+        return self.ambient_sample()[0]
+
+    def snapshot(self):
+        # Fiziksel fırının kaydedilecek iç durumu yoktur
+        return {}
+
+    def restore(self, state):
+        pass
@@ -0,0 +1,455 @@
+"""
+ADS1256 yonga emülatörü (Raspberry Pi olmadan sürücü denemesi için).
+
+spidev ve RPi.GPIO yerine geçen sahte modüller sağlar; config.py ve
+ADS1256.py hiç değiştirilmeden emülatöre konuşur:
+
+    import ads1256_emulator
+    board = ads1256_emulator.install()      # config/ADS1256 import edilmeden önce
+    import ADS1256
+    adc = ADS1256.ADS1256(); adc.ADS1256_init()
+
+Emüle edilenler: RREG/WREG/RDATA/RDATAC/SDATAC/SYNC/WAKEUP/STANDBY/RESET ve
+öz kalibrasyon komutları, DRATE'e göre DRDY zamanlaması (datasheet Table 13
+oturma süreleri), OFC/FSC ile çıkış düzeltmesi, kanal başına dalga biçimi.
+"""
+import sys
+import time
+import math
+import types
+import threading
+
+import numpy as np
+
+FULL_SCALE_VOLTAGE = 5.0     # sürücüdeki REFERENCE_VOLTAGE ile aynı
+AINCOM = 8
+
+# DRATE kodu -> (örnek/sn, ilk veri için oturma süresi sn)
+DRATE_TIMING = {
+    0xF0: (30000, 0.00021), 0xE0: (15000, 0.00025), 0xD0: (7500, 0.00031),
+    0xC0: (3750, 0.00044), 0xB0: (2000, 0.00068), 0xA1: (1000, 0.00118),
+    0x92: (500, 0.00218), 0x82: (100, 0.01018), 0x72: (60, 0.01684),
+    0x63: (50, 0.02018), 0x53: (30, 0.03351), 0x43: (25, 0.04018),
+    0x33: (15, 0.06684), 0x20: (10, 0.10018), 0x13: (5, 0.20018),
+    0x03: (2.5, 0.40018),
+}
+
+# Güç açılışı register değerleri (STATUS: ID=3)
+RESET_REGS = [0x31, 0x01, 0x20, 0xF0, 0xE0, 0x00, 0x00, 0x00, 0x00, 0x00, 0x40]
+FSC_NOMINAL = 0x400000
+EDGE_MIN_SLEEP_S = 0.00005   # emüle kenar iş parçacığının en kısa uykusu
+
+
+# --- Dalga biçimleri: t (sn) -> volt ---
+def constant(volts):
+    return lambda t: volts
+
+
+def sine(offset, amplitude, freq_hz):
+    return lambda t: offset + amplitude * math.sin(2 * math.pi * freq_hz * t)
+
+
+def ramp(start, volts_per_s, limit=FULL_SCALE_VOLTAGE):
+    return lambda t: min(limit, start + volts_per_s * t)
+
+
+def celsius(temp):
+    """LM35 benzeri sensör: (V / 0.01) - 4 formülünün tersi."""
+    return constant((temp + 4.0) / 100.0)
+
+
+class EmulatedADS1256:
+    def __init__(self, waveforms=None, noise_codes=0.0, offset_codes=120,
+                 max_spi_hz=1920000, seed=0, clock=time.monotonic):
+        self.clock = clock
+        self.t0 = clock()
+        self.waveforms = {i: celsius(25.0 + i) for i in range(8)}
+        self.waveforms[AINCOM] = constant(0.0)
+        if waveforms:
+            self.waveforms.update(waveforms)
+        self.noise_codes = noise_codes
+        self.offset_codes = offset_codes   # kalibrasyonla giderilen iç ofset
+        self.max_spi_hz = max_spi_hz       # bu hızın üstünde okunan baytlar bozulur
+        self.rng = np.random.default_rng(seed)
+        self.stats = {'frames': 0, 'bytes': 0, 'conversions_read': 0}
+        self.cs_low = False
+        self.reset()
+
+    # --- durum ---
+    def reset(self):
+        self.regs = list(RESET_REGS)
+        self.continuous = False
+        self.state = 'cmd'
+        self.out = []
+        self.data = 0
+        self.cal_until = 0.0
+        self._restart(self.clock())
+
+    def set_waveform(self, channel, fn):
+        self.waveforms[channel] = fn
+
+    def _timing(self):
+        return DRATE_TIMING.get(self.regs[3], (30000, 0.00021))
+
+    def _restart(self, now):
+        self.halted = False
+        self.chain_start = now
+        self.chain_mux = self.regs[1]
+        self.completed = 0
+        self.read_idx = 0
+
+    def _completed_at(self, now):
+        if self.halted or now < self.cal_until:
+            return self.completed
+        rate, settle = self._timing()
+        start = max(self.chain_start, self.cal_until)
+        if now < start + settle:
+            return 0
+        return 1 + int((now - start - settle) * rate)
+
+    def _update(self, now):
+        n = self._completed_at(now)
+        if n > self.completed:
+            rate, settle = self._timing()
+            start = max(self.chain_start, self.cal_until)
+            t_conv = start + settle + (n - 1) / rate
+            self.data = self._convert(t_conv)
+            self.completed = n
+
+    def next_ready_time(self, now):
+        """Bir sonraki DRDY düşüşünün zamanı; durmuşsa None."""
+        if self.halted:
+            return None
+        rate, settle = self._timing()
+        start = max(self.chain_start, self.cal_until)
+        n = max(self._completed_at(now), self.read_idx)
+        return start + settle + n / rate
+
+    def _convert(self, t):
+        mux = self.chain_mux
+        pos, neg = (mux >> 4) & 0x0F, mux & 0x0F
+        rel = t - self.t0
+        volts = self.waveforms.get(pos, constant(0.0))(rel) - self.waveforms.get(neg, constant(0.0))(rel)
+        gain = 1 << (self.regs[2] & 0x07)
+        ideal = volts * gain / FULL_SCALE_VOLTAGE * 0x7FFFFF + self.offset_codes
+        if self.noise_codes:
+            ideal += self.rng.normal(0.0, self.noise_codes)
+        ofc = self._reg24(5, signed=True)
+        fsc = self._reg24(8)
+        code = int(round((ideal - ofc) * fsc / FSC_NOMINAL))
+        return max(-0x800000, min(0x7FFFFF, code))
+
+    def _reg24(self, base, signed=False):
+        v = self.regs[base] | (self.regs[base + 1] << 8) | (self.regs[base + 2] << 16)
+        if signed and v & 0x800000:
+            v -= 0x1000000
+        return v
+
+    def _set_reg24(self, base, v):
+        v &= 0xFFFFFF
+        self.regs[base], self.regs[base + 1], self.regs[base + 2] = v & 0xFF, (v >> 8) & 0xFF, v >> 16
+
+    def _self_calibrate(self, b, now):
+        rate, settle = self._timing()
+        self.cal_until = now + 2 * settle
+        self.stats['calibrations'] = self.stats.get('calibrations', 0) + 1
+        if b in (0xF0, 0xF1):
+            self._set_reg24(5, self.offset_codes)
+        if b in (0xF0, 0xF2):
+            self._set_reg24(8, FSC_NOMINAL)
+        self._restart(now)
+
+    def drdy(self):
+        now = self.clock()
+        self._update(now)
+        return 0 if self.completed > self.read_idx else 1
+
+    def drdy_peek(self, now):
+        """DRDY seviyesi, yonga durumunu değiştirmeden (kenar iş parçacığı için)."""
+        return 0 if self._completed_at(now) > self.read_idx else 1
+
+    def _data_bytes(self):
+        self.read_idx = self.completed
+        self.stats['conversions_read'] += 1
+        v = self.data & 0xFFFFFF
+        return [(v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF]
+
+    # --- SPI ---
+    def select(self, low):
+        if self.cs_low and not low:
+            # Yarım kalan komut iptal; RDATAC modu korunur
+            self.state = 'cmd'
+            self.out = []
+        elif low and not self.cs_low:
+            self.stats['frames'] += 1
+        self.cs_low = low
+
+    def transfer(self, tx, speed_hz):
+        now = self.clock()
+        self._update(now)
+        rx = []
+        corrupt = speed_hz > self.max_spi_hz
+        for b in tx:
+            if self.out:
+                o = self.out.pop(0)
+                rx.append(o ^ 0x01 if corrupt else o)
+                if self.continuous and b in (0x0F, 0xFE):
+                    self._command(b, now)
+                continue
+            if self.continuous and self.state == 'cmd':
+                if b in (0x0F, 0xFE):
+                    self._command(b, now)
+                    rx.append(0)
+                    continue
+                # RDATAC: DRDY düşükse ilk saat darbesiyle veri kaydırılır
+                if self.completed > self.read_idx:
+                    self.out = self._data_bytes()
+                    o = self.out.pop(0)
+                    rx.append(o ^ 0x01 if corrupt else o)
+                    continue
+                rx.append(0)
+                continue
+            rx.append(0)
+            self._byte_in(b, now)
+        self.stats['bytes'] += len(tx)
+        return rx
+
+    def _byte_in(self, b, now):
+        if self.state == 'cmd':
+            self._command(b, now)
+        elif self.state == 'rreg_n':
+            n = (b & 0x0F) + 1
+            r = self.rreg
+            self.out = [self.regs[i] if i < len(self.regs) else 0 for i in range(r, r + n)]
+            self.state = 'cmd'
+        elif self.state == 'wreg_n':
+            self.wreg_left = (b & 0x0F) + 1
+            self.state = 'wreg_data'
+        elif self.state == 'wreg_data':
+            if self.wreg < len(self.regs) and self.wreg != 0:
+                self.regs[self.wreg] = b
+            elif self.wreg == 0:
+                # STATUS: ID ve DRDY bitleri salt okunur
+                self.regs[0] = (self.regs[0] & 0xF1) | (b & 0x0E)
+            if self.wreg in (0, 2, 3) and self.regs[0] & 0x04:
+                # ACAL: STATUS/ADCON/DRATE yazımı öz kalibrasyonu tetikler
+                self._self_calibrate(0xF0, now)
+            self.wreg += 1
+            self.wreg_left -= 1
+            if self.wreg_left == 0:
+                self.state = 'cmd'
+
+    def _command(self, b, now):
+        if b in (0x00, 0xFF):                       # WAKEUP
+            if self.halted:
+                self._restart(now)
+        elif b == 0x01:                             # RDATA
+            self.out = self._data_bytes()
+        elif b == 0x03:                             # RDATAC
+            self.continuous = True
+        elif b == 0x0F:                             # SDATAC
+            self.continuous = False
+            self.out = []
+        elif b & 0xF0 == 0x10:                      # RREG
+            self.rreg = b & 0x0F
+            self.state = 'rreg_n'
+        elif b & 0xF0 == 0x50:                      # WREG
+            self.wreg = b & 0x0F
+            self.state = 'wreg_n'
+        elif b in (0xF0, 0xF1, 0xF2):               # SELFCAL / SELFOCAL / SELFGCAL
+            self._self_calibrate(b, now)
+        elif b in (0xF3, 0xF4):                     # SYSOCAL / SYSGCAL
+            self._restart(now)
+        elif b == 0xFC:                             # SYNC
+            self._update(now)
+            self.halted = True
+        elif b == 0xFD:                             # STANDBY
+            self.halted = True
+        elif b == 0xFE:                             # RESET
+            self.reset()
+
+
+class EmulatedBoard:
+    """Pinleri ve SPI veriyolunu yongalara bağlar."""
+
+    def __init__(self):
+        self.chips = []            # (chip, bus, cs_pin, drdy_pin, rst_pin)
+        self.pin_levels = {}
+        self.gpio_writes = 0
+        self.spi_calls = 0
+        self.model_bus_time = True
+        self.edge_watchers = {}    # pin -> durdurma olayı
+
+    def attach(self, chip, cs_pin=22, drdy_pin=17, rst_pin=18, bus=0):
+        self.chips.append((chip, bus, cs_pin, drdy_pin, rst_pin))
+        return chip
+
+    def output(self, pin, value):
+        self.gpio_writes += 1
+        prev = self.pin_levels.get(pin)
+        self.pin_levels[pin] = value
+        for chip, bus, cs, drdy, rst in self.chips:
+            if pin == cs:
+                chip.select(value == 0)
+            elif pin == rst and prev == 0 and value == 1:
+                chip.reset()
+        if self.edge_watchers:
+            self._wake_watchers()
+
+    def input(self, pin):
+        for chip, bus, cs, drdy, rst in self.chips:
+            if pin == drdy:
+                return chip.drdy()
+        return self.pin_levels.get(pin, 1)
+
+    def wait_for_edge(self, pin, timeout_ms):
+        for chip, bus, cs, drdy, rst in self.chips:
+            if pin == drdy:
+                now = chip.clock()
+                t_next = chip.next_ready_time(now)
+                limit = now + timeout_ms / 1000.0
+                if t_next is None or t_next > limit:
+                    time.sleep(max(0.0, limit - now))
+                    return None
+                time.sleep(max(0.0, t_next - now))
+                return pin
+        time.sleep(timeout_ms / 1000.0)
+        return None
+
+    def add_event_detect(self, pin, callback):
+        """RPi.GPIO kenar iş parçacığı gibi: DRDY her düştüğünde callback(pin)."""
+        for chip, bus, cs, drdy, rst in self.chips:
+            if pin == drdy:
+                stop, wake = threading.Event(), threading.Event()
+                self.edge_watchers[pin] = (stop, wake)
+                threading.Thread(target=self._watch_falling, args=(chip, pin, callback, stop, wake),
+                                 name=f"emu-edge-{pin}", daemon=True).start()
+                return
+        raise RuntimeError(f"Pin {pin} için kenar algılama emüle edilmiyor")
+
+    def remove_event_detect(self, pin):
+        watcher = self.edge_watchers.pop(pin, None)
+        if watcher is not None:
+            watcher[0].set()
+            watcher[1].set()
+
+    def _wake_watchers(self):
+        # Okuma/yeniden başlatma DRDY'yi yükseltir; kenar iş parçacıkları yeniden hesaplar
+        for stop, wake in self.edge_watchers.values():
+            wake.set()
+
+    @staticmethod
+    def _watch_falling(chip, pin, callback, stop, wake):
+        # Okunan veri ya da yeniden başlayan dönüşüm zinciri DRDY'yi yükseltir;
+        # bundan sonra görülen düşük seviye bir düşen kenardır (kısa yüksek dilimler kaçmaz)
+        key = (chip.chain_start, chip.read_idx)
+        level = chip.drdy_peek(chip.clock())
+        while not stop.is_set():
+            now = chip.clock()
+            new_key = (chip.chain_start, chip.read_idx)
+            new = chip.drdy_peek(now)
+            if new == 0 and (level == 1 or new_key != key):
+                callback(pin)
+            key, level = new_key, new
+            t_next = chip.next_ready_time(now)
+            delay = 0.01 if t_next is None else min(0.01, t_next - now)
+            wake.wait(max(EDGE_MIN_SLEEP_S, delay))
+            wake.clear()
+
+    def transfer(self, bus, tx, speed_hz):
+        self.spi_calls += 1
+        if self.model_bus_time and speed_hz:
+            end = time.perf_counter() + len(tx) * 8.0 / speed_hz
+            while time.perf_counter() < end:
+                pass
+        rx = [0] * len(tx)
+        for chip, b, cs, drdy, rst in self.chips:
+            if b == bus and chip.cs_low:
+                rx = chip.transfer(tx, speed_hz)
+                break
+        if self.edge_watchers:
+            self._wake_watchers()
+        return rx
+
+
+class FakeSpiDev:
+    def __init__(self, board, bus=0, device=0):
+        self.board = board
+        self.bus = bus
+        self.max_speed_hz = 500000
+        self.mode = 0
+
+    def writebytes(self, data):
+        self.board.transfer(self.bus, list(data), self.max_speed_hz)
+
+    def readbytes(self, n):
+        return self.board.transfer(self.bus, [0] * n, self.max_speed_hz)
+
+    def xfer2(self, data, speed_hz=0, delay_usecs=0, bits_per_word=0):
+        rx = self.board.transfer(self.bus, list(data), speed_hz or self.max_speed_hz)
+        if delay_usecs:
+            time.sleep(delay_usecs / 1000000.0)
+        return rx
+
+    xfer = xfer2
+
+    def close(self):
+        pass
+
+
+def make_gpio_module(board):
+    gpio = types.ModuleType('RPi.GPIO')
+    gpio.BCM = 11; gpio.BOARD = 10; gpio.OUT = 0; gpio.IN = 1
+    gpio.HIGH = 1; gpio.LOW = 0
+    gpio.PUD_UP = 22; gpio.PUD_DOWN = 21; gpio.PUD_OFF = 20
+    gpio.FALLING = 32; gpio.RISING = 31; gpio.BOTH = 33
+    gpio.setmode = lambda mode: None
+    gpio.setwarnings = lambda flag: None
+    gpio.cleanup = lambda *a: None
+
+    def setup(pin, mode, pull_up_down=None, initial=None):
+        if mode == gpio.OUT and initial is not None:
+            board.output(pin, initial)
+    gpio.setup = setup
+    gpio.output = board.output
+    gpio.input = board.input
+
+    def wait_for_edge(pin, edge, timeout=None, bouncetime=None):
+        return board.wait_for_edge(pin, timeout if timeout is not None else 3600000)
+    gpio.wait_for_edge = wait_for_edge
+
+    def add_event_detect(pin, edge, callback=None, bouncetime=None):
+        board.add_event_detect(pin, callback if callback is not None else (lambda channel: None))
+    gpio.add_event_detect = add_event_detect
+    gpio.remove_event_detect = board.remove_event_detect
+    return gpio
+
+
+def install(chip=None, board=None):
+    """
+    Sahte spidev ve RPi.GPIO modüllerini sys.modules'e yerleştirir ve
+    EmulatedBoard döner. config/ADS1256 önceden import edildiyse onları da
+    emülatöre bağlar.
+    """
+    if board is None:
+        board = EmulatedBoard()
+    if chip is None and not board.chips:
+        chip = EmulatedADS1256()
+    if chip is not None:
+        board.attach(chip)
+    gpio = make_gpio_module(board)
+    rpi = types.ModuleType('RPi')
+    rpi.GPIO = gpio
+    spidev = types.ModuleType('spidev')
+    spidev.SpiDev = lambda bus=0, device=0: FakeSpiDev(board, bus, device)
+    sys.modules['RPi'] = rpi
+    sys.modules['RPi.GPIO'] = gpio
+    sys.modules['spidev'] = spidev
+    # Ortak önbellekli GPIO katmanı sahte RPi.GPIO üzerinden sürülür
+    import gpio_backend
+    gpio_backend.GPIO.use_backend(gpio_backend.RPiGPIOBackend())
+    if 'config' in sys.modules:
+        cfg = sys.modules['config']
+        cfg.SPI = spidev.SpiDev(0, 0)
+        cfg._spi_devices = {(0, 0): cfg.SPI}
+    return board
@@ -0,0 +1,164 @@
+"""
+Arka arkaya çalışacak partilerin kuyruğu.
+
+Kuyruktaki partiler (tür, m3, adet, bilgi, reçete) BATCH_QUEUE tablosunda
+sırayla durur; bir parti bitince sıradaki otomatik başlar. Her partinin
+önünde isteğe bağlı bir kapı vardır:
+
+    none     : hemen başlar
+    cooldown : BATCH_COOLDOWN_MIN dakika soğuma beklenir
+    reload   : operatör fırının yeniden yüklendiğini onaylayınca başlar
+
+Tahmini süreler bitmiş raporların (aynı reçeteli olanlar öncelikli)
+ortanca süresinden hesaplanır.
+"""
+import datetime
+import statistics
+
+GATE_NONE = 'none'
+GATE_COOLDOWN = 'cooldown'
+GATE_RELOAD = 'reload'
+GATES = (GATE_NONE, GATE_COOLDOWN, GATE_RELOAD)
+
+GATE_TEXT = {
+    GATE_NONE: "Hemen",
+    GATE_COOLDOWN: "Soğuma sonrası",
+    GATE_RELOAD: "Yükleme onayı",
+}
+
+STATUS_WAITING = 'waiting'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+
+STATUS_TEXT = {
+    STATUS_WAITING: "Bekliyor",
+    STATUS_RUNNING: "Çalışıyor",
+    STATUS_DONE: "Bitti",
+}
+
+_TIME_FMT = '%Y-%m-%d %H:%M:%S'
+_COLUMNS = "ID, TYPE, M3, PIECES, INFO, RECIPE, GATE, STATUS, REPORT_ID"
+
+_schema_ready = set()
+
+
+def ensure_schema(conn, path_key=None):
+    if path_key is not None and path_key in _schema_ready:
+        return
+    conn.execute('CREATE TABLE IF NOT EXISTS "BATCH_QUEUE" ('
+                 '"ID" INTEGER PRIMARY KEY, "TYPE" TEXT, "M3" TEXT, "PIECES" TEXT, "INFO" TEXT, '
+                 '"RECIPE" TEXT, "GATE" TEXT, "STATUS" TEXT, "REPORT_ID" INT, "CREATED" DATETIME)')
+    conn.commit()
+    if path_key is not None:
+        _schema_ready.add(path_key)
+
+
+def _row(r):
+    return {"id": r[0], "type": r[1], "m3": r[2], "pieces": r[3], "info": r[4],
+            "recipe": r[5] or '', "gate": r[6] or GATE_NONE, "status": r[7], "report_id": r[8]}
+
+
+def enqueue(conn, type, m3, pieces, info, recipe='', gate=GATE_NONE):
+    if gate not in GATES:
+        raise ValueError(f"Bilinmeyen kapı: {gate}")
+    cur = conn.execute("INSERT INTO BATCH_QUEUE(TYPE, M3, PIECES, INFO, RECIPE, GATE, STATUS, CREATED) "
+                       "VALUES (?,?,?,?,?,?,?,?)",
+                       (type, m3, pieces, info, recipe, gate, STATUS_WAITING,
+                        datetime.datetime.now().strftime(_TIME_FMT)))
+    conn.commit()
+    return cur.lastrowid
+
+
+def items(conn):
+    """Bekleyen ve çalışan partiler, sırayla."""
+    rows = conn.execute(f"SELECT {_COLUMNS} FROM BATCH_QUEUE WHERE STATUS IN (?,?) ORDER BY ID",
+                        (STATUS_RUNNING, STATUS_WAITING)).fetchall()
+    # Çalışan parti her zaman başta
+    return sorted((_row(r) for r in rows), key=lambda it: it["status"] != STATUS_RUNNING)
+
+
+def next_item(conn):
+    row = conn.execute(f"SELECT {_COLUMNS} FROM BATCH_QUEUE WHERE STATUS=? ORDER BY ID LIMIT 1",
+                       (STATUS_WAITING,)).fetchone()
+    return None if row is None else _row(row)
+
+
+def mark_running(conn, item_id, report_id):
+    conn.execute("UPDATE BATCH_QUEUE SET STATUS=?, REPORT_ID=? WHERE ID=?", (STATUS_RUNNING, report_id, item_id))
+    conn.commit()
+
+
+def mark_done(conn, report_id):
+    conn.execute("UPDATE BATCH_QUEUE SET STATUS=? WHERE REPORT_ID=? AND STATUS=?",
+                 (STATUS_DONE, report_id, STATUS_RUNNING))
+    conn.commit()
+
+
+def remove(conn, item_id):
+    """Bekleyen partiyi kuyruktan çıkarır (çalışan parti silinmez)."""
+    conn.execute("DELETE FROM BATCH_QUEUE WHERE ID=? AND STATUS=?", (item_id, STATUS_WAITING))
+    conn.commit()
+
+
+def requeue_orphans(conn):
+    """Raporu silinmiş (devam ettirilmemiş) 'çalışan' partileri yeniden beklemeye alır."""
+    conn.execute("UPDATE BATCH_QUEUE SET STATUS=?, REPORT_ID=NULL WHERE STATUS=? AND "
+                 "(REPORT_ID IS NULL OR REPORT_ID NOT IN (SELECT ID FROM REPORT))",
+                 (STATUS_WAITING, STATUS_RUNNING))
+    conn.commit()
+
+
+def typical_duration_s(conn, recipe=''):
+    """Bitmiş raporların ortanca süresi (sn); aynı reçeteli rapor varsa yalnızca onlar. Yoksa None."""
+    rows = conn.execute("SELECT R.START_TIME, R.END_TIME, RR.NAME FROM REPORT R "
+                        "LEFT JOIN REPORT_RECIPE RR ON RR.REPORT_ID = R.ID "
+                        "WHERE R.END_TIME <> 'IP'").fetchall()
+    durations = {}
+    for start, end, name in rows:
+        try:
+            d = (datetime.datetime.strptime(end, _TIME_FMT) - datetime.datetime.strptime(start, _TIME_FMT)).total_seconds()
+        except (TypeError, ValueError):
+            continue
+        if d > 0:
+            durations.setdefault(name or '', []).append(d)
+    same = durations.get(recipe or '')
+    if same:
+        return statistics.median(same)
+    every = [d for ds in durations.values() for d in ds]
+    return statistics.median(every) if every else None
+
+
+def minimum_duration_s(settings):
+    # Geçmiş yoksa en az başarı sayacı kadar adım sürer
+    return settings.DESIRED_SUCCESS_COUNT * settings.DESIRED_SECONDS
+
+
+def plan(conn, settings, now, running=None):
+    """
+    Kuyruğun tahmini zaman çizelgesi.
+    running: çalışan parti için {'elapsed_s', 'counter', 'recipe'} (yoksa None)
+    Dönüş: [(item, başlangıç, bitiş, ilerleme 0..1 ya da None)], zamanlar datetime ya da None.
+    """
+    out = []
+    t = now
+    cooldown = datetime.timedelta(minutes=getattr(settings, 'BATCH_COOLDOWN_MIN', 30))
+    for it in items(conn):
+        typical = typical_duration_s(conn, it["recipe"]) or minimum_duration_s(settings)
+        if it["status"] == STATUS_RUNNING:
+            progress = None
+            if running is not None:
+                remaining_steps = max(0, settings.DESIRED_SUCCESS_COUNT - running["counter"])
+                remaining = max(typical - running["elapsed_s"], remaining_steps * settings.DESIRED_SECONDS)
+                progress = min(1.0, running["elapsed_s"] / (running["elapsed_s"] + remaining)) if remaining else 1.0
+                end = now + datetime.timedelta(seconds=remaining)
+                out.append((it, now - datetime.timedelta(seconds=running["elapsed_s"]), end, progress))
+                t = end
+            else:
+                out.append((it, None, None, None))
+            continue
+        if it["gate"] == GATE_COOLDOWN:
+            t = t + cooldown
+        start = t
+        t = start + datetime.timedelta(seconds=typical)
+        out.append((it, start, t, 0.0))
+    return out
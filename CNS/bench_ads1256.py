@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ADS1256 sürücü verim ölçümü (emülatör üzerinde, Pi gerekmez).
+
+Her edinim modu için örnek/sn, tarama gecikmesi (ortalama / p95), CPU
+süresi ve örnek başına SPI çağrısı / GPIO yazımı raporlanır.
+
+    python3 bench_ads1256.py --drate ADS1256_30000SPS --seconds 2
+    python3 bench_ads1256.py --modes scan stream --no-bus-time
+"""
+import argparse
+import time
+
+import numpy as np
+
+import ads1256_emulator
+
+MODES = ('single', 'scan', 'stream', 'oversample')
+
+
+def run_mode(mode, adc, board, seconds, oversample_count):
+    import oversampling
+    channels = list(range(8))
+    latencies = []
+    samples = 0
+    spi0, gpio0 = board.spi_calls, board.gpio_writes
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    sampler = oversampling.Oversampler(adc, count=oversample_count, mode='scan')
+    while time.perf_counter() - wall0 < seconds:
+        t = time.perf_counter()
+        if mode == 'single':
+            for ch in channels:
+                adc.ADS1256_GetChannalValue(ch)
+            samples += len(channels)
+        elif mode == 'scan':
+            adc.ADS1256_ScanChannels(channels)
+            samples += len(channels)
+        elif mode == 'stream':
+            adc.ADS1256_StreamChannel(0, 256)
+            samples += 256
+        elif mode == 'oversample':
+            sampler.read(channels)
+            samples += len(channels) * oversample_count
+        latencies.append(time.perf_counter() - t)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    lat = np.array(latencies)
+    return {
+        'mode': mode,
+        'samples_per_s': samples / wall,
+        'latency_ms': lat.mean() * 1000.0,
+        'latency_p95_ms': np.percentile(lat, 95) * 1000.0,
+        'cpu_pct': 100.0 * cpu / wall,
+        'spi_per_sample': (board.spi_calls - spi0) / max(1, samples),
+        'gpio_per_sample': (board.gpio_writes - gpio0) / max(1, samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ADS1256 sürücü verim ölçümü")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--drate', default='ADS1256_30000SPS')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--oversample', type=int, default=16)
+    parser.add_argument('--noise', type=float, default=50.0, help="emülatör gürültüsü (kod, std)")
+    parser.add_argument('--no-bus-time', action='store_true', help="SPI bayt süresini modelleme")
+    args = parser.parse_args()
+
+    board = ads1256_emulator.install(ads1256_emulator.EmulatedADS1256(noise_codes=args.noise))
+    board.model_bus_time = not args.no_bus_time
+    import ADS1256
+    adc = ADS1256.ADS1256()
+    if adc.ADS1256_init() != 0:
+        print("ADC başlatılamadı")
+        return 1
+    adc.ADS1256_ConfigADC(ADS1256.ADS1256_GAIN_E['ADS1256_GAIN_1'], ADS1256.ADS1256_DRATE_E[args.drate])
+
+    print(f"DRATE={args.drate}  süre={args.seconds}s/mod")
+    print(f"{'mod':<11}{'örnek/sn':>11}{'gecikme ms':>12}{'p95 ms':>9}{'CPU %':>8}{'SPI/örnek':>11}{'GPIO/örnek':>12}")
+    for mode in args.modes:
+        r = run_mode(mode, adc, board, args.seconds, args.oversample)
+        print(f"{r['mode']:<11}{r['samples_per_s']:>11.0f}{r['latency_ms']:>12.3f}{r['latency_p95_ms']:>9.3f}"
+              f"{r['cpu_pct']:>8.1f}{r['spi_per_sample']:>11.2f}{r['gpio_per_sample']:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""
+Yarım kalan partiler için adım başına kontrol noktası.
+
+Her adım sonunda kontrol çekirdeğinin durumu (adım no, başarı sayacı ve
+kural durumu, röle zamanlayıcıları, reçete fazı, rezistans denetleyicisi,
+simülasyon) RUN_CHECKPOINT tablosuna rapor numarasıyla tek satır olarak
+yazılır. Program elektrik kesintisi ya da çökme sonrası açıldığında
+END_TIME="IP" olan rapor bu satırdan devam ettirilebilir.
+"""
+import json
+import datetime
+
+VERSION = 1
+
+_schema_ready = set()
+
+
+def ensure_schema(conn, path_key=None):
+    if path_key is not None and path_key in _schema_ready:
+        return
+    conn.execute('CREATE TABLE IF NOT EXISTS "RUN_CHECKPOINT" ('
+                 '"REPORT_ID" INT UNIQUE, "STEP_NO" INT, "SAVED" DATETIME, "STATE" TEXT)')
+    conn.commit()
+    if path_key is not None:
+        _schema_ready.add(path_key)
+
+
+def save(conn, report_id, state):
+    conn.execute("INSERT OR REPLACE INTO RUN_CHECKPOINT(REPORT_ID, STEP_NO, SAVED, STATE) VALUES (?,?,?,?)",
+                 (report_id, state["step_no"], datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                  json.dumps(state, separators=(',', ':'))))
+    conn.commit()
+
+
+def load(conn, report_id):
+    """Raporun son kontrol noktası ya da yoksa/uyumsuzsa None."""
+    row = conn.execute("SELECT STATE FROM RUN_CHECKPOINT WHERE REPORT_ID=?", (report_id,)).fetchone()
+    if row is None:
+        return None
+    try:
+        state = json.loads(row[0])
+    except ValueError:
+        return None
+    return state if state.get("version") == VERSION else None
+
+
+def delete(conn, report_id):
+    conn.execute("DELETE FROM RUN_CHECKPOINT WHERE REPORT_ID=?", (report_id,))
+    conn.commit()
@@ -29,42 +29,210 @@
 
 
 import spidev
-import RPi.GPIO as GPIO
 import time
+import os
+import sys
+import json
+
+# All pin access goes through the process-wide cached GPIO layer (RPi.GPIO,
+# lgpio or fake backend), shared with the relay outputs
+from gpio_backend import GPIO
 
 # Pin definition
 RST_PIN         = 18
 CS_PIN       = 22
 DRDY_PIN        = 17
 
+# ADS1256 boards, one entry per chip. Boards on the same SPI bus share
+# SCLK/DIN/DOUT and are told apart by their own CS pin; RST may be shared.
+# The first entry is the Waveshare HAT wiring above.
+ADC_BOARDS = [
+    {'cs': CS_PIN, 'drdy': DRDY_PIN, 'rst': RST_PIN, 'bus': 0, 'device': 0},
+    {'cs': 23,     'drdy': 27,       'rst': RST_PIN, 'bus': 0, 'device': 0},
+]
+
+# Sensor column -> (board index, input). Inputs are AIN numbers in
+# single-ended mode, the order here is the column order of a sensor scan.
+SENSOR_CHANNELS = {
+    'T1':  (0, 0), 'T2':  (0, 1), 'T3':  (0, 2), 'T4':  (0, 3),
+    'T5':  (0, 4), 'T6':  (0, 5), 'T7':  (0, 6), 'T8':  (0, 7),
+    'T9':  (1, 0), 'T10': (1, 1), 'T11': (1, 2), 'T12': (1, 3),
+    'T13': (1, 4), 'AT1': (1, 5), 'AT2': (1, 6),
+}
+
+# DRDY wait: 'edge' sleeps on a GPIO falling-edge event, 'poll' samples the
+# pin every DRDY_POLL_INTERVAL seconds. Edge mode drops to polling by itself
+# if the GPIO backend cannot deliver edge events.
+DRDY_WAIT_MODE  = 'edge'
+DRDY_TIMEOUT_MS = 1000
+DRDY_POLL_INTERVAL = 0.0002
+
+# SPI clock. module_init starts at SPI_DEFAULT_HZ; ADS1256_init then tries
+# SPI_SPEED_CANDIDATES from the top (SCLK max is CLKIN/4 = 1.92MHz) and keeps
+# the first one that passes a register write/readback check.
+SPI_DEFAULT_HZ  = 20000
+SPI_AUTOTUNE    = True
+SPI_SPEED_CANDIDATES = [1920000, 1536000, 1000000, 768000, 500000, 250000, 100000, 20000]
+
+# ADS1256 timing with a 7.68MHz CLKIN, rounded up to whole microseconds
+T6_US           = 7     # command -> first DOUT clock (50 tCLKIN) for RDATA/RREG
+T11_US          = 4     # SYNC -> WAKEUP (24 tCLKIN)
+
+# ADC self-calibration cache (OFC0-2/FSC0-2 per board). A stored result is
+# reused at start-up unless it is older than CAL_MAX_AGE_S or the board
+# temperature moved more than CAL_MAX_TEMP_DELTA degrees since it was taken.
+CAL_CACHE_FILE  = 'adc_calibration.json'
+CAL_MAX_AGE_S   = 24 * 3600
+CAL_MAX_TEMP_DELTA = 5.0
+CAL_TIMEOUT_MS  = 3000  # SELFCAL takes several conversions at slow data rates
+BOARD_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
 # SPI device, bus = 0, device = 0
 SPI = spidev.SpiDev(0, 0)
 
+# Open SPI devices by (bus, device)
+_spi_devices = {(0, 0): SPI}
+
+# Redundant writes (e.g. CS already high) are skipped by the GPIO cache
 def digital_write(pin, value):
     GPIO.output(pin, value)
 
 def digital_read(pin):
-    return GPIO.input(DRDY_PIN)
+    return GPIO.input(pin)
+
+def _wait_low_poll(pin, timeout_ms):
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while GPIO.input(pin) != 0:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(DRDY_POLL_INTERVAL)
+    return True
+
+# Block until pin is low (data ready). Returns False on timeout.
+def wait_drdy(pin, timeout_ms=None):
+    global DRDY_WAIT_MODE
+    if timeout_ms is None:
+        timeout_ms = DRDY_TIMEOUT_MS
+    if DRDY_WAIT_MODE == 'edge':
+        try:
+            # Edge detection stays armed from the first wait on
+            edge = GPIO.edge_event(pin)
+        except (RuntimeError, AttributeError) as e:
+            print("DRDY edge wait unavailable (%s), falling back to polling" % e)
+            DRDY_WAIT_MODE = 'poll'
+        else:
+            # Clear before sampling the level: a fall after the check still
+            # sets the event, a fall before it leaves DRDY low until read
+            edge.clear()
+            if GPIO.input(pin) == 0:
+                return True
+            if edge.wait(timeout_ms / 1000.0):
+                return True
+            return GPIO.input(pin) == 0
+    # DRDY already low means an unread conversion is waiting
+    if GPIO.input(pin) == 0:
+        return True
+    return _wait_low_poll(pin, timeout_ms)
 
 def delay_ms(delaytime):
-    time.sleep(delaytime // 1000.0)
+    time.sleep(delaytime / 1000.0)
+
+# SoC temperature in degrees C as a proxy for the ADC board, None if unknown
+def board_temperature():
+    try:
+        with open(BOARD_TEMP_PATH) as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+def cal_cache_path():
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, CAL_CACHE_FILE)
+
+def load_cal_cache():
+    try:
+        with open(cal_cache_path(), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cal_cache(cache):
+    path = cal_cache_path()
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        print("Calibration cache not saved: %s" % e)
 
 def spi_writebyte(data):
     SPI.writebytes(data)
     
 def spi_readbytes(reg):
     return SPI.readbytes(reg)
-    
+
+def get_spi(bus=0, device=0):
+    spi = _spi_devices.get((bus, device))
+    if spi is None:
+        spi = spidev.SpiDev(bus, device)
+        spi.max_speed_hz = SPI_DEFAULT_HZ
+        spi.mode = 0b01
+        _spi_devices[(bus, device)] = spi
+    return spi
+
+def spi_set_speed(hz, spi=None):
+    (SPI if spi is None else spi).max_speed_hz = hz
+
+def spi_get_speed(spi=None):
+    return (SPI if spi is None else spi).max_speed_hz
+
+# One chip-select frame made of byte lists and integer microsecond gaps, e.g.
+#   spi_transaction([CMD_RDATA], T6_US, [0, 0, 0])
+# Consecutive byte lists are merged into a single xfer2 call and a gap is
+# applied as that call's delay_usecs, so a frame costs (gaps + 1) syscalls.
+# Returns every byte clocked in during the frame.
+def spi_transaction(*parts, cs_pin=None, spi=None):
+    if cs_pin is None:
+        cs_pin = CS_PIN
+    if spi is None:
+        spi = SPI
+    rx = []
+    chunk = []
+    digital_write(cs_pin, GPIO.LOW)
+    try:
+        for part in parts:
+            if isinstance(part, int):
+                if chunk:
+                    rx += spi.xfer2(chunk, 0, part)
+                    chunk = []
+                else:
+                    time.sleep(part / 1000000.0)
+            else:
+                chunk += part
+        if chunk:
+            rx += spi.xfer2(chunk)
+    finally:
+        digital_write(cs_pin, GPIO.HIGH)
+    return rx
 
 def module_init():
     GPIO.setmode(GPIO.BCM)
     GPIO.setwarnings(False)
-    GPIO.setup(RST_PIN, GPIO.OUT)
-    GPIO.setup(CS_PIN, GPIO.OUT)
-    #GPIO.setup(DRDY_PIN, GPIO.IN)
-    GPIO.setup(DRDY_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    SPI.max_speed_hz = 20000
-    SPI.mode = 0b01
+    # Every board's CS goes high, otherwise an unselected chip drives DOUT
+    boards = ADC_BOARDS or [{'cs': CS_PIN, 'drdy': DRDY_PIN, 'rst': RST_PIN}]
+    for board in boards:
+        GPIO.setup(board['rst'], GPIO.OUT, initial=GPIO.HIGH)
+        GPIO.setup(board['cs'], GPIO.OUT, initial=GPIO.HIGH)
+        #GPIO.setup(DRDY_PIN, GPIO.IN)
+        GPIO.setup(board['drdy'], GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        get_spi(board.get('bus', 0), board.get('device', 0))
+    for spi in _spi_devices.values():
+        spi.max_speed_hz = SPI_DEFAULT_HZ
+        spi.mode = 0b01
     return 0;
 
 ### END OF FILE ###
@@ -0,0 +1,19 @@
+import types
+
+import pytest
+
+import settings
+
+
+@pytest.fixture(scope='session')
+def sim_settings():
+    """settings modülünün değiştirilebilir kopyası: sim_settings(HEATER_CONTROL='pid', ...).
+    Varsayılanlar tekrarlanabilir bir simülasyon içindir (sabit seed, ısıtıcı denetleyicisi kapalı)."""
+    def make(**overrides):
+        s = types.SimpleNamespace(**{k: getattr(settings, k) for k in dir(settings) if not k.startswith('_')})
+        s.SIM_SEED = 4
+        s.SIM_START_TEMP = 20.0
+        s.HEATER_CONTROL = 'off'
+        s.__dict__.update(overrides)
+        return s
+    return make
@@ -0,0 +1,55 @@
+"""
+Kontrol döngüsünün ortak saati.
+
+Adım zamanlayıcısı, röle zamanlayıcısı, rezistans denetleyicisi ve güvenlik
+denetçisi time.monotonic yerine ControlClock.monotonic kullanır. Saat iki
+kipte çalışır:
+
+    gerçek : time.monotonic + sabit kayma; iş parçacıkları gerçek zamanda bekler
+    sanal  : zaman yalnızca advance_to() ile ilerler; olaylar tek iş parçacığında
+             zaman sırasıyla işlenir, 10 saatlik bir parti saniyeler içinde ve
+             her seferinde aynı sonuçla oynatılır
+
+Kipler arası geçişte zaman sürekli kalır: sanal kipten çıkınca saat kaldığı
+yerden gerçek hızla devam eder, böylece röle geçiş anları ve adım ızgarası
+geçerliliğini korur. Saat değeri oluşturulduğu andan itibaren saniyedir;
+sanal oluşturulan saat tam 0.0'dan başlar ve oynatma bit bit tekrarlanır.
+"""
+import datetime
+import time
+
+
+class ControlClock:
+    def __init__(self, virtual=False, start_datetime=None):
+        self.virtual = False
+        self._offset = 0.0
+        self._t = None
+        self._epoch = time.monotonic()
+        self._epoch_datetime = start_datetime if start_datetime is not None else datetime.datetime.now()
+        if virtual:
+            self._t = 0.0
+            self.virtual = True
+
+    def monotonic(self):
+        if self.virtual:
+            return self._t
+        return time.monotonic() - self._epoch + self._offset
+
+    def now(self):
+        """Saate karşılık gelen duvar saati (rapor zaman damgaları için)."""
+        return self._epoch_datetime + datetime.timedelta(seconds=self.monotonic())
+
+    def set_virtual(self, virtual):
+        if virtual and not self.virtual:
+            self._t = self.monotonic()
+            self.virtual = True
+        elif not virtual and self.virtual:
+            self._offset = self._t - (time.monotonic() - self._epoch)
+            self.virtual = False
+
+    def advance_to(self, t):
+        """Sanal kipte saati t'ye getirir (geri gitmez)."""
+        if not self.virtual:
+            raise RuntimeError("advance_to yalnızca sanal kipte kullanılır")
+        if t > self._t:
+            self._t = t
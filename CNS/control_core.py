@@ -0,0 +1,422 @@
+"""
+Fırın kontrol çekirdeği: röle zamanlayıcıları, ölçüm/simülasyon adımı ve
+başarı sayacı. PyQt'den bağımsızdır; aynı döngü GUI içindeki
+DataUpdateThread'de ya da acquisition_daemon ile ayrı bir süreçte çalışır.
+"""
+import os
+import sys
+import time
+import datetime
+import importlib.util
+
+from simulator import ISPM15Simulator
+from control_clock import ControlClock
+from step_scheduler import StepScheduler
+from relay_scheduler import RelayScheduler
+from heater_control import HeaterController, strategy_from_settings, configure_from_settings
+from recipes import RecipeEngine
+from success_evaluator import SuccessEvaluator, REASON_TEXT, DEFAULT_RULES
+from safety_supervisor import SafetySupervisor, TRIP_TEXT
+import checkpoint
+import plant_model
+
+
+def sensor_mask(settings):
+    # 15 elemanlı: 13 prob + 2 ortam
+    return [getattr(settings, f"sensor{i}") for i in range(1, 16)]
+
+
+def relay_profiles(settings):
+    """Ayarlardan röle görev çevrimleri: {isim: [(durum, süre_sn), ...]}"""
+    return {
+        'fan': [(True, settings.DESIRED_ENGINE_MUNITE * 60),
+                (False, settings.ENGINE_RESTING_MUNITE * 60)],
+        'rez': [(True, getattr(settings, 'RESISTANCE_WORK_MIN', 1) * 60),
+                (False, getattr(settings, 'RESISTANCE_REST_MIN', 1) * 60)],
+    }
+
+
+def make_source(settings):
+    """ACQ_SOURCE ayarına göre ölçüm kaynağı: 'sim' simülatör, 'adc' ADS1256 kartları."""
+    source = getattr(settings, 'ACQ_SOURCE', 'sim')
+    if source == 'adc':
+        # Donanım sürücüleri yalnızca gerçek fırında yüklenir
+        from adc_source import ADCSource
+        return ADCSource.from_settings(settings)
+    if source != 'sim':
+        raise ValueError(f"Bilinmeyen ölçüm kaynağı: {source}")
+    return ISPM15Simulator(settings,
+                           seed=getattr(settings, 'SIM_SEED', None),
+                           start_temp=getattr(settings, 'SIM_START_TEMP', None),
+                           model=plant_model.from_settings(settings))
+
+
+class SettingsWatcher:
+    """settings.py dosyasını değiştikçe yeniden yükler (GUI'den ayrı süreç için)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.module = None
+
+    def get(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return self.module
+        if mtime != self.mtime:
+            try:
+                spec = importlib.util.spec_from_file_location("settings", self.path)
+                mod = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(mod)
+                sys.modules["settings"] = mod
+                self.module = mod
+                self.mtime = mtime
+            except Exception as e:
+                print(f"Ayarlar yeniden yüklenemedi ({e}), önceki ayarlar kullanılıyor.")
+        return self.module
+
+
+class ControlCore:
+    """
+    settings_provider: her adımda güncel ayar modülünü döndüren çağrılabilir
+    gpio: RPi.GPIO uyumlu nesne (gpio_backend.GPIO: önbellekli, rpi/lgpio/fake arka uçlu)
+    on_step(t_str, vals, counter): her adım sonunda çağrılır
+    sim: ölçüm kaynağı; None ise ACQ_SOURCE ayarından (make_source)
+    recipe: recipes.load_recipe sonucu; verilirse band/görev çevrimleri fazdan gelir
+    clock: ControlClock; turbo'da sanal kipe geçer, röle/rezistans olayları
+           gerçek zamandaki anlarında ama beklemeden işlenir
+    checkpointer(state): her adımdan sonra snapshot() ile çağrılır (kalıcı kayıt için)
+    on_relay(name, state): röle durumu her değiştiğinde (röle iş parçacığından) çağrılır
+    """
+
+    def __init__(self, settings_provider, gpio, on_step=None, sim=None, recipe=None, clock=None,
+                 checkpointer=None, on_relay=None):
+        self.settings_provider = settings_provider
+        self.on_relay = on_relay
+        self.checkpointer = checkpointer
+        self._restore_pending = None
+        self.clock = clock if clock is not None else ControlClock()
+        self.recipe = RecipeEngine(recipe) if recipe is not None else None
+        self.base_settings = settings_provider()
+        self.settings = self._effective(self.base_settings)
+        self.gpio = gpio
+        self.on_step = on_step
+        self.sim = sim if sim is not None else make_source(self.settings)
+        self.counter = 0
+        self.target_count = self.settings.DESIRED_SUCCESS_COUNT
+        self.target_temp = self.settings.DESIRED_TEMP
+        self.step_no = 0
+        self.fan_state = False # False: Kapalı, True: Açık
+        self.rez_state = False
+        self.last_values = [0.0] * 15
+        self.last_time = None
+        self.scheduler = StepScheduler(self.settings.DESIRED_SECONDS, clock=self.clock.monotonic)
+        self.evaluator = SuccessEvaluator.from_settings(self.settings, sensor_mask(self.settings))
+        self.heater = None
+        self.safety = None
+        # Rezistans denetleyicisinin ortam okuması (°C); donanım kaynağı bunu değiştirir
+        self.read_ambient = self.sim.ambient_temperature
+        # ambient_sample'ı olan kaynak (ADC) ortamı her okumada ölçer ve DRDY anını verir;
+        # simülasyonda ortam yalnızca adımda ilerler, örnek anı son adımın anıdır
+        self.live_ambient = hasattr(self.sim, 'ambient_sample')
+        self.sample_stamp = None
+
+    def setup(self, virtual=False):
+        """virtual: sanal saatle başla; iş parçacıkları başlatılmaz, olaylar run() içinde işlenir."""
+        s = self.settings
+        GPIO = self.gpio
+        # GPIO Kurulumu
+        GPIO.setmode(GPIO.BCM)
+
+        # RÖLE ZAMANLAYICISI: fan ve rezistans kendi görev çevrimlerinde,
+        # ölçüm periyodundan bağımsız anahtarlanır. Başlangıçta ikisi de çalışır.
+        self.clock.set_virtual(virtual)
+        self.relays = RelayScheduler(GPIO, clock=self.clock.monotonic, on_change=self._relay_changed)
+        profiles = relay_profiles(s)
+        self.relays.add_relay('rez', s.resistance_pin, profiles['rez']) # Rezistans
+        self.relays.add_relay('fan', s.fan_right_pin, profiles['fan'])  # Fan
+        self.relays.start(threaded=not virtual)
+        self.sim.rezistans_aktif = self.rez_state
+
+        # Güvenlik denetçisi röleler çalışır çalışmaz devrede olur
+        self.sample_stamp = self.clock.monotonic()
+        self.safety = SafetySupervisor.from_settings(s, self.read_ambient_sample, self._safety_trip,
+                                                     sample_period_s=self._sample_period())
+        self.safety.clock = self.clock.monotonic
+        if not virtual:
+            self.safety.start()
+        if self.recipe is not None:
+            print(f"Reçete: {self.recipe.recipe['name']}, faz: {self.recipe.name}")
+
+        # Hızlı rezistans döngüsü: açıksa rezistans rölesi görev çevriminden çıkar
+        strategy = strategy_from_settings(s)
+        if strategy is not None:
+            self.relays.force('rez', False)
+            self.heater = HeaterController(self.read_ambient, lambda on: self.relays.force('rez', on), strategy,
+                                           rate_hz=getattr(s, 'HEATER_RATE_HZ', 4),
+                                           min_dwell_s=getattr(s, 'HEATER_MIN_DWELL_S', 10),
+                                           window_s=getattr(s, 'HEATER_PID_WINDOW_S', 30),
+                                           clock=self.clock.monotonic)
+            if not virtual:
+                self.heater.start()
+            self.sim.heater_duty = 0.0
+        if self._restore_pending is not None:
+            self._restore_outputs(self._restore_pending)
+            self._restore_pending = None
+
+    def snapshot(self):
+        """Kontrol noktası: partiyi kaldığı adımdan sürdürmek için gereken durum."""
+        return {
+            'version': checkpoint.VERSION,
+            'step_no': self.step_no,
+            'counter': self.counter,
+            'last_values': list(self.last_values),
+            'last_time': None if self.last_time is None else self.last_time.strftime('%Y-%m-%d %H:%M:%S'),
+            'evaluator': self.evaluator.snapshot(),
+            'relays': self.relays.snapshot(),
+            'recipe': None if self.recipe is None else dict(self.recipe.snapshot(self.last_time),
+                                                            name=self.recipe.recipe['name']),
+            'heater': None if self.heater is None else self.heater.strategy.get_state(),
+            'sim': self.sim.snapshot(),
+        }
+
+    def restore(self, state):
+        """run() öncesi çağrılır; röle ve denetleyici durumları setup() içinde uygulanır."""
+        self.step_no = state['step_no']
+        self.counter = state['counter']
+        self.last_values = state['last_values']
+        if state.get('last_time'):
+            self.last_time = datetime.datetime.strptime(state['last_time'], '%Y-%m-%d %H:%M:%S')
+        self.evaluator.restore(state['evaluator'])
+        if self.recipe is not None and state.get('recipe') and state['recipe'].get('name') == self.recipe.recipe['name']:
+            self.recipe.restore(state['recipe'])
+            self.settings = self._effective(self.base_settings)
+        self.sim.restore(state['sim'])
+        self._restore_pending = state
+
+    def _restore_outputs(self, state):
+        for name, snap in state.get('relays', {}).items():
+            if name in self.relays.relays:
+                self.relays.restore(name, snap)
+        if self.heater is not None and state.get('heater'):
+            self.heater.strategy.set_state(state['heater'])
+
+    def set_virtual(self, virtual):
+        """Turbo geçişi: iş parçacıkları durur/başlar, saat kaldığı yerden devam eder."""
+        if virtual == self.clock.virtual:
+            return
+        if virtual:
+            if self.heater is not None:
+                self.heater.stop()
+            self.safety.stop()
+            self.relays.detach()
+            self.clock.set_virtual(True)
+        else:
+            self.clock.set_virtual(False)
+            self.relays.attach()
+            self.safety.start()
+            if self.heater is not None:
+                self.heater.start()
+
+    def virtual_step(self):
+        """
+        Sanal saatte bir adım: saat sıradaki son tarihe atlar, aradaki röle ve
+        rezistans olayları gerçek zamandaki anlarında işlenir. Trip olursa False.
+        """
+        self.advance(self.scheduler.take())
+        self.safety.tick()
+        if self.tripped():
+            return False
+        self.step(self.clock.now())
+        return True
+
+    def advance(self, target):
+        """Sanal saat: target'a kadar röle ve rezistans olaylarını zaman sırasıyla işler."""
+        drivers = [self.relays] if self.heater is None else [self.relays, self.heater]
+        while True:
+            due, driver = None, None
+            for d in drivers:
+                t = d.next_due()
+                if t is not None and t <= target and (due is None or t < due):
+                    due, driver = t, d
+            if driver is None:
+                break
+            self.clock.advance_to(due)
+            driver.run_due(due)
+        self.clock.advance_to(target)
+
+    def shutdown(self):
+        # Önce denetleyici durur ki kapatılan röleyi yeniden açmasın
+        if self.heater is not None:
+            self.heater.stop()
+        self.relays.stop(all_off=True)
+        if self.safety is not None:
+            self.safety.stop()
+
+    def _sample_period(self):
+        return 0.0 if self.live_ambient else float(self.settings.DESIRED_SECONDS)
+
+    def read_ambient_sample(self):
+        """(ortam °C, ölçüm anı); an kontrol saatinin tabanındadır."""
+        if not self.live_ambient:
+            return self.read_ambient(), self.sample_stamp
+        temp, stamp = self.sim.ambient_sample()
+        if stamp is not None:
+            # DRDY anı time.monotonic tabanında; yaşı korunarak kontrol saatine taşınır
+            stamp = self.clock.monotonic() - (time.monotonic() - stamp)
+        return temp, stamp
+
+    def _safety_trip(self, reason):
+        # Denetçi iş parçacığından çağrılır: röle kilidi beklenmeden pinler güvenli duruma çekilir
+        fan_on = bool(getattr(self.settings, 'SAFETY_FAN_ON_TRIP', False))
+        self.relays.interlock({'rez': False, 'fan': fan_on})
+
+    def tripped(self):
+        return self.safety is not None and self.safety.tripped is not None
+
+    def _relay_changed(self, name, state):
+        s = self.settings
+        if name == 'fan':
+            self.fan_state = state
+            print(f"FAN Durumu Değişti: {'AÇIK' if state else 'KAPALI'} (Pin {s.fan_right_pin})")
+        elif name == 'rez':
+            self.rez_state = state
+            print(f"REZİSTANS Durumu Değişti: {'AÇIK' if state else 'KAPALI'} (Pin {s.resistance_pin})")
+        if self.on_relay is not None:
+            self.on_relay(name, state)
+
+    def _effective(self, base):
+        # Reçete varsa geçerli fazın değerleri ayarların üzerine bindirilir
+        return self.recipe.apply(base) if self.recipe is not None else base
+
+    def update_recipe(self, sample_time, vals, mask):
+        if self.recipe is None:
+            return
+        ambient = [v for v, m in zip(vals[13:15], mask[13:15]) if m]
+        probes = [v for v, m in zip(vals[:13], mask[:13]) if m]
+        if self.recipe.update(sample_time,
+                              sum(ambient) / len(ambient) if ambient else None,
+                              min(probes) if probes else None,
+                              self.target_temp):
+            print(f"Reçete fazı: {self.recipe.name}")
+            self.settings = self._effective(self.base_settings)
+            self.update_relays()
+
+    def done(self):
+        return self.counter >= self.target_count
+
+    def update_relays(self):
+        # Ayar dosyasında süreler değiştiyse geçerli çevrim yeni sürelerle biter
+        for name, profile in relay_profiles(self.settings).items():
+            self.relays.set_profile(name, profile)
+
+    def step(self, sample_time=None):
+        """sample_time: ölçüm anı (datetime); None ise önceki adıma DESIRED_SECONDS eklenir."""
+        self.base_settings = self.settings_provider() or self.base_settings
+        self.settings = self._effective(self.base_settings)
+        self.sim.settings = self.settings
+        mask = sensor_mask(self.settings)
+
+        self.update_relays()
+
+        # calculate_step ısıtmayı rezistans_aktif'e göre hesaplar; her adımda
+        # röle durumunu zorla set et ki termostat mantığı bir sonraki adımı bozmasın
+        self.sim.rezistans_aktif = self.rez_state
+        if self.heater is not None:
+            configure_from_settings(self.heater.strategy, self.settings)
+            self.sim.heater_duty = self.heater.take_duty()
+        vals, target_hit = self.sim.calculate_step(mask, self.target_temp)
+        self.sample_stamp = self.clock.monotonic()
+        if self.safety is not None:
+            self.safety.sample_period_s = self._sample_period()
+
+        ev = self.evaluator
+        ev.configure(self.target_temp, getattr(self.settings, 'DESIRED_TEMP_DIFFERENCE', float('inf')), mask,
+                     getattr(self.settings, 'SUCCESS_RULES', DEFAULT_RULES))
+        was_counting = self.counter > 0
+        self.counter = ev.update(vals, target_hit)
+        if ev.reason is not None and was_counting:
+            print(REASON_TEXT[ev.reason])
+
+        if sample_time is None:
+            if self.last_time is None:
+                sample_time = datetime.datetime.now()
+            else:
+                sample_time = self.last_time + datetime.timedelta(seconds=self.settings.DESIRED_SECONDS)
+        t_str = sample_time.strftime('%Y-%m-%d %H:%M:%S')
+        self.update_recipe(sample_time, vals, mask)
+        self.step_no += 1
+        self.last_values = vals
+        self.last_time = sample_time
+        if self.on_step:
+            self.on_step(t_str, vals, self.counter)
+        if self.checkpointer is not None:
+            try:
+                self.checkpointer(self.snapshot())
+            except Exception as e:
+                # Kontrol noktası yazılamasa da parti sürer
+                print(f"Kontrol noktası yazılamadı: {e}")
+        return t_str, vals
+
+    def finish(self):
+        self.sim.sogutma_modu = True
+        # Program bittiğinde röleleri kapat (Active Low: HIGH=Kapalı)
+        self.shutdown()
+        print("Simülasyon Bitti. Röleler Kapatıldı.")
+        self.print_timing()
+
+    def print_timing(self):
+        st = self.scheduler.stats()
+        if st['steps']:
+            print(f"Adım zamanlaması: {st['steps']} adım, ort. gecikme {st['lateness_mean_s'] * 1000:.1f} ms, "
+                  f"jitter {st['jitter_s'] * 1000:.1f} ms, en kötü {st['lateness_max_s'] * 1000:.1f} ms, "
+                  f"kaçırılan {st['missed']}")
+        if self.safety is not None:
+            sf = self.safety.stats()
+            print(f"Güvenlik denetçisi: {sf['checks']} kontrol, en uzun aralık {sf['max_gap_s'] * 1000:.1f} ms "
+                  f"(bütçe {sf['budget_s'] * 1000:.0f} ms)")
+
+    def run(self, stop_event, pause_event, is_turbo=lambda: False):
+        """Hedef sayaca ulaşılırsa True, durdurulursa False döner."""
+        self.setup(virtual=is_turbo())
+        try:
+            sched = self.scheduler
+            while not self.done() and not stop_event.is_set() and not self.tripped():
+                if pause_event.is_set():
+                    while pause_event.is_set() and not stop_event.is_set():
+                        if not self.live_ambient:
+                            # Duraklatmada simüle fırın da durur; son ortam değeri geçerli kalır
+                            self.sample_stamp = self.clock.monotonic()
+                        time.sleep(0.5)
+                    sched.resume()
+
+                turbo = is_turbo()
+                self.set_virtual(turbo)
+                sched.set_period(self.settings.DESIRED_SECONDS)
+                if turbo:
+                    if not self.virtual_step():
+                        break
+                    time.sleep(0.001)
+                    continue
+
+                # Normal: mutlak son tarihe kadar bekle, ölçüm anını kaydet
+                if not sched.wait(stop_event):
+                    break
+                if self.tripped():
+                    break
+                self.step(self.clock.now())
+        except BaseException:
+            # Adım hata verirse röleler açık kalmasın
+            self.shutdown()
+            raise
+        if self.tripped():
+            print(f"Parti güvenlik nedeniyle durduruldu: {TRIP_TEXT[self.safety.tripped]}")
+            self.shutdown()
+            self.print_timing()
+            return False
+        if not stop_event.is_set():
+            self.finish()
+            return True
+        self.shutdown()
+        return False
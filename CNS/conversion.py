@@ -0,0 +1,126 @@
+"""
+Ham ADC kodundan °C'ye vektörel dönüşüm.
+
+Her sensör için ofset/kazanç ya da polinom katsayıları kalibrasyon
+dosyasından bir kez okunur ve kod alanına çevrilir; böylece bir taramanın
+(veya örnek x sensör bloğunun) tamamı tek NumPy ifadesiyle dönüştürülür.
+Sıcak yol için isteğe bağlı ara değerlemeli arama tablosu (LUT) vardır.
+
+calibration.json örneği (katsayılar volt cinsinden, c0 + c1*v + c2*v^2 ...):
+{
+    "default": {"offset": -4.0, "gain": 100.0},
+    "sensors": {
+        "T1":  {"offset": -3.8, "gain": 100.2},
+        "AT1": {"poly": [-4.1, 100.0, 0.15]}
+    }
+}
+"""
+import os
+import sys
+import json
+
+import numpy as np
+
+REFERENCE_VOLTAGE = 5.0
+MAX_ADC_VALUE = 8388607
+SENSOR_NAMES = [f"T{i}" for i in range(1, 14)] + ["AT1", "AT2"]
+
+# LM35 benzeri doğrusal formül: (voltage / 0.01) - 4
+DEFAULT_CALIBRATION = {"offset": -4.0, "gain": 100.0}
+CALIBRATION_FILE = "calibration.json"
+
+
+def get_calibration_path():
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, CALIBRATION_FILE)
+
+
+def load_calibration(path=None):
+    if path is None:
+        path = get_calibration_path()
+    if not os.path.exists(path):
+        return {"default": dict(DEFAULT_CALIBRATION), "sensors": {}}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Kalibrasyon dosyası okunamadı ({e}). Varsayılan formül kullanılıyor.")
+        return {"default": dict(DEFAULT_CALIBRATION), "sensors": {}}
+    data.setdefault("default", dict(DEFAULT_CALIBRATION))
+    data.setdefault("sensors", {})
+    return data
+
+
+def _volt_poly(entry):
+    if "poly" in entry:
+        return [float(c) for c in entry["poly"]]
+    return [float(entry.get("offset", 0.0)), float(entry.get("gain", 1.0))]
+
+
+class SensorConverter:
+    """
+    int32 kod dizisini (..., sensör) °C dizisine çevirir.
+    names: sütun sırasıyla sensör isimleri (varsayılan T1..T13, AT1, AT2)
+    use_lut: True ise kod üst bitleriyle tablodan doğrusal ara değerleme yapılır
+    """
+
+    def __init__(self, names=None, calibration=None, use_lut=False, lut_bits=16):
+        self.names = list(names) if names is not None else list(SENSOR_NAMES)
+        if calibration is None:
+            calibration = load_calibration()
+        default = calibration.get("default", DEFAULT_CALIBRATION)
+        sensors = calibration.get("sensors", {})
+        polys = [_volt_poly(sensors.get(name, default)) for name in self.names]
+        degree = max(len(p) for p in polys)
+
+        # Volt katsayılarını kod alanına taşı: v = k * code => c_i * k^i
+        k = REFERENCE_VOLTAGE / MAX_ADC_VALUE
+        self.coeffs = np.zeros((degree, len(self.names)), dtype=np.float64)
+        for j, p in enumerate(polys):
+            for i, c in enumerate(p):
+                self.coeffs[i, j] = c * k ** i
+
+        self.use_lut = use_lut
+        self.lut_bits = lut_bits
+        self.lut = None
+        if use_lut:
+            self._build_lut()
+
+    def _poly(self, codes):
+        x = np.asarray(codes, dtype=np.float64)
+        out = np.broadcast_to(self.coeffs[-1], x.shape).copy()
+        for c in self.coeffs[-2::-1]:
+            out *= x
+            out += c
+        return out
+
+    def _build_lut(self):
+        # Tablo düğümleri: tüm 24 bit aralığında 2^lut_bits eşit aralık
+        self._shift = 24 - self.lut_bits
+        nodes = (np.arange((1 << self.lut_bits) + 1, dtype=np.float64) * (1 << self._shift)) - (1 << 23)
+        self.lut = self._poly(nodes[:, None] * np.ones(len(self.names)))
+
+    def _lookup(self, codes):
+        u = np.asarray(codes, dtype=np.int64) + (1 << 23)
+        idx = u >> self._shift
+        frac = (u & ((1 << self._shift) - 1)) / float(1 << self._shift)
+        cols = np.arange(len(self.names))
+        lo = self.lut[idx, cols]
+        hi = self.lut[idx + 1, cols]
+        return lo + (hi - lo) * frac
+
+    def convert(self, codes):
+        """codes: son ekseni sensör sırasında olan int32 dizi."""
+        if self.use_lut:
+            return self._lookup(codes)
+        return self._poly(codes)
+
+    def convert_std(self, code_std):
+        """Kod cinsinden gürültüyü (std) doğrusal terimle °C'ye çevirir."""
+        code_std = np.asarray(code_std, dtype=np.float64)
+        if len(self.coeffs) < 2:
+            return np.zeros_like(code_std)
+        return np.abs(code_std * self.coeffs[1])
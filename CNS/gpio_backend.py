@@ -0,0 +1,305 @@
+"""
+Röle/IO katmanı: pinleri sahiplenir, her pini bir kez kurar, aynı seviyeyi
+tekrar yazmaz ve geçiş zamanlarını kaydeder.
+
+Arka uçlar birbirinin yerine kullanılabilir:
+    rpi   : RPi.GPIO (Raspberry Pi 4 ve öncesi)
+    lgpio : lgpio (Raspberry Pi 5; RPi.GPIO'nun RuntimeError verdiği durum)
+    fake  : sessiz bellek içi sahte arka uç (PC, testler)
+GPIO_BACKEND ayarı 'auto' ise bu sırayla ilk çalışan seçilir. Seçim ilk
+kullanımda yapılır, böylece ayar modülü o ana kadar yüklenmiş olur.
+
+GPIO nesnesi RPi.GPIO ile aynı çağrıları (setmode/setup/output/input/cleanup)
+kabul eder; mevcut kod değişmeden önbellekli katmanı kullanır. Süreçteki tek
+pin önbelleğidir: röleler de ADC sürücüsü (config.digital_write) de bunun
+üzerinden yazar. edge_event() giriş pinlerinin düşen kenarını bildirir
+(ADS1256 DRDY).
+"""
+import sys
+import threading
+import time
+from collections import deque
+
+HIGH = 1
+LOW = 0
+
+
+class FakeBackend:
+    """Sessiz bellek içi arka uç: seviyeleri ve yazım sayısını tutar."""
+    name = 'fake'
+
+    def __init__(self):
+        self.levels = {}
+        self.writes = 0
+        self.falling = {}          # pin -> kenar geri çağrısı
+
+    def setup_output(self, pin, level):
+        self.levels[pin] = level
+        self.writes += 1
+
+    def setup_input(self, pin, pull_up=False):
+        self.levels.setdefault(pin, HIGH if pull_up else LOW)
+
+    def write(self, pin, level):
+        # Testler giriş pinlerini de bununla sürer; düşen kenar geri çağrıyı tetikler
+        prev = self.levels.get(pin)
+        self.levels[pin] = level
+        self.writes += 1
+        if prev == HIGH and level == LOW and pin in self.falling:
+            self.falling[pin]()
+
+    def add_falling_callback(self, pin, callback):
+        self.falling[pin] = callback
+
+    def read(self, pin):
+        return self.levels.get(pin, LOW)
+
+    def cleanup(self):
+        self.levels.clear()
+        self.falling.clear()
+
+
+class RPiGPIOBackend:
+    name = 'rpi'
+
+    def __init__(self):
+        import RPi.GPIO as gpio
+        self.gpio = gpio
+        gpio.setwarnings(False)
+        # Pi 5'te RPi.GPIO burada RuntimeError verir; seçim lgpio'ya geçer
+        gpio.setmode(gpio.BCM)
+
+    def setup_output(self, pin, level):
+        self.gpio.setup(pin, self.gpio.OUT, initial=level)
+
+    def setup_input(self, pin, pull_up=False):
+        pud = self.gpio.PUD_UP if pull_up else self.gpio.PUD_OFF
+        self.gpio.setup(pin, self.gpio.IN, pull_up_down=pud)
+
+    def write(self, pin, level):
+        self.gpio.output(pin, level)
+
+    def read(self, pin):
+        return self.gpio.input(pin)
+
+    def add_falling_callback(self, pin, callback):
+        # RPi.GPIO kenar iş parçacığı callback(kanal) çağırır
+        self.gpio.add_event_detect(pin, self.gpio.FALLING, callback=lambda channel: callback())
+
+    def cleanup(self):
+        self.gpio.cleanup()
+
+
+class LgpioBackend:
+    name = 'lgpio'
+
+    def __init__(self, chip=None):
+        import lgpio
+        self.lgpio = lgpio
+        # Pi 5'te başlık pinleri gpiochip4'tedir, diğerlerinde gpiochip0
+        chips = [chip] if chip is not None else [4, 0]
+        last_error = None
+        for c in chips:
+            try:
+                self.handle = lgpio.gpiochip_open(c)
+                break
+            except lgpio.error as e:
+                last_error = e
+        else:
+            raise RuntimeError(f"gpiochip açılamadı: {last_error}")
+        self.pins = set()
+        self.input_flags = {}
+        self.callbacks = []
+
+    def setup_output(self, pin, level):
+        self.lgpio.gpio_claim_output(self.handle, pin, level)
+        self.pins.add(pin)
+
+    def setup_input(self, pin, pull_up=False):
+        flags = self.lgpio.SET_PULL_UP if pull_up else 0
+        self.lgpio.gpio_claim_input(self.handle, pin, flags)
+        self.input_flags[pin] = flags
+        self.pins.add(pin)
+
+    def write(self, pin, level):
+        self.lgpio.gpio_write(self.handle, pin, level)
+
+    def read(self, pin):
+        return self.lgpio.gpio_read(self.handle, pin)
+
+    def add_falling_callback(self, pin, callback):
+        lg = self.lgpio
+        lg.gpio_claim_alert(self.handle, pin, lg.FALLING_EDGE, self.input_flags.get(pin, 0))
+        self.pins.add(pin)
+        self.callbacks.append(lg.callback(self.handle, pin, lg.FALLING_EDGE,
+                                          lambda chip, gpio, level, tick: callback()))
+
+    def cleanup(self):
+        for cb in self.callbacks:
+            cb.cancel()
+        self.callbacks.clear()
+        for pin in self.pins:
+            try:
+                self.lgpio.gpio_free(self.handle, pin)
+            except self.lgpio.error:
+                pass
+        self.pins.clear()
+        self.lgpio.gpiochip_close(self.handle)
+
+
+BACKENDS = {'rpi': RPiGPIOBackend, 'lgpio': LgpioBackend, 'fake': FakeBackend}
+
+
+def select_backend(name='auto'):
+    """Adı verilen arka uç; 'auto' ise rpi -> lgpio -> fake sırasıyla ilk çalışan."""
+    if name != 'auto':
+        return BACKENDS[name]()
+    for key in ('rpi', 'lgpio'):
+        try:
+            backend = BACKENDS[key]()
+            print(f"GPIO arka ucu: {key}")
+            return backend
+        except (ImportError, RuntimeError) as e:
+            print(f"GPIO arka ucu '{key}' kullanılamıyor ({e})")
+    print("Gerçek GPIO bulunamadı, sahte (bellek içi) GPIO kullanılıyor.")
+    return FakeBackend()
+
+
+class CachedGPIO:
+    """
+    RPi.GPIO uyumlu, önbellekli pin katmanı.
+
+    history: (monotonic, pin, seviye) geçişleri (sınırlı kuyruk)
+    """
+    BCM = "BCM"; OUT = "OUT"; IN = "IN"; HIGH = HIGH; LOW = LOW
+    PUD_UP = "PUD_UP"; PUD_DOWN = "PUD_DOWN"; PUD_OFF = "PUD_OFF"
+
+    def __init__(self, backend=None, history=4096, clock=time.monotonic):
+        self._backend = backend
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.modes = {}           # pin -> OUT / IN
+        self.levels = {}          # pin -> son yazılan seviye
+        self.last_change = {}     # pin -> son geçiş anı
+        self.edges = {}           # pin -> düşen kenarda set edilen Event
+        self.history = deque(maxlen=history)
+        self.writes = 0
+        self.skipped = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            name = getattr(sys.modules.get("settings"), 'GPIO_BACKEND', 'auto')
+            self._backend = select_backend(name)
+        return self._backend
+
+    def use_backend(self, backend):
+        """Arka ucu değiştirir (ör. başarısız donanımdan sahteye); pinler yeniden kurulur."""
+        with self.lock:
+            self._backend = backend
+            self.modes.clear()
+            self.levels.clear()
+            self.edges.clear()
+
+    # --- RPi.GPIO uyumlu çağrılar ---
+    def setwarnings(self, flag):
+        pass
+
+    def setmode(self, mode):
+        # Numaralandırma her zaman BCM; arka uç ilk kullanımda seçilir
+        self.backend
+
+    def setup(self, pin, mode, initial=None, pull_up_down=None):
+        with self.lock:
+            if mode == self.IN:
+                if self.modes.get(pin) != self.IN:
+                    self.backend.setup_input(pin, pull_up=pull_up_down == self.PUD_UP)
+                    self.modes[pin] = self.IN
+                    self.levels.pop(pin, None)
+                return
+            level = LOW if initial is None else initial
+            if self.modes.get(pin) != self.OUT:
+                self.backend.setup_output(pin, level)
+                self.modes[pin] = self.OUT
+                self._record(pin, level)
+                self.writes += 1
+            else:
+                # Pin zaten çıkış: kurulum tekrarlanmaz, yalnızca seviye gerekiyorsa yazılır
+                self._write(pin, level)
+
+    def output(self, pin, level):
+        with self.lock:
+            if self.modes.get(pin) != self.OUT:
+                self.backend.setup_output(pin, level)
+                self.modes[pin] = self.OUT
+                self._record(pin, level)
+                self.writes += 1
+                return
+            self._write(pin, level)
+
+    def input(self, pin):
+        with self.lock:
+            if pin in self.levels:
+                return self.levels[pin]
+            if self.modes.get(pin) != self.IN:
+                self.backend.setup_input(pin)
+                self.modes[pin] = self.IN
+        return self.backend.read(pin)
+
+    def edge_event(self, pin):
+        """
+        pin'in her düşen kenarında set edilen threading.Event. Algılama ilk
+        çağrıda bir kez kurulur ve açık kalır; bekleyen taraf Event'i kendisi
+        temizler. Arka uç kenar olayı veremiyorsa RuntimeError.
+        """
+        with self.lock:
+            event = self.edges.get(pin)
+            if event is None:
+                add = getattr(self.backend, 'add_falling_callback', None)
+                if add is None:
+                    raise RuntimeError(f"'{self.backend.name}' arka ucu kenar olayı vermiyor")
+                if self.modes.get(pin) != self.IN:
+                    self.backend.setup_input(pin)
+                    self.modes[pin] = self.IN
+                    self.levels.pop(pin, None)
+                event = threading.Event()
+                add(pin, event.set)
+                self.edges[pin] = event
+            return event
+
+    def cleanup(self):
+        with self.lock:
+            if self._backend is not None:
+                self._backend.cleanup()
+            self.modes.clear()
+            self.levels.clear()
+            self.edges.clear()
+
+    # --- önbellek ---
+    def _write(self, pin, level):
+        if self.levels.get(pin) == level:
+            self.skipped += 1
+            return
+        self.backend.write(pin, level)
+        self.writes += 1
+        self._record(pin, level)
+
+    def _record(self, pin, level):
+        if self.levels.get(pin) != level:
+            now = self.clock()
+            self.history.append((now, pin, level))
+            self.last_change[pin] = now
+        self.levels[pin] = level
+
+    def level(self, pin):
+        return self.levels.get(pin)
+
+    def transitions(self, pin=None):
+        return [h for h in self.history if pin is None or h[1] == pin]
+
+    def stats(self):
+        return {'backend': getattr(self._backend, 'name', None), 'writes': self.writes,
+                'skipped': self.skipped, 'transitions': len(self.history)}
+
+
+GPIO = CachedGPIO()
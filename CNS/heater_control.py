@@ -0,0 +1,249 @@
+"""
+Ortam sıcaklığına göre rezistansı süren hızlı kontrol döngüsü.
+
+Denetleyici iki ortam kanalını (AT1, AT2) saniyede birkaç kez okur ve
+rezistans rölesini 60 sn'lik rapor satırlarından bağımsız olarak anahtarlar.
+Strateji takılabilir:
+
+    HysteresisStrategy : RESISTANCE_MIN altında aç, RESISTANCE_MAX üstünde kapat
+    PIDStrategy        : 0..1 görev oranı; zaman oranlı pencereyle röleye çevrilir,
+                         integral doygunlukta büyümez (anti-windup)
+
+Röle en az min_dwell_s saniye aynı durumda kalır (kontaktör ömrü).
+Okuma başarısız olursa (None/NaN) rezistans kapatılır.
+Sanal saatte iş parçacığı başlatılmaz; kararlar next_due()/run_due() ile
+aynı hızda, sanal zamanda verilir.
+"""
+import math
+import threading
+import time
+
+
+class HysteresisStrategy:
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+        self.on = True
+
+    def configure(self, low, high):
+        self.low = low
+        self.high = high
+
+    def reset(self):
+        self.on = True
+
+    def get_state(self):
+        return {'on': self.on}
+
+    def set_state(self, state):
+        self.on = bool(state.get('on', True))
+
+    def update(self, temp, now):
+        if temp >= self.high:
+            self.on = False
+        elif temp <= self.low:
+            self.on = True
+        return self.on
+
+
+class PIDStrategy:
+    def __init__(self, setpoint, kp, ki, kd=0.0, out_min=0.0, out_max=1.0):
+        self.setpoint = setpoint
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.out_min = out_min
+        self.out_max = out_max
+        self.reset()
+
+    def configure(self, setpoint, kp, ki, kd=0.0):
+        self.setpoint = setpoint
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+
+    def reset(self):
+        self.integral = 0.0
+        self.last_temp = None
+        self.last_time = None
+        self.output = 0.0
+
+    def get_state(self):
+        return {'integral': self.integral, 'output': self.output}
+
+    def set_state(self, state):
+        # Zaman tabanı yeni süreçte farklıdır; türev ve dt ilk ölçümle yeniden başlar
+        self.integral = float(state.get('integral', 0.0))
+        self.output = float(state.get('output', 0.0))
+
+    def update(self, temp, now):
+        error = self.setpoint - temp
+        dt = 0.0 if self.last_time is None else max(0.0, now - self.last_time)
+        # Türev ölçümden alınır; set değeri değişince sıçrama yapmaz
+        deriv = 0.0
+        if self.last_temp is not None and dt > 0:
+            deriv = -(temp - self.last_temp) / dt
+        self.last_temp = temp
+        self.last_time = now
+
+        unclamped = self.kp * error + self.ki * (self.integral + error * dt) + self.kd * deriv
+        # Anti-windup: çıkış doygunken aynı yöne integral biriktirme
+        saturated_high = unclamped > self.out_max and error > 0
+        saturated_low = unclamped < self.out_min and error < 0
+        if not (saturated_high or saturated_low):
+            self.integral += error * dt
+        out = self.kp * error + self.ki * self.integral + self.kd * deriv
+        self.output = min(self.out_max, max(self.out_min, out))
+        return self.output
+
+
+def strategy_from_settings(settings):
+    """HEATER_CONTROL ayarına göre strateji; 'off' ise None."""
+    mode = getattr(settings, 'HEATER_CONTROL', 'off')
+    low = settings.RESISTANCE_MIN
+    high = settings.RESISTANCE_MAX
+    if mode == 'hysteresis':
+        return HysteresisStrategy(low, high)
+    if mode == 'pid':
+        return PIDStrategy(getattr(settings, 'HEATER_PID_SETPOINT', (low + high) / 2.0),
+                           getattr(settings, 'HEATER_PID_KP', 0.08),
+                           getattr(settings, 'HEATER_PID_KI', 0.002),
+                           getattr(settings, 'HEATER_PID_KD', 0.0))
+    return None
+
+
+def configure_from_settings(strategy, settings):
+    """Ayar dosyası değiştiyse sınırları/kazançları strateji durumunu bozmadan günceller."""
+    low = settings.RESISTANCE_MIN
+    high = settings.RESISTANCE_MAX
+    if isinstance(strategy, HysteresisStrategy):
+        strategy.configure(low, high)
+    elif isinstance(strategy, PIDStrategy):
+        strategy.configure(getattr(settings, 'HEATER_PID_SETPOINT', (low + high) / 2.0),
+                           getattr(settings, 'HEATER_PID_KP', 0.08),
+                           getattr(settings, 'HEATER_PID_KI', 0.002),
+                           getattr(settings, 'HEATER_PID_KD', 0.0))
+
+
+class HeaterController:
+    """
+    read_ambient(): ortam sıcaklığı (°C) ya da None; iş parçacığı güvenli olmalı
+    set_heater(on): röleyi sürer (ör. RelayScheduler.force)
+    """
+
+    def __init__(self, read_ambient, set_heater, strategy, rate_hz=4.0, min_dwell_s=10.0,
+                 window_s=30.0, clock=time.monotonic):
+        self.read_ambient = read_ambient
+        self.set_heater = set_heater
+        self.strategy = strategy
+        self.period = 1.0 / max(0.1, float(rate_hz))
+        self.min_dwell_s = min_dwell_s
+        self.window_s = window_s
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.reset()
+
+    def reset(self, now=None):
+        self.state = None
+        self.last_switch = None
+        self.window_start = None
+        self.window_duty = 0.0
+        self.last_temp = None
+        self.on_time = 0.0
+        self.duty_since = now
+        self.last_tick = now
+        self.strategy.reset()
+
+    def _want(self, out, now):
+        if isinstance(out, bool):
+            return out
+        # Zaman oranlı pencere: pencere başında görev oranı sabitlenir
+        if self.window_start is None or now - self.window_start >= self.window_s:
+            self.window_start = now
+            duty = float(out)
+            # Dwell süresinden kısa açık/kapalı dilimler yuvarlanır
+            if duty * self.window_s < self.min_dwell_s:
+                duty = 0.0
+            elif (1.0 - duty) * self.window_s < self.min_dwell_s:
+                duty = 1.0
+            self.window_duty = duty
+        return (now - self.window_start) < self.window_duty * self.window_s
+
+    def tick(self, now=None):
+        with self.lock:
+            if now is None:
+                now = self.clock()
+            if self.duty_since is None:
+                self.duty_since = now
+            if self.state and self.last_tick is not None:
+                self.on_time += max(0.0, now - self.last_tick)
+            self.last_tick = now
+
+            temp = self.read_ambient()
+            if temp is None or (isinstance(temp, float) and math.isnan(temp)):
+                want = False
+                self.last_temp = None
+            else:
+                self.last_temp = temp
+                want = self._want(self.strategy.update(temp, now), now)
+
+            if want != self.state:
+                dwell_ok = self.last_switch is None or now - self.last_switch >= self.min_dwell_s
+                # Ölçüm kaybında dwell beklenmez, rezistans hemen kapanır
+                if dwell_ok or self.last_temp is None:
+                    self.state = want
+                    self.last_switch = now
+                    self.set_heater(want)
+            return self.state
+
+    def take_duty(self, now=None):
+        """Son çağrıdan bu yana rezistansın açık kaldığı süre oranı (0..1)."""
+        with self.lock:
+            if now is None:
+                now = self.clock()
+            if now is None or self.duty_since is None:
+                return 1.0 if self.state else 0.0
+            if self.state and self.last_tick is not None:
+                self.on_time += max(0.0, now - self.last_tick)
+                self.last_tick = now
+            span = now - self.duty_since
+            duty = self.on_time / span if span > 0 else (1.0 if self.state else 0.0)
+            self.on_time = 0.0
+            self.duty_since = now
+            return min(1.0, max(0.0, duty))
+
+    def next_due(self):
+        """Sanal saat: sıradaki kararın zamanı."""
+        return self.clock() if self.last_tick is None else self.last_tick + self.period
+
+    def run_due(self, now):
+        self.tick(now)
+
+    def _run(self):
+        next_t = self.clock()
+        while not self.stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Rezistans denetleyici hatası: {e}")
+                self.set_heater(False)
+                self.state = False
+            next_t += self.period
+            delay = next_t - self.clock()
+            if delay < 0:
+                next_t = self.clock()
+                delay = 0
+            self.stop_event.wait(delay)
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="heater-control", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
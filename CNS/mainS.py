@@ -10,13 +10,14 @@ import sys
 import time
 import datetime
 import threading
+import multiprocessing
 import sqlite3
 import importlib.util
 import shutil
-import random
+import tempfile
 import atexit
 import math
-import requests # Hava durumu için
+import argparse
 
 # Grafik ve PDF
 import matplotlib.pyplot as plt
@@ -45,229 +46,15 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from matplotlib.ticker import MaxNLocator
 
-# --- SANAL GPIO ---
-class MockGPIO:
-    BCM = "BCM"; OUT = "OUT"; IN = "IN"; HIGH = 1; LOW = 0
-    @staticmethod
-    def setwarnings(flag): pass
-    @staticmethod
-    def setmode(mode): pass
-    @staticmethod
-    def setup(pin, mode, initial=0, pull_up_down=None): pass
-    @staticmethod
-    def output(pin, state):
-        state_str = "HIGH" if state == 1 else "LOW"
-        print(f"[MOCK GPIO] Pin {pin} -> {state_str}")
-    @staticmethod
-    def cleanup(): pass
-    @staticmethod
-    def PUD_UP(self): pass
-
-try:
-    import RPi.GPIO as GPIO
-    print("Gerçek GPIO Modülü Yüklendi.")
-except ImportError:
-    print("RPi.GPIO bulunamadı, MockGPIO kullanılıyor.")
-    GPIO = MockGPIO()
-
-# --- HAVA DURUMU (Simülasyon Başlangıcı) ---
-# --- HAVA DURUMU (Gerçek Veri) ---
-def get_online_temperature():
-    try:
-        print("Konum ve hava durumu alınıyor...")
-        # 1. Konum Bul (IP-API)
-        loc_resp = requests.get("http://ip-api.com/json/", timeout=2)
-        if loc_resp.status_code == 200:
-            data = loc_resp.json()
-            lat = data['lat']
-            lon = data['lon']
-            city = data['city']
-            print(f"Konum: {city} ({lat}, {lon})")
-            
-            # 2. Sıcaklık Çek (Open-Meteo)
-            weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-            w_resp = requests.get(weather_url, timeout=2)
-            if w_resp.status_code == 200:
-                w_data = w_resp.json()
-                temp = w_data['current_weather']['temperature']
-                print(f"İnternetten Çekilen Sıcaklık: {temp}°C")
-                return float(temp)
-                
-        raise Exception("API Hatası")
-        
-    except Exception as e:
-        print(f"Hava durumu alınamadı ({e}). Varsayılan değer kullanılıyor.")
-        # Fallback: Ruhsat raporlarına göre 15-20 derece arası ideal başlangıç
-        return random.uniform(15.0, 20.0)
-
-# --- GELİŞMİŞ SİMÜLASYON FİZİĞİ ---
-class ISPM15Simulator:
-    def __init__(self):
-        self.start_temp = get_online_temperature()
-        print(f"Simülasyon Başlatıldı. Dış Ortam: {self.start_temp:.2f}°C")
-        
-        # RUHSAT RAPORU SENARYOSU (Egemsoon & Parti 1)
-        self.target_shock = 102.0
-        self.target_approach = 85.0
-        self.target_hold = 78.0
-        
-        self.firin_set_degeri = self.target_shock
-        
-        # Dinamik Ortam Isınma Hızı (Dış sıcaklığa bağlı)
-        # Yeni Formül (Tuning): Base 1.8, Sensitivity 0.01
-        base_rate = 1.8
-        temp_factor = 1.0 + (self.start_temp - 20.0) * 0.01
-        temp_factor = max(0.5, min(1.5, temp_factor))
-        
-        self.hava_isinma_hizi = base_rate * temp_factor
-        print(f"Dinamik Isınma Hızı: {self.hava_isinma_hizi:.2f} (Dış Sıcaklık: {self.start_temp:.1f}°C)")
-        
-        # FİZİKSEL MODELLER (Sensör Profilleri)
-        # Kullanıcı İsteği: Tüm sensörler (13 adet) başta birbirine yakın olsun (+/- 0.5 fark).
-        # Zamanla açılsınlar (Farklı ısınma hızları).
-        
-        self.sensor_states = []
-        
-        # Ortam Sensörleri (AT1, AT2)
-        self.at_states = [
-            {"val": self.start_temp + random.uniform(-0.2, 0.2)}, # AT1
-            {"val": self.start_temp + random.uniform(-0.2, 0.2)}  # AT2
-        ]
-        
-        # Takoz Sensörleri (13 Adet)
-        for i in range(13):
-            # Başlangıç Değeri: Hepsi ortama çok yakın başlar
-            start_val = self.start_temp + random.uniform(-0.5, 0.5)
-            
-            # Isınma Hızı (İletim Katsayısı)
-            # Yavaş Grup: 1, 9, 11, 13 (Index: 0, 8, 10, 12)
-            # Diğerleri: Hızlı Grup
-            if i in [0, 8, 10, 12]:
-                # Yavaşlar (Sırasıyla biraz artar)
-                iletim = 0.0065 + (i * 0.0005) 
-            else:
-                # Hızlılar (Daha hızlı artar, makas açılır)
-                iletim = 0.0100 + (i * 0.0020)
-                
-            self.sensor_states.append({
-                "val": start_val,
-                "iletim": iletim
-            })
-        
-        self.rezistans_aktif = True
-        self.sogutma_modu = False
-        self.sterilizasyon_basladi = False
-        self.phase = "SHOCK" 
-        self.virtual_heater_on = True 
-
-    def calculate_step(self, active_sensors_mask, desired_temp):
-        # 1. AKTİF SENSÖRLERİ TESPİT ET
-        # active_sensors_mask: 15 elemanlı (13 prob + 2 ortam)
-        output_values = [0.0] * 15
-        current_takoz_vals = []
-        
-        # 2. SENSÖR HESAPLAMALARI
-        for i in range(13):
-            if active_sensors_mask[i]:
-                # Mevcut değer
-                val = self.sensor_states[i]["val"]
-                
-                # Çözünürlük ve Dalgalanma (Noise)
-                noise = random.uniform(-0.03, 0.03)
-                val_with_noise = val + noise
-                
-                output_values[i] = val_with_noise
-                
-                # Sadece Yavaş Grubun (1, 9, 11, 13) değerlerini kontrol döngüsüne al
-                # Çünkü süreci en yavaşlar belirler.
-                if i in [0, 8, 10, 12]:
-                    current_takoz_vals.append(val_with_noise)
-
-        # Ortam Değerleri
-        at1_val = self.at_states[0]["val"]
-        at2_val = self.at_states[1]["val"]
-        
-        # Ortam Noise
-        at1_out = at1_val + random.uniform(-0.05, 0.05)
-        at2_out = at2_val + random.uniform(-0.05, 0.05)
-        
-        if active_sensors_mask[13]: output_values[13] = at1_out
-        if active_sensors_mask[14]: output_values[14] = at2_out
-
-        # 3. KONTROL VE FAZ MANTIĞI (Sanal Termostat)
-        avg_ortam = (at1_val + at2_val) / 2.0
-        
-        if avg_ortam >= settings.RESISTANCE_MAX:
-            self.virtual_heater_on = False
-        elif avg_ortam <= settings.RESISTANCE_MIN:
-            self.virtual_heater_on = True
-            
-        effective_heating = self.rezistans_aktif and self.virtual_heater_on
-
-        # Sayaç Sinyali
-        if not current_takoz_vals:
-             min_takoz = avg_ortam
-        else:
-             min_takoz = min(current_takoz_vals)
-             
-        target_hit = (min_takoz >= desired_temp)
-
-        # 4. ORTAM FİZİĞİ
-        noise_at = random.uniform(-1.2, 1.2)
-        
-        if not self.sogutma_modu:
-            if effective_heating:
-                delta = self.hava_isinma_hizi + noise_at
-                self.at_states[0]["val"] += max(0.2, delta)
-                self.at_states[1]["val"] += max(0.2, delta + random.uniform(-0.5, 0.5))
-            else:
-                drop_rate = 0.8 
-                self.at_states[0]["val"] -= drop_rate + abs(noise_at * 0.2)
-                self.at_states[1]["val"] -= drop_rate + abs(noise_at * 0.2)
-        else:
-            self.at_states[0]["val"] -= 2.2 + noise_at
-            self.at_states[1]["val"] -= 2.2 + noise_at
-
-        # 5. TAKOZ FİZİĞİ (Isı Transferi)
-        ort_ortam = (self.at_states[0]["val"] + self.at_states[1]["val"]) / 2
-        
-        for i in range(13):
-            # Her sensör kendi state'ini günceller
-            state = self.sensor_states[i]
-            noise_t = random.uniform(-0.02, 0.02)
-            fark = ort_ortam - state["val"]
-            
-            if fark > 0:
-                # Isınma
-                base_iletim = state["iletim"]
-                dynamic_iletim = base_iletim * (1.0 + (fark / 100.0))
-                
-                # Kalıcı Isı Farkı (Strict Thermal Gap) - Kullanıcı İsteği
-                if fark < 9.0:
-                    # 9 Derece altına inince ISINMA DURUR. Sadece dalgalanma olur.
-                    # Bu sayede 9 derece fark korunur.
-                    artis = random.uniform(-0.05, 0.05)
-                    state["val"] += artis
-                elif fark < 12.0:
-                    # 12 Derece altına inince çok yavaşlar (%75 azalır)
-                    dynamic_iletim *= 0.25 
-                    artis = (fark * dynamic_iletim) + noise_t
-                    # Zorunlu minimum artışı kaldırıyoruz (max(0.008, ...) YOK)
-                    state["val"] += max(0.002, artis) # Çok küçük bir min değer
-                else:
-                    # Normal Isınma
-                    artis = (fark * dynamic_iletim) + noise_t
-                    state["val"] += max(0.008, artis)
-                
-            elif fark < -0.5: 
-                # Overshoot engelleme
-                state["val"] -= 0.05 
-                
-            elif self.sogutma_modu:
-                # Soğuma
-                state["val"] += (fark * state["iletim"] * 0.5)
-
-        return output_values, target_hit
+from gpio_backend import GPIO, FakeBackend
+from control_core import ControlCore
+from acquisition_daemon import AcquisitionProcess, STATUS_FINISHED, STATUS_STOPPED, STATUS_ERROR
+import recipes
+import checkpoint
+import batch_queue
+import plant_model
+from replay_source import ReplaySource, PipelineMonitor, load_rows
+import weather
 
 # --- AYARLAR ---
 def get_writable_settings_path():
@@ -338,16 +125,64 @@ except Exception as e:
 
 
 # --- DATABASE ---
-def get_db():
+_replay_db = None # oynatma sırasında yazılan geçici veritabanı kopyası
+def get_db_path():
+    if _replay_db is not None: return _replay_db
     if getattr(sys, 'frozen', False):
         base_path = os.path.dirname(sys.executable)
     else:
         base_path = os.path.dirname(os.path.abspath(__file__))
-    return sqlite3.connect(os.path.join(base_path, "mainDb.sqlite"))
+    return os.path.join(base_path, "mainDb.sqlite")
+def get_db():
+    path = get_db_path()
+    c = sqlite3.connect(path); recipes.ensure_schema(c, path); checkpoint.ensure_schema(c, path)
+    batch_queue.ensure_schema(c, path); return c
 def insert_report(id, firm_id, start_time, end_time, type, m3, pieces, info):
     c = get_db(); c.execute("INSERT INTO REPORT(ID,FIRM_ID,START_TIME,END_TIME,TYPE,M3,PIECES,REPORT_INFO) VALUES (?,?,?,?,?,?,?,?)", (id, firm_id, start_time, end_time, type, m3, pieces, info)); c.commit(); c.close()
 def insert_report_step(rid, *args):
     c = get_db(); c.execute("INSERT INTO Report_Details VALUES (NULL,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", (rid, *args)); c.commit(); c.close()
+def attach_report_recipe(rid, recipe):
+    c = get_db(); recipes.attach_to_report(c, rid, recipe); c.close()
+def get_active_recipe():
+    c = get_db(); r = recipes.load_active(c, settings); c.close(); return r
+def get_report_recipe(rid):
+    c = get_db(); r = recipes.report_recipe(c, rid); c.close(); return r
+def get_recipe(name):
+    c = get_db(); r = recipes.load_recipe(c, name); c.close(); return r
+def use_replay_db():
+    """Sonraki yazımları üretim veritabanının geçici kopyasına yönlendirir; oynatma raporu
+    kuyruk süre tahminine, fırın modeline ve yarım kalan parti kontrolüne karışmaz."""
+    global _replay_db
+    src = get_db_path(); tmp_dir = tempfile.mkdtemp(prefix="replay_")
+    path = os.path.join(tmp_dir, os.path.basename(src)); shutil.copyfile(src, path)
+    _replay_db = path; atexit.register(shutil.rmtree, tmp_dir, True)
+    print(f"Oynatma geçici veritabanına yazılıyor: {path}")
+def release_replay_db():
+    global _replay_db
+    if _replay_db is None: return
+    shutil.rmtree(os.path.dirname(_replay_db), ignore_errors=True); _replay_db = None
+def get_replay_rows(rid):
+    c = get_db(); rows = load_rows(c, rid); c.close(); return rows
+def get_recipe_names():
+    c = get_db(); r = recipes.list_recipes(c); c.close(); return r
+def queue_next():
+    c = get_db(); it = batch_queue.next_item(c); c.close(); return it
+def queue_mark_running(item_id, rid):
+    c = get_db(); batch_queue.mark_running(c, item_id, rid); c.close()
+def queue_done(rid):
+    c = get_db(); batch_queue.mark_done(c, rid); c.close()
+def save_checkpoint(rid, state):
+    c = get_db(); checkpoint.save(c, rid, state); c.close()
+def load_checkpoint(rid):
+    c = get_db(); st = checkpoint.load(c, rid); c.close(); return st
+def delete_checkpoint(rid):
+    c = get_db(); checkpoint.delete(c, rid); c.close()
+def refit_plant_model():
+    # Bitmiş rapor fırın modeline katılır (yalnızca yeni raporlar işlenir)
+    path = getattr(settings, 'SIM_PLANT_MODEL', '')
+    if not path: return
+    try: plant_model.update([get_db_path()], path)
+    except Exception as e: print(f"Fırın modeli güncellenemedi: {e}")
 def update_report(id, type, m3, pieces, info):
     c = get_db(); c.execute("UPDATE REPORT SET M3=?, TYPE=?, PIECES=?, REPORT_INFO=? WHERE id=?", (m3, type, pieces, info, id)); c.commit(); c.close()
 def set_report_end_time(rid):
@@ -368,7 +203,7 @@ def cleanup_db(rid):
 def delete_report_steps(rid):
     c = get_db(); c.execute("DELETE FROM Report_Details WHERE REPORT_ID = ?", (rid,)); c.commit(); c.close()
 def delete_report(rid):
-    c = get_db(); c.execute("DELETE FROM report WHERE ID = ?", (rid,)); c.commit(); c.close()
+    c = get_db(); c.execute("DELETE FROM report WHERE ID = ?", (rid,)); c.execute("DELETE FROM REPORT_RECIPE WHERE REPORT_ID = ?", (rid,)); c.commit(); c.close()
 def reset_autoincrement(table):
     c = get_db(); cur = c.cursor(); cur.execute(f"SELECT MAX(ID) FROM {table}"); mid = cur.fetchone()[0]
     if mid is None: mid=0; c.execute("DELETE FROM sqlite_sequence WHERE name=?", (table,))
@@ -1018,131 +853,163 @@ class AdminPanel(QDialog):
         QMessageBox.information(self, "Bilgi", "Ayarlar güncellendi!")
         self.close()
 
+class QueueDialog(QDialog):
+    """Parti kuyruğu: ekleme/çıkarma, her parti için ilerleme ve tahmini başlangıç/bitiş."""
+    HEADERS = ["Tür", "M3", "Adet", "Reçete", "Kapı", "Durum", "İlerleme", "Başlangıç", "Bitiş"]
+
+    def __init__(self, main):
+        super().__init__(main)
+        self.main = main
+        self.setWindowTitle("Parti Kuyruğu")
+        self.resize(1000, 500)
+        layout = QVBoxLayout(self)
+        self.table = QtWidgets.QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        form = QHBoxLayout()
+        self.txt_type = QtWidgets.QLineEdit(); self.txt_type.setPlaceholderText("Tür")
+        self.txt_m3 = QtWidgets.QLineEdit(); self.txt_m3.setPlaceholderText("M3")
+        self.txt_pieces = QtWidgets.QLineEdit(); self.txt_pieces.setPlaceholderText("Adet")
+        self.txt_info = QtWidgets.QLineEdit(); self.txt_info.setPlaceholderText("Bilgi")
+        self.cmb_recipe = QtWidgets.QComboBox(); self.cmb_recipe.addItem("(Ayarlardaki)", "")
+        for name in get_recipe_names(): self.cmb_recipe.addItem(name, name)
+        self.cmb_gate = QtWidgets.QComboBox()
+        for gate in batch_queue.GATES: self.cmb_gate.addItem(batch_queue.GATE_TEXT[gate], gate)
+        for w in (self.txt_type, self.txt_m3, self.txt_pieces, self.txt_info, self.cmb_recipe, self.cmb_gate): form.addWidget(w)
+        layout.addLayout(form)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("Kuyruğa Ekle", self.add), ("Seçiliyi Çıkar", self.remove), ("Sıradakini Başlat", self.start_next)):
+            b = QPushButton(text); b.clicked.connect(slot); buttons.addWidget(b)
+        layout.addLayout(buttons)
+
+        self.items = []
+        self.refresh()
+        self.timer = QtCore.QTimer(self); self.timer.timeout.connect(self.refresh); self.timer.start(5000)
+
+    def refresh(self):
+        c = get_db(); plan = batch_queue.plan(c, settings, datetime.datetime.now(), self.main.run_progress()); c.close()
+        self.items = [p[0] for p in plan]
+        self.table.setRowCount(len(plan))
+        fmt = lambda t: "-" if t is None else t.strftime('%d.%m %H:%M')
+        for row, (it, start, end, progress) in enumerate(plan):
+            gate = batch_queue.GATE_TEXT[it['gate']]
+            if it['gate'] == batch_queue.GATE_RELOAD and it['status'] == batch_queue.STATUS_WAITING: gate += " (onay bekler)"
+            cells = [it['type'], it['m3'], it['pieces'], it['recipe'] or "-", gate, batch_queue.STATUS_TEXT[it['status']],
+                     "-" if progress is None else f"%{progress * 100:.0f}", fmt(start), fmt(end)]
+            for col, text in enumerate(cells): self.table.setItem(row, col, QTableWidgetItem(str(text)))
+
+    def add(self):
+        c = get_db()
+        batch_queue.enqueue(c, self.txt_type.text(), self.txt_m3.text(), self.txt_pieces.text(), self.txt_info.text(),
+                            self.cmb_recipe.currentData(), self.cmb_gate.currentData())
+        c.close()
+        for w in (self.txt_type, self.txt_m3, self.txt_pieces, self.txt_info): w.clear()
+        self.refresh()
+
+    def remove(self):
+        row = self.table.currentRow()
+        if 0 <= row < len(self.items):
+            c = get_db(); batch_queue.remove(c, self.items[row]['id']); c.close()
+        self.refresh()
+
+    def start_next(self):
+        if self.main.is_running():
+            QMessageBox.information(self, "Kuyruk", "Çalışan parti bitince sıradaki otomatik başlayacak."); return
+        item = queue_next()
+        if item is not None: self.main.start_queued(item['id'])
+        self.refresh()
+
 # --- VERİ THREAD ---
 class DataUpdateThread(QtCore.QThread):
     data_updated = QtCore.pyqtSignal(str, *[str]*16)
+    checkpoint_ready = QtCore.pyqtSignal(object)
     finished = QtCore.pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, report_id=None, resume=None, recipe_name='', replay=None):
+        # resume: checkpoint.load sonucu; verilirse parti kaldığı adımdan ve kendi reçetesiyle sürer
+        # recipe_name: kuyruktaki partinin reçetesi; boşsa ACTIVE_RECIPE
+        # replay: (kaynak rapor no, hız); verilirse ölçüm yerine kayıtlı rapor oynatılır (yük üreteci)
         super().__init__()
         # Ayarları Yükle
         global settings; settings = load_settings_module(get_writable_settings_path())
-        self.sim = ISPM15Simulator()
-        self.counter = 0
-        self.target_count = settings.DESIRED_SUCCESS_COUNT
-        self.sim = ISPM15Simulator()
-        self.counter = 0
         self.target_count = settings.DESIRED_SUCCESS_COUNT
         self.target_temp = settings.DESIRED_TEMP
         self.turbo = False # Turbo Modu Flag'i
+        self.proc = None
+        self.source = None; self.monitor = None
+        self.resume_step = resume['step_no'] if resume is not None else 0 # panodan okunacak ilk adım bunun ardı
+        if replay is not None:
+            src_rid, speed = replay
+            self.recipe = get_report_recipe(src_rid)
+            self.source = ReplaySource(get_replay_rows(src_rid), speed, target_count=self.target_count)
+            self.monitor = PipelineMonitor()
+            self.stop_event = threading.Event(); self.pause_event = threading.Event()
+            return
+        if resume is not None:
+            self.recipe = get_report_recipe(report_id)
+        elif recipe_name:
+            self.recipe = get_recipe(recipe_name)
+        else:
+            self.recipe = get_active_recipe() # ACTIVE_RECIPE boşsa None: tek band (RESISTANCE_MIN/MAX)
+        if getattr(settings, 'ACQ_OUT_OF_PROCESS', False):
+            # Kontrol çekirdeği ayrı süreçte; bu thread yalnızca panoyu okur, kontrol noktasını süreç yazar
+            self.proc = AcquisitionProcess(get_writable_settings_path(), recipe=self.recipe,
+                                           checkpoint_db=get_db_path(), report_id=report_id, resume=resume)
+            self.stop_event = self.proc.stop_event; self.pause_event = self.proc.pause_event
+        else:
+            self.stop_event = threading.Event(); self.pause_event = threading.Event()
+            # Kontrol noktası GUI thread'inde, adım satırından hemen sonra yazılır (sinyaller sıralı)
+            self.core = ControlCore(lambda: settings, GPIO, on_step=self.emit_step, recipe=self.recipe,
+                                    checkpointer=self.checkpoint_ready.emit)
+            if resume is not None:
+                self.core.restore(resume)
+            self.sim = self.core.sim
 
-    def run(self):
-        self.stop_event = threading.Event(); self.pause_event = threading.Event()
-        
-        # GPIO Kurulumu
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(settings.resistance_pin, GPIO.OUT, initial=GPIO.HIGH) # Rezistans (Pin 13)
-        GPIO.setup(settings.fan_right_pin, GPIO.OUT, initial=GPIO.HIGH)  # Fan (Pin 24)
-        
-        dt_first_time = datetime.datetime.now() - datetime.timedelta(seconds=settings.DESIRED_SECONDS)
-        
-        # RÖLE ZAMANLAYICILARI
-        fan_state = False # False: Kapalı, True: Açık
-        rez_state = False
-        
-        fan_timer = time.time()
-        rez_timer = time.time()
-        
-        # Başlangıç durumu (İkisi de çalışsın mı? İsteğe bağlı, şimdilik bekleme modunda başlasınlar)
-        # Veya direkt çalışmaya başlasınlar:
-        fan_state = True; GPIO.output(settings.fan_right_pin, GPIO.LOW) # Aktif (Low)
-        rez_state = True; GPIO.output(settings.resistance_pin, GPIO.LOW) # Aktif (Low)
-        self.sim.rezistans_aktif = True
+    def emit_step(self, t_str, vals, counter):
+        self.data_updated.emit(t_str, *map(str, vals), str(counter))
 
-        while self.counter < self.target_count and not self.stop_event.is_set():
-            if self.pause_event.is_set():
-                while self.pause_event.is_set(): time.sleep(0.5)
-            
-            # Maske
-            mask = [
-                settings.sensor1, settings.sensor2, settings.sensor3, settings.sensor4, settings.sensor5,
-                settings.sensor6, settings.sensor7, settings.sensor8, settings.sensor9, settings.sensor10,
-                settings.sensor11, settings.sensor12, settings.sensor13, settings.sensor14, settings.sensor15
-            ]
-            
-            # --- RÖLE KONTROLÜ (Zaman Bazlı) ---
-            current_time = time.time()
-            
-            # 1. FAN KONTROLÜ
-            fan_duration = (settings.DESIRED_ENGINE_MUNITE * 60) if fan_state else (settings.ENGINE_RESTING_MUNITE * 60)
-            # print(f"Fan Timer: {current_time - fan_timer:.1f} / {fan_duration} (State: {fan_state})") # Debug
-            if (current_time - fan_timer) >= fan_duration:
-                # Durum değiştir
-                fan_state = not fan_state
-                fan_timer = current_time
-                # GPIO Güncelle (Active Low varsayımı: LOW=Açık, HIGH=Kapalı)
-                GPIO.output(settings.fan_right_pin, GPIO.LOW if fan_state else GPIO.HIGH)
-                print(f"FAN Durumu Değişti: {'AÇIK' if fan_state else 'KAPALI'} (Pin {settings.fan_right_pin})")
-
-            # 2. REZİSTANS KONTROLÜ
-            rez_work = getattr(settings, 'RESISTANCE_WORK_MIN', 1)
-            rez_rest = getattr(settings, 'RESISTANCE_REST_MIN', 1)
-            rez_duration = (rez_work * 60) if rez_state else (rez_rest * 60)
-            # print(f"Rez Timer: {current_time - rez_timer:.1f} / {rez_duration} (State: {rez_state})") # Debug
-            
-            if (current_time - rez_timer) >= rez_duration:
-                # Durum değiştir
-                rez_state = not rez_state
-                rez_timer = current_time
-                # GPIO Güncelle
-                GPIO.output(settings.resistance_pin, GPIO.LOW if rez_state else GPIO.HIGH)
-                # Simülasyon Fiziğine Bildir
-                self.sim.rezistans_aktif = rez_state
-                print(f"REZİSTANS Durumu Değişti: {'AÇIK' if rez_state else 'KAPALI'} (Pin {settings.resistance_pin})")
+    def emit_replay(self, t_str, vals, counter):
+        self.monitor.emitted(); self.emit_step(t_str, vals, counter)
 
-            # 3. SİMÜLASYON ADIMI
-            # Not: calculate_step içindeki termostat mantığı artık rezistans_aktif'i değiştirmemeli
-            # Ancak calculate_step fonksiyonu rezistans_aktif'i override edebilir.
-            # Bu yüzden calculate_step'e dokunmadan önce, simülasyon sınıfında termostatı devre dışı bırakmalıyız
-            # Veya calculate_step her çağrıldığında rezistans_aktif'i tekrar set etmeliyiz.
-            # En garantisi: calculate_step sonucunda rezistans_aktif değişse bile, biz burada override edelim.
-            # Ama calculate_step hesaplamayı rezistans_aktif'e göre yapıyor.
-            # Yani calculate_step çağırmadan önce set etmemiz yeterli.
-            
-            self.sim.rezistans_aktif = rez_state # Zorla set et
-            
-            vals, target_hit = self.sim.calculate_step(mask, self.target_temp)
-            
-            # Termostatın rezistansı kapatmasını engellemek için (Eğer calculate_step içinde kapatıyorsa)
-            # calculate_step içinde "self.rezistans_aktif = False" yapıyorsa, bir sonraki adımda düzelir.
-            # Ancak o anki ısıtma/soğutma hesabı o flag'e göre yapılıyor.
-            # Bu yüzden calculate_step içindeki termostat mantığını bypass etmek en doğrusu.
-            # Şimdilik basit çözüm: calculate_step'i değiştirmeden, her adımda rezistans_aktif'i set ediyoruz.
-            # Ancak calculate_step İÇİNDE rezistans_aktif değişirse, o adımın sonucu (ısınma/soğuma) etkilenir.
-            # Neyse ki calculate_step'te önce kontrol yapılıyor, sonra fizik hesaplanıyor.
-            # Yani biz girmeden set edersek, o içeride değiştirebilir.
-            # Bu yüzden calculate_step'i modifiye etmek daha sağlıklı.
-            
-            if target_hit: self.counter += 1
-            else: self.counter = 0
-                
-            dt_first_time += datetime.timedelta(seconds=settings.DESIRED_SECONDS)
-            t_str = dt_first_time.strftime('%Y-%m-%d %H:%M:%S')
-            self.data_updated.emit(t_str, *map(str, vals), str(self.counter))
-            
-            if self.turbo:
-                time.sleep(0.001) # Turbo: Bekleme yok
-            else:
-                time.sleep(settings.DESIRED_SECONDS) # Normal: Gerçek zamanlı bekleme
-        
-        if not self.stop_event.is_set():
-            self.sim.sogutma_modu = True
-            # Program bittiğinde röleleri kapat (Active Low: HIGH=Kapalı)
-            GPIO.output(settings.fan_right_pin, GPIO.HIGH)
-            GPIO.output(settings.resistance_pin, GPIO.HIGH)
-            print("Simülasyon Bitti. Röleler Kapatıldı.")
+    def run(self):
+        if self.source is not None:
+            if self.source.run(self.stop_event, self.pause_event, self.emit_replay):
+                self.finished.emit()
+            return
+        if self.proc is not None:
+            self.run_remote()
+            return
+        if self.core.run(self.stop_event, self.pause_event, lambda: self.turbo):
             self.finished.emit()
 
+    def run_remote(self):
+        self.proc.start()
+        board = self.proc.board
+        last_step = self.resume_step # devam eden partide önceki adımlar halkada yok; kayıp sayılmasın
+        try:
+            while True:
+                self.proc.turbo.value = 1 if self.turbo else 0
+                # Durum, adımlardan önce okunur ki süreç bitmeden yazdığı son adımlar da boşaltılsın
+                status = board.read()['status']
+                alive = self.proc.is_alive()
+                steps, lost = board.read_new_steps(last_step)
+                if lost: print(f"Edinim panosu: {lost} adım kaçırıldı")
+                for step_no, ts, counter, vals in steps:
+                    t_str = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+                    self.emit_step(t_str, vals, counter)
+                    last_step = step_no
+                if status == STATUS_FINISHED:
+                    self.finished.emit(); break
+                if status in (STATUS_STOPPED, STATUS_ERROR) or not alive:
+                    break
+                time.sleep(0.05)
+        finally:
+            self.proc.join(1.0)
+            self.proc.close()
+
 # --- MAIN ---
 class Main(QMainWindow):
     def __init__(self):
@@ -1152,9 +1019,15 @@ class Main(QMainWindow):
         self.ui.btn_RecipeOpe.clicked.connect(self.settings_click)
         self.ui.btn_ShowReports.clicked.connect(self.report_ops.openReportScreen)
         self.ui.btn_Graph.clicked.connect(self.graph_click)
-        self.cleanup_incomplete(); self.red_light(); atexit.register(self.red_light)
+        self.btn_Queue = QPushButton("Kuyruk"); self.btn_Queue.setFont(self.ui.btn_ShowReports.font())
+        self.btn_Queue.setSizePolicy(self.ui.btn_ShowReports.sizePolicy()); self.ui.Btn_verticalLayout.addWidget(self.btn_Queue)
+        self.btn_Queue.clicked.connect(lambda: QueueDialog(self).exec_())
+        self.run_started = None; self.last_counter = 0
+        weather.prefetch() # dış sıcaklık arka planda; parti başlangıcı ağı beklemez
+        resume_rid, resume_state = self.cleanup_incomplete(); self.red_light(); atexit.register(self.red_light)
         self.key_buffer = [] # Initialize key buffer for global key events
         self.installEventFilter(self) # Install event filter on self
+        if resume_rid is not None: self.resume_process(resume_rid, resume_state)
 
     def eventFilter(self, obj, event):
         if event.type() == QtCore.QEvent.KeyPress:
@@ -1196,31 +1069,40 @@ class Main(QMainWindow):
         dialog.exec_()
 
     def red_light(self):
-        global GPIO
         try:
             GPIO.setmode(GPIO.BCM)
-            # Röleleri Kapat (Güvenlik)
-            GPIO.setup(settings.fan_right_pin, GPIO.OUT, initial=GPIO.HIGH)
-            GPIO.setup(settings.resistance_pin, GPIO.OUT, initial=GPIO.HIGH)
+            # Röleleri Kapat (Güvenlik). Pin kurulu değilse kurulur, kuruluysa
+            # yalnızca seviye farklıysa yazılır (gpio_backend önbelleği)
             GPIO.output(settings.fan_right_pin, GPIO.HIGH)
             GPIO.output(settings.resistance_pin, GPIO.HIGH)
             
             # Kırmızı Işık Yak (Opsiyonel, mevcut kodda vardı)
-            GPIO.setup(settings.alert_red_pin, GPIO.OUT, initial=GPIO.LOW)
             GPIO.output(settings.alert_red_pin, GPIO.LOW)
             print("Program Kapatılıyor. Tüm Röleler Pasife Çekildi.")
             
         except RuntimeError as e:
             print(f"GPIO Hatası (red_light): {e}")
-            print("Muhtemelen Raspberry Pi 5 veya uyumsuz bir sürüm kullanıyorsunuz.")
-            print("MockGPIO moduna geçiliyor...")
-            GPIO = MockGPIO() # Fallback to Mock
+            print("Sahte GPIO arka ucuna geçiliyor...")
+            GPIO.use_backend(FakeBackend())
         except Exception as e:
             print(f"GPIO Genel Hata: {e}")
     def green_light_off(self): GPIO.setmode(GPIO.BCM); GPIO.output(settings.alert_green_pin, GPIO.HIGH)
     def cleanup_incomplete(self):
-        for i in get_incomplete_reports(): delete_report_steps(i); delete_report(i)
+        # Yarım kalan son raporun kontrol noktası varsa devam önerilir; diğer yarım raporlar silinir
+        incomplete = get_incomplete_reports(); last = int(report_index())
+        state = load_checkpoint(last) if last in incomplete else None; resume_rid = None
+        if state is not None:
+            ans = QMessageBox.question(self, "Yarım Kalan Parti",
+                                       f"Rapor {last}, {state['step_no']}. adımda yarım kaldı "
+                                       f"(başarılı adım {state['counter']}/{settings.DESIRED_SUCCESS_COUNT}).\n"
+                                       "Parti kaldığı adımdan devam etsin mi?",
+                                       QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if ans == QMessageBox.Yes: resume_rid = last
+        for i in incomplete:
+            if i != resume_rid: delete_report_steps(i); delete_report(i); delete_checkpoint(i)
         reset_autoincrement('report')
+        c = get_db(); batch_queue.requeue_orphans(c); c.close()
+        return resume_rid, (state if resume_rid is not None else None)
     def graph_click(self): d = MatplotlibDialog(); d.draw(report_index()); d.exec_()
     def start_click(self):
         txt = self.ui.btn_Start.text()
@@ -1229,14 +1111,79 @@ class Main(QMainWindow):
         else: self.start_dialog()
     def start_dialog(self): self.dia = QDialog(); u = Ui_Start_Dialog(); u.setupUi(self.dia); u.btn_Start_P.clicked.connect(lambda: self.begin_process(u)); self.dia.exec_()
     def begin_process(self, u):
+        self.start_batch(u.txt_type.text(), u.txt_amount.text(), u.txt_pieces.text(), u.txtArea_info.toPlainText())
+        self.dia.close()
+    def start_batch(self, type, m3, pieces, info, recipe_name='', queue_id=None):
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         rid = int(report_index()) + 1
-        insert_report(rid, "1", now, "IP", u.txt_type.text(), u.txt_amount.text(), u.txt_pieces.text(), u.txtArea_info.toPlainText())
-        self.ui.txt_time.setText(now)
-        self.thread = DataUpdateThread(); self.thread.data_updated.connect(self.on_data); self.thread.finished.connect(self.on_finished); self.thread.start()
-        self.ui.btn_Start.setText("Duraklat"); self.dia.close()
+        insert_report(rid, "1", now, "IP", type, m3, pieces, info)
+        self.ui.txt_time.setText(now); self.ui.tableWidget.setRowCount(0)
+        self.thread = DataUpdateThread(rid, recipe_name=recipe_name)
+        attach_report_recipe(rid, self.thread.recipe)
+        if queue_id is not None: queue_mark_running(queue_id, rid)
+        self.start_thread(rid)
+        self.ui.btn_Start.setText("Duraklat")
+    def start_replay(self, src_rid, speed):
+        """Kayıtlı raporu canlı edinimle aynı yoldan oynatır; yeni rapor veritabanının geçici kopyasına yazılır."""
+        if self.is_running(): return
+        use_replay_db()
+        now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rid = int(report_index()) + 1
+        insert_report(rid, "1", now, "IP", f"OYNATMA #{src_rid}", "", "", f"{speed:g}x")
+        self.ui.txt_time.setText(now); self.ui.tableWidget.setRowCount(0)
+        self.thread = DataUpdateThread(rid, replay=(src_rid, speed))
+        attach_report_recipe(rid, self.thread.recipe)
+        self.start_thread(rid)
+        self.ui.btn_Start.setText("Duraklat")
+    def is_running(self): return hasattr(self, 'thread') and self.thread.isRunning()
+    def run_progress(self):
+        # Kuyruk tahmini için çalışan partinin durumu
+        if not self.is_running() or self.run_started is None: return None
+        return {'elapsed_s': (datetime.datetime.now() - self.run_started).total_seconds(), 'counter': self.last_counter}
+    def advance_queue(self):
+        """Sıradaki kuyruk partisini kapısına göre başlatır; kuyruk boşsa False."""
+        item = queue_next()
+        if item is None: return False
+        if item['gate'] == batch_queue.GATE_COOLDOWN:
+            minutes = getattr(settings, 'BATCH_COOLDOWN_MIN', 30)
+            print(f"Kuyruk: {minutes} dk soğuma sonrası '{item['type']}' başlayacak.")
+            QtCore.QTimer.singleShot(int(minutes * 60000), lambda: self.start_queued(item['id']))
+        elif item['gate'] == batch_queue.GATE_RELOAD:
+            QtCore.QTimer.singleShot(0, lambda: self.confirm_reload(item['id']))
+        else:
+            self.start_queued(item['id'])
+        return True
+    def confirm_reload(self, item_id):
+        ans = QMessageBox.question(self, "Kuyruk", "Fırın yeniden yüklendi mi?\nSıradaki kuyruk partisi başlasın mı?",
+                                   QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        if ans == QMessageBox.Yes: self.start_queued(item_id)
+    def start_queued(self, item_id):
+        # Bekleme sırasında parti elle başlatılmış ya da kuyruktan çıkarılmış olabilir
+        item = queue_next()
+        if self.is_running() or item is None or item['id'] != item_id: return
+        print(f"Kuyruk: '{item['type']}' partisi başlıyor.")
+        self.start_batch(item['type'], item['m3'], item['pieces'], item['info'], item['recipe'], item['id'])
+    def resume_process(self, rid, state):
+        parti = get_parti(rid)
+        if parti: self.ui.txt_time.setText(str(parti[0][1]))
+        for r in get_report_details(rid): self.show_row(r[16], r[:15], r[15])
+        self.thread = DataUpdateThread(rid, resume=state); self.start_thread(rid)
+        self.ui.btn_Start.setText("Duraklat")
+        print(f"Rapor {rid} {state['step_no']}. adımdan devam ediyor.")
+    def start_thread(self, rid):
+        self.run_started = datetime.datetime.now(); self.last_counter = 0
+        self.thread.data_updated.connect(self.on_data); self.thread.finished.connect(self.on_finished)
+        self.thread.checkpoint_ready.connect(lambda state: save_checkpoint(rid, state)); self.thread.start()
     def on_data(self, t_str, *args):
-        vals = args[:15]; cnt = args[15]; row = self.ui.tableWidget.rowCount(); self.ui.tableWidget.insertRow(row)
+        mon = self.thread.monitor # yalnızca oynatmada: aşama gecikmeleri
+        if mon is not None: mon.received()
+        vals = args[:15]; cnt = args[15]; rem = settings.DESIRED_SUCCESS_COUNT - int(cnt); self.last_counter = int(cnt)
+        db_vals = self.show_row(t_str, vals, rem)
+        if mon is not None: mon.lap('ui')
+        insert_report_step(report_index(), *db_vals, "0", "0", t_str, rem)
+        if mon is not None: mon.lap('db'); mon.handled()
+    def show_row(self, t_str, vals, rem):
+        row = self.ui.tableWidget.rowCount(); self.ui.tableWidget.insertRow(row)
         db_vals = []
         for i, v in enumerate(vals):
             fv = float(v); item = QTableWidgetItem(f"{fv:.2f}"); db_vals.append(f"{fv:.2f}")
@@ -1244,12 +1191,18 @@ class Main(QMainWindow):
             self.ui.tableWidget.setItem(row, i, item)
             box = getattr(self.ui, f"txt_prob_status_{i+1}" if i > 0 else "txt_prob_status", None)
             if box: box.setText(f"{fv:.2f}")
-        rem = settings.DESIRED_SUCCESS_COUNT - int(cnt)
-        self.ui.txt_step.setText(str(rem)); self.ui.tableWidget.setItem(row, 15, QTableWidgetItem(str(rem))); self.ui.tableWidget.setItem(row, 16, QTableWidgetItem(t_str)); self.ui.tableWidget.scrollToBottom()
-        insert_report_step(report_index(), *db_vals, "0", "0", t_str, rem)
+        self.ui.txt_step.setText(str(rem)); self.ui.tableWidget.setItem(row, 15, QTableWidgetItem(str(rem))); self.ui.tableWidget.setItem(row, 16, QTableWidgetItem(str(t_str))); self.ui.tableWidget.scrollToBottom()
+        return db_vals
     def on_finished(self):
-        self.ui.btn_Start.setText("Başlat"); rid = report_index(); set_report_end_time(rid)
-        QMessageBox.information(self, "Bitti", f"İşlem tamamlandı.\nRapor No: {rid}")
+        self.ui.btn_Start.setText("Başlat"); rid = report_index(); set_report_end_time(rid); delete_checkpoint(int(rid))
+        if self.thread.monitor is not None:
+            # Oynatma: kuyruk ve fırın modeli etkilenmez, yalnızca ölçüm raporu
+            report = self.thread.monitor.format(); print(report); release_replay_db()
+            QMessageBox.information(self, "Oynatma Bitti", f"Rapor No: {rid} (geçici kopya silindi)\n\n{report}"); return
+        queue_done(int(rid)); refit_plant_model()
+        # Kuyrukta parti varsa bilgi kutusu beklenmeden sıradaki başlar
+        if self.advance_queue(): print(f"İşlem tamamlandı. Rapor No: {rid}")
+        else: QMessageBox.information(self, "Bitti", f"İşlem tamamlandı.\nRapor No: {rid}")
     def settings_click(self):
         d = QDialog(); u = Ui_Ui_Settings_Dialog(); u.setupUi(d)
         u.line_Ekds.setText(str(settings.DESIRED_TEMP))
@@ -1316,6 +1269,7 @@ class GlobalKeyFilter(QtCore.QObject):
         return super().eventFilter(obj, event)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # PyInstaller ile paketlenmiş edinim süreci için
     app = QApplication(sys.argv)
     
     # Global Key Filter Kurulumu
@@ -1323,4 +1277,9 @@ if __name__ == "__main__":
     app.installEventFilter(key_filter)
     
     if os.path.exists("/usr/share/pixmaps/ars-ispmi5.png"): app.setWindowIcon(QtGui.QIcon("/usr/share/pixmaps/ars-ispmi5.png"))
-    w = Main(); w.show(); sys.exit(app.exec_())
\ No newline at end of file
+    w = Main(); w.show()
+    # Yük üreteci: python3 mainS.py --replay <rapor no> [--speed N] (0: beklemeden)
+    ap = argparse.ArgumentParser(); ap.add_argument('--replay', type=int); ap.add_argument('--speed', type=float, default=1.0)
+    args, _ = ap.parse_known_args()
+    if args.replay is not None: w.start_replay(args.replay, args.speed)
+    sys.exit(app.exec_())
\ No newline at end of file
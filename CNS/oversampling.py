@@ -0,0 +1,98 @@
+"""
+Kanal başına aşırı örnekleme (oversampling) ve indirgeme.
+
+Her adımda kanal başına N ham örnek alınır, (örnek x kanal) dizisi tek
+NumPy çağrısıyla ortalama / medyan / budanmış ortalama ile indirgenir.
+Değerin yanında kanal gürültüsü (std) de döner.
+"""
+import time
+
+import numpy as np
+
+import ADS1256
+
+REDUCTIONS = ('mean', 'median', 'trimmed')
+
+
+def reduce_samples(samples, method='median', trim=0.1):
+    """
+    (örnek x kanal) dizisini indirger, (değerler, std) döner.
+    trim: 'trimmed' yönteminde her iki uçtan atılan oran.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    n = samples.shape[0]
+    if method == 'mean':
+        values = samples.mean(axis=0)
+    elif method == 'median':
+        values = np.median(samples, axis=0)
+    elif method == 'trimmed':
+        k = int(n * trim)
+        if n - 2 * k <= 0:
+            values = np.median(samples, axis=0)
+        else:
+            values = np.sort(samples, axis=0)[k:n - k].mean(axis=0)
+    else:
+        raise ValueError(f"Bilinmeyen indirgeme yöntemi: {method}")
+    std = samples.std(axis=0, ddof=1 if n > 1 else 0)
+    return values, std
+
+
+class Oversampler:
+    """
+    ADS1256 üzerinden adım başına N örnek toplar.
+    mode='scan'  : her turda tüm kanallar boru hattı taramasıyla okunur
+    mode='stream': her kanal sırayla RDATAC ile tam hızda okunur
+    """
+
+    def __init__(self, adc, count=16, drate='ADS1256_1000SPS', method='median',
+                 trim=0.1, mode='scan', gain='ADS1256_GAIN_1'):
+        if method not in REDUCTIONS:
+            raise ValueError(f"Bilinmeyen indirgeme yöntemi: {method}")
+        self.adc = adc
+        self.count = max(1, int(count))
+        self.drate = drate
+        self.method = method
+        self.trim = trim
+        self.mode = mode
+        self.gain = gain
+        self._buf = None
+        self.last_stamps = None     # kanal başına son dönüşümün anı (time.monotonic)
+
+    @classmethod
+    def from_settings(cls, adc, settings):
+        return cls(adc,
+                   count=getattr(settings, 'OVERSAMPLE_COUNT', 16),
+                   drate=getattr(settings, 'OVERSAMPLE_DRATE', 'ADS1256_1000SPS'),
+                   method=getattr(settings, 'OVERSAMPLE_METHOD', 'median'),
+                   trim=getattr(settings, 'OVERSAMPLE_TRIM', 0.1),
+                   mode=getattr(settings, 'OVERSAMPLE_MODE', 'scan'))
+
+    def adc_config(self):
+        """ADS1256_init'e verilecek (kazanç, veri hızı) kodları."""
+        return ADS1256.ADS1256_GAIN_E[self.gain], ADS1256.ADS1256_DRATE_E[self.drate]
+
+    def _buffer(self, n_channels):
+        # Aynı şekil tekrar kullanılır; her adımda yeni dizi açılmaz
+        if self._buf is None or self._buf.shape != (self.count, n_channels):
+            self._buf = np.empty((self.count, n_channels), dtype=np.float64)
+        return self._buf
+
+    def collect(self, channels):
+        """Ham kodları (örnek x kanal) dizisi olarak döner; son örnek anları last_stamps'te."""
+        channels = list(channels)
+        buf = self._buffer(len(channels))
+        if self.mode == 'stream':
+            stamps = []
+            for j, ch in enumerate(channels):
+                buf[:, j] = self.adc.ADS1256_StreamChannel(ch, self.count)
+                stamps.append(time.monotonic())
+        else:
+            for i in range(self.count):
+                values, stamps = self.adc.ADS1256_ScanChannels(channels)
+                buf[i] = values
+        self.last_stamps = list(stamps)
+        return buf
+
+    def read(self, channels=range(8)):
+        """Kanal başına (indirgenmiş kod, std) dizileri döner."""
+        return reduce_samples(self.collect(channels), self.method, self.trim)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Kontrol parametreleri için paralel simülasyon taraması.
+
+Verilen parametre ızgarasının her kombinasyonu için DataUpdateThread'in
+kontrol döngüsü (ControlCore) ISPM15Simulator ile sanal saatte, sahte GPIO
+üzerinde baştan sona oynatılır. Koşular süreç havuzuna dağıtılır (varsayılan
+her çekirdeğe bir süreç). Her parametre seti için seed'ler üzerinden
+ortalama:
+
+    hedefe varış : tüm aktif probların DESIRED_TEMP'e ilk ulaştığı an (saat)
+    çevrim süresi: başarı sayacının dolduğu an (saat)
+    rezistans    : rezistansın açık kaldığı zaman oranı
+    sıfırlanma   : başarı sayacının sıfırlanma sayısı
+    en yüksek ortam sıcaklığı ve güvenlik tripleri
+
+Güvenli (trip yok, ortam SAFETY_MAX_TEMP altında) ve tüm seed'lerde biten
+setler çevrim süresine göre önce sıralanır.
+
+    python3 param_sweep.py --set RESISTANCE_MAX=90,95,100 --set RESISTANCE_WORK_MIN=1,2,3
+    python3 param_sweep.py --set HEATER_CONTROL=off --set DESIRED_ENGINE_MUNITE=2,4 --seeds 4 --out sweep.csv
+"""
+import argparse
+import ast
+import contextlib
+import csv
+import io
+import itertools
+import os
+import sqlite3
+import sys
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+from control_core import ControlCore, sensor_mask
+from control_clock import ControlClock
+from gpio_backend import CachedGPIO, FakeBackend
+from recipes import PhaseSettings, load_recipe
+
+_settings_cache = {}
+
+
+def load_settings(path):
+    """Ayar modülü (süreç başına bir kez yüklenir)."""
+    if path not in _settings_cache:
+        spec = importlib.util.spec_from_file_location("settings", path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        sys.modules["settings"] = mod
+        _settings_cache[path] = mod
+    return _settings_cache[path]
+
+
+def parse_grid(items):
+    """['AD=1,2', ...] -> {'AD': [1, 2], ...}; değerler Python sabiti, olmazsa metin."""
+    grid = {}
+    for item in items:
+        name, sep, values = item.partition('=')
+        if not sep or not values:
+            raise ValueError(f"Geçersiz parametre: {item} (AD=değer1,değer2 bekleniyor)")
+        parsed = []
+        for v in values.split(','):
+            try:
+                parsed.append(ast.literal_eval(v))
+            except (ValueError, SyntaxError):
+                parsed.append(v)
+        grid[name.strip()] = parsed
+    return grid
+
+
+def combinations(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+class _SweepCore(ControlCore):
+    """Rezistansın açık kaldığı süreyi röle geçişlerinden toplayan, sessiz çekirdek."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rez_on_s = 0.0
+        self._rez_since = None
+
+    def _relay_changed(self, name, state):
+        if name == 'rez':
+            now = self.clock.monotonic()
+            if state and self._rez_since is None:
+                self._rez_since = now
+            elif not state and self._rez_since is not None:
+                self.rez_on_s += now - self._rez_since
+                self._rez_since = None
+        super()._relay_changed(name, state)
+
+    def rez_on_total(self):
+        if self._rez_since is None:
+            return self.rez_on_s
+        return self.rez_on_s + self.clock.monotonic() - self._rez_since
+
+
+def run_one(task):
+    """Tek koşu: (ayar yolu, parametreler, seed, başlangıç sıcaklığı, reçete, azami saat) -> ölçüler."""
+    settings_path, params, seed, start_temp, recipe, max_hours = task
+    overrides = dict(params, SIM_SEED=seed, SIM_START_TEMP=start_temp)
+    settings = PhaseSettings(load_settings(settings_path), overrides)
+    with contextlib.redirect_stdout(io.StringIO()):
+        core = _SweepCore(lambda: settings, CachedGPIO(FakeBackend()), recipe=recipe,
+                          clock=ControlClock(virtual=True))
+        max_steps = int(max_hours * 3600 / settings.DESIRED_SECONDS)
+        reached_s = None
+        max_ambient = float('-inf')
+        core.setup(virtual=True)
+        try:
+            while not core.done() and core.step_no < max_steps:
+                if not core.virtual_step():
+                    break
+                vals = core.last_values
+                mask = sensor_mask(core.settings)
+                ambient = [v for v, m in zip(vals[13:15], mask[13:15]) if m]
+                if ambient:
+                    max_ambient = max(max_ambient, sum(ambient) / len(ambient))
+                if reached_s is None:
+                    probes = [v for v, m in zip(vals[:13], mask[:13]) if m]
+                    if probes and min(probes) >= core.target_temp:
+                        reached_s = core.clock.monotonic()
+            elapsed = core.clock.monotonic()
+            duty = core.rez_on_total() / elapsed if elapsed > 0 else 0.0
+        finally:
+            core.shutdown()
+    return {
+        'params': params,
+        'seed': seed,
+        'finished': core.done(),
+        'tripped': core.safety.tripped,
+        'reached_h': None if reached_s is None else reached_s / 3600.0,
+        'cycle_h': elapsed / 3600.0 if core.done() else None,
+        'duty': duty,
+        'resets': sum(core.evaluator.resets.values()),
+        'max_ambient': max_ambient,
+        'safe_limit': getattr(settings, 'SAFETY_MAX_TEMP', 110.0),
+    }
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def summarize(results, names):
+    """Seed'ler üzerinden parametre seti başına özet, sıralı."""
+    groups = {}
+    for r in results:
+        groups.setdefault(tuple(r['params'][n] for n in names), []).append(r)
+    rows = []
+    for key, runs in groups.items():
+        safe = all(r['tripped'] is None and r['max_ambient'] < r['safe_limit'] for r in runs)
+        finished = sum(r['finished'] for r in runs)
+        rows.append({
+            'params': dict(zip(names, key)),
+            'runs': len(runs),
+            'finished': finished,
+            'safe': safe,
+            'reached_h': _mean(r['reached_h'] for r in runs),
+            'cycle_h': _mean(r['cycle_h'] for r in runs),
+            'duty': _mean(r['duty'] for r in runs),
+            'resets': _mean(r['resets'] for r in runs),
+            'max_ambient': max(r['max_ambient'] for r in runs),
+            'trips': sum(r['tripped'] is not None for r in runs),
+        })
+    # Güvenli ve her seed'de biten setler önce; sonra çevrim süresi, sıfırlanma
+    rows.sort(key=lambda row: (not (row['safe'] and row['finished'] == row['runs']),
+                               row['cycle_h'] if row['cycle_h'] is not None else float('inf'),
+                               row['resets']))
+    return rows
+
+
+def _fmt(v, spec):
+    return "-" if v is None else format(v, spec)
+
+
+def print_table(rows, names):
+    head = "".join(f"{n:>22}" for n in names)
+    print(f"{'#':>3}{head} {'bitti':>6} {'hedef(sa)':>10} {'çevrim(sa)':>11} {'rez %':>6} "
+          f"{'sıfır.':>7} {'maks °C':>8} {'güvenli':>8}")
+    for i, row in enumerate(rows, 1):
+        vals = "".join(f"{str(row['params'][n]):>22}" for n in names)
+        print(f"{i:>3}{vals} {row['finished']:>3}/{row['runs']:<2} {_fmt(row['reached_h'], '.2f'):>10} "
+              f"{_fmt(row['cycle_h'], '.2f'):>11} {row['duty'] * 100:>6.1f} {row['resets']:>7.1f} "
+              f"{row['max_ambient']:>8.1f} {'evet' if row['safe'] else 'HAYIR':>8}")
+
+
+def write_csv(path, rows, names):
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['rank'] + names + ['runs', 'finished', 'safe', 'time_to_target_h', 'cycle_h',
+                                       'heater_duty', 'counter_resets', 'max_ambient', 'trips'])
+        for i, row in enumerate(rows, 1):
+            w.writerow([i] + [row['params'][n] for n in names] +
+                       [row['runs'], row['finished'], row['safe'], row['reached_h'], row['cycle_h'],
+                        row['duty'], row['resets'], row['max_ambient'], row['trips']])
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    ap.add_argument('--set', action='append', default=[], metavar='AD=D1,D2',
+                    help="taranacak ayar ve değerleri (birden fazla verilebilir)")
+    ap.add_argument('--settings', default=os.path.join(here, 'settings.py'))
+    ap.add_argument('--seeds', type=int, default=3, help="parametre seti başına seed sayısı")
+    ap.add_argument('--start-temp', type=float, default=20.0, help="dış ortam sıcaklığı (°C)")
+    ap.add_argument('--recipe', default='', help="reçete adı (veritabanından)")
+    ap.add_argument('--db', default=os.path.join(here, 'mainDb.sqlite'))
+    ap.add_argument('--max-hours', type=float, default=24.0, help="koşu başına azami sanal süre")
+    ap.add_argument('--workers', type=int, default=None, help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    ap.add_argument('--out', default='', help="sıralı tabloyu CSV olarak yaz")
+    args = ap.parse_args()
+
+    grid = parse_grid(args.set)
+    names = list(grid)
+    recipe = None
+    if args.recipe:
+        conn = sqlite3.connect(args.db)
+        try:
+            recipe = load_recipe(conn, args.recipe)
+        finally:
+            conn.close()
+        if recipe is None:
+            raise SystemExit(f"Reçete bulunamadı: {args.recipe}")
+
+    settings_path = os.path.abspath(args.settings)
+    tasks = [(settings_path, params, seed, args.start_temp, recipe, args.max_hours)
+             for params in combinations(grid) for seed in range(args.seeds)]
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{len(tasks)} koşu ({len(tasks) // max(1, args.seeds)} parametre seti x {args.seeds} seed), "
+          f"{workers} süreç")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_one, tasks))
+
+    rows = summarize(results, names)
+    print_table(rows, names)
+    if args.out:
+        write_csv(args.out, rows, names)
+        print(f"Tablo yazıldı: {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Geçmiş raporlardan fırın modeli (simülasyon ve öngörülü denetim için).
+
+Bitmiş raporların REPORT_DETAILS satırlarından, simülasyondaki elle seçilmiş
+sabitlerin yerine geçen katsayılar en küçük kareler ile kestirilir:
+
+    heat_base, heat_sensitivity : ortam ısınma hızı (°C/dk) = heat_base *
+                                  (1 + (dış sıcaklık - 20) * heat_sensitivity)
+    cool_rate                   : rezistans kapalıyken ortam soğuma hızı (°C/dk)
+    iletim[13]                  : prob başına ısı iletim katsayısı (1/dk);
+                                  artış = iletim * fark * (1 + fark / 100)
+
+Röle durumu kaydedilmediğinden ortam adımları yönüne göre ayrılır: ortam
+HEAT_THRESHOLD °C/dk'dan hızlı yükseliyorsa ısınma, aynı hızla düşüyorsa
+soğuma sayılır. Prob katsayıları yalnızca normal ısınma bölgesinden
+(fark >= GAP_SLOW) kestirilir. 0.00 okunan (pasif) kanallar ve 5 dakikadan
+uzun boşluklar atlanır.
+
+Uydurma artımlıdır: yeterli istatistikler (toplamlar) model dosyasında
+tutulur, her çalıştırmada yalnızca henüz işlenmemiş bitmiş raporlar okunur.
+
+    python3 plant_model.py                       # mainDb.sqlite + mainDb1.sqlite
+    python3 plant_model.py --db mainDb.sqlite --out plant_model.json --full
+"""
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+VERSION = 2           # 2: işlenen raporlar (ID, START_TIME) ile, tam yol altında tutulur
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DBS = ('mainDb.sqlite', 'mainDb1.sqlite')
+DEFAULT_FILE = 'plant_model.json'
+
+HEAT_THRESHOLD = 0.1  # °C/dk; bundan yavaş ortam değişimi ısınma/soğuma sayılmaz
+MAX_GAP_MIN = 5.0     # daha uzun adım aralıkları (duraklatma, devam) atlanır
+GAP_SLOW = 12.0       # simülasyonla aynı ısıl boşluk eşikleri
+GAP_STOP = 9.0
+
+_COLUMNS = ", ".join([f"T{i}" for i in range(1, 14)] + ["AT1", "AT2", "STEPTIME"])
+
+
+def default_iletim():
+    """Simülasyonun elle seçilmiş iletim katsayıları."""
+    from simulator import probe_conductance
+    return [float(v) for v in probe_conductance()]
+
+
+class PlantModel:
+    """Kestirilmiş katsayılar; varsayılanlar simülasyonun elle seçilmiş sabitleridir."""
+
+    def __init__(self, heat_base=1.8, heat_sensitivity=0.01, cool_rate=0.8, iletim=None, reports=0):
+        self.heat_base = float(heat_base)
+        self.heat_sensitivity = float(heat_sensitivity)
+        self.cool_rate = float(cool_rate)
+        self.iletim = list(iletim) if iletim is not None else default_iletim()
+        self.reports = reports
+
+    @classmethod
+    def from_dict(cls, d):
+        defaults = default_iletim()
+        iletim = [v if v is not None else dflt for v, dflt in zip(d.get("iletim", defaults), defaults)]
+        return cls(d.get("heat_base", 1.8), d.get("heat_sensitivity", 0.01), d.get("cool_rate", 0.8),
+                   iletim, d.get("reports", 0))
+
+    def to_dict(self):
+        return {"heat_base": self.heat_base, "heat_sensitivity": self.heat_sensitivity,
+                "cool_rate": self.cool_rate, "iletim": self.iletim, "reports": self.reports}
+
+    def heating_rate(self, outside_temp):
+        """Rezistans açıkken ortam ısınma hızı (°C/dk)."""
+        factor = min(1.5, max(0.5, 1.0 + (outside_temp - 20.0) * self.heat_sensitivity))
+        return self.heat_base * factor
+
+    def predict(self, ambient, probes, duty, minutes, outside_temp=20.0):
+        """
+        Gürültüsüz ileri tahmin: ortam (°C), problar (13,) ve rezistans görev
+        oranıyla minutes dakika sonraki (ortam, problar). 1 dk adımlarla.
+        """
+        iletim = np.asarray(self.iletim)
+        probes = np.array(probes, dtype=np.float64)
+        heat = self.heating_rate(outside_temp)
+        steps = int(round(minutes))
+        for _ in range(steps):
+            ambient += heat * duty - self.cool_rate * (1.0 - duty)
+            fark = ambient - probes
+            rise = iletim * fark * (1.0 + fark / 100.0)
+            probes += np.select([fark >= GAP_SLOW, fark >= GAP_STOP], [rise, rise * 0.25], 0.0)
+        return ambient, probes
+
+
+# --- veri ---
+def _report_arrays(conn, report_id):
+    """(dakika (N,), problar (N, 13), ortam (N,)); pasif kanallar NaN."""
+    rows = conn.execute(f"SELECT {_COLUMNS} FROM REPORT_DETAILS WHERE REPORT_ID=? ORDER BY ID",
+                        (report_id,)).fetchall()
+    if len(rows) < 3:
+        return None
+    try:
+        times = np.array([r[15] for r in rows], dtype='datetime64[s]')
+    except (TypeError, ValueError):
+        return None
+    vals = np.array([[_float(v) for v in r[:15]] for r in rows])
+    vals[vals == 0.0] = np.nan
+    minutes = (times - times[0]).astype(np.float64) / 60.0
+    at = vals[:, 13:15]
+    count = np.isfinite(at).sum(axis=1)
+    if not count.any():
+        return None
+    ambient = np.where(count > 0, np.nansum(at, axis=1) / np.maximum(count, 1), np.nan)
+    return minutes, vals[:, :13], ambient
+
+
+def _float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _empty_stats():
+    return {"heat": [], "cool_sum": 0.0, "cool_n": 0,
+            "sxx": [0.0] * 13, "sxy": [0.0] * 13, "n": [0] * 13}
+
+
+def accumulate(stats, minutes, probes, ambient):
+    """Tek raporun katkısını yeterli istatistiklere ekler."""
+    dt = np.diff(minutes)
+    ok = (dt > 0) & (dt <= MAX_GAP_MIN) & np.isfinite(ambient[1:]) & np.isfinite(ambient[:-1])
+    rate = np.where(ok, np.diff(ambient) / np.where(dt > 0, dt, 1.0), np.nan)
+
+    heating = ok & (rate > HEAT_THRESHOLD)
+    cooling = ok & (rate < -HEAT_THRESHOLD)
+    if heating.any():
+        outside = float(ambient[np.isfinite(ambient)][0])
+        stats["heat"].append([outside, float(rate[heating].sum()), int(heating.sum())])
+    stats["cool_sum"] += float(-rate[cooling].sum())
+    stats["cool_n"] += int(cooling.sum())
+
+    # Prob başına: y = dT/dt, x = fark * (1 + fark / 100), yalnız normal ısınma bölgesi
+    fark = ambient[:-1, None] - probes[:-1]
+    x = fark * (1.0 + fark / 100.0)
+    y = np.diff(probes, axis=0) / np.where(dt > 0, dt, 1.0)[:, None]
+    use = ok[:, None] & (fark >= GAP_SLOW) & np.isfinite(x) & np.isfinite(y)
+    x = np.where(use, x, 0.0)
+    y = np.where(use, y, 0.0)
+    for i, (sxx, sxy, n) in enumerate(zip((x * x).sum(axis=0), (x * y).sum(axis=0), use.sum(axis=0))):
+        stats["sxx"][i] += float(sxx)
+        stats["sxy"][i] += float(sxy)
+        stats["n"][i] += int(n)
+
+
+def solve(stats, reports=0):
+    """Yeterli istatistiklerden model; verisi olmayan katsayılar varsayılanda kalır."""
+    model = PlantModel(reports=reports)
+    heat = np.array(stats["heat"], dtype=np.float64).reshape(-1, 3)
+    if len(heat):
+        outside = heat[:, 0]
+        mean_rate = heat[:, 1] / heat[:, 2]
+        w = np.sqrt(heat[:, 2])
+        if len(np.unique(np.round(outside, 1))) >= 2:
+            # Ağırlıklı en küçük kareler: hız = a + b * (dış - 20)
+            A = np.stack([np.ones_like(outside), outside - 20.0], axis=1) * w[:, None]
+            (a, b), *_ = np.linalg.lstsq(A, mean_rate * w, rcond=None)
+        else:
+            a, b = float(heat[:, 1].sum() / heat[:, 2].sum()), 0.0
+        if a > 0:
+            model.heat_base = float(a)
+            model.heat_sensitivity = float(b / a)
+    if stats["cool_n"]:
+        model.cool_rate = stats["cool_sum"] / stats["cool_n"]
+    sxx, sxy, n = (np.array(stats[k], dtype=np.float64) for k in ("sxx", "sxy", "n"))
+    fitted = np.divide(sxy, sxx, out=np.full(13, np.nan), where=sxx > 0)
+    model.iletim = [float(f) if c >= 10 and f > 0 else d
+                    for f, c, d in zip(fitted, n, model.iletim)]
+    return model
+
+
+# --- model dosyası ---
+def _resolve(path):
+    return path if os.path.isabs(path) else os.path.join(HERE, path)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == VERSION else None
+
+
+def load(path=DEFAULT_FILE):
+    """Kayıtlı model ya da dosya yoksa/uyumsuzsa None."""
+    data = _read(_resolve(path))
+    return None if data is None else PlantModel.from_dict(data["model"])
+
+
+def from_settings(settings):
+    """SIM_PLANT_MODEL ayarındaki model; ayar boşsa ya da dosya yoksa None (elle seçilmiş sabitler)."""
+    path = getattr(settings, 'SIM_PLANT_MODEL', '')
+    if not path:
+        return None
+    model = load(path)
+    if model is None:
+        print(f"Fırın modeli yüklenemedi ({path}), elle seçilmiş sabitler kullanılıyor.")
+    return model
+
+
+def update(db_paths, path=DEFAULT_FILE, full=False):
+    """
+    Henüz işlenmemiş bitmiş raporları modele katar ve dosyaya yazar.
+    full: istatistikleri sıfırlayıp tüm raporları yeniden işler.
+    Dönüş: (model, yeni işlenen rapor sayısı)
+    """
+    path = _resolve(path)
+    data = None if full else _read(path)
+    if data is None:
+        data = {"version": VERSION, "seen": {}, "stats": _empty_stats()}
+    stats = data["stats"]
+    added = 0
+    for db in db_paths:
+        db = _resolve(db)
+        if not os.path.exists(db):
+            continue
+        # ID'ler yeniden kullanılabilir (reset_autoincrement); rapor ID ile başlangıç anıyla tanınır
+        key = os.path.realpath(db)
+        seen = set(tuple(r) for r in data["seen"].get(key, []))
+        conn = sqlite3.connect(db)
+        try:
+            rows = conn.execute("SELECT ID, START_TIME FROM REPORT WHERE END_TIME IS NOT NULL AND END_TIME <> 'IP' "
+                                "ORDER BY ID").fetchall()
+            for rid, start in rows:
+                if (rid, start) in seen:
+                    continue
+                arrays = _report_arrays(conn, rid)
+                if arrays is not None:
+                    accumulate(stats, *arrays)
+                seen.add((rid, start))
+                added += 1
+        finally:
+            conn.close()
+        data["seen"][key] = sorted(seen, key=lambda r: (r[0], str(r[1])))
+    reports = sum(len(v) for v in data["seen"].values())
+    model = solve(stats, reports)
+    data["model"] = model.to_dict()
+    data["fitted"] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+    return model, added
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Geçmiş raporlardan fırın modeli uydurur.")
+    ap.add_argument('--db', nargs='+', default=list(DEFAULT_DBS))
+    ap.add_argument('--out', default=DEFAULT_FILE)
+    ap.add_argument('--full', action='store_true', help="tüm raporları baştan işle")
+    args = ap.parse_args()
+
+    model, added = update(args.db, args.out, full=args.full)
+    base = PlantModel()
+    print(f"{added} yeni rapor işlendi (toplam {model.reports}), model: {_resolve(args.out)}")
+    print(f"{'katsayı':<18}{'elle':>10}{'kestirilen':>12}")
+    print(f"{'heat_base':<18}{base.heat_base:>10.3f}{model.heat_base:>12.3f}")
+    print(f"{'heat_sensitivity':<18}{base.heat_sensitivity:>10.4f}{model.heat_sensitivity:>12.4f}")
+    print(f"{'cool_rate':<18}{base.cool_rate:>10.3f}{model.cool_rate:>12.3f}")
+    for i, (a, b) in enumerate(zip(base.iletim, model.iletim), 1):
+        print(f"{f'iletim T{i}':<18}{a:>10.4f}{b:>12.4f}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""
+Çok fazlı ısıtma reçeteleri (ör. şok / yaklaşma / tutma).
+
+Her faz kendi rezistans bandını, fan ve rezistans görev çevrimini verir ve
+süre ya da sıcaklık koşuluyla biter. Reçeteler veritabanındaki RECIPE
+tablosunda JSON olarak durur; bir parti başlarken kullanılan reçetenin
+kopyası REPORT_RECIPE tablosunda rapora bağlanır.
+
+Reçete tanımı:
+{
+    "phases": [
+        {"name": "SHOCK", "band": [98, 104], "fan": [3, 1],
+         "until": {"core_ge": 45, "minutes": 240}},
+        {"name": "APPROACH", "band": [83, 88], "until": {"core_within": 3}},
+        {"name": "HOLD", "band": [76, 80]}
+    ]
+}
+band: [RESISTANCE_MIN, RESISTANCE_MAX]      setpoint: HEATER_PID_SETPOINT
+fan:  [DESIRED_ENGINE_MUNITE, ENGINE_RESTING_MUNITE]
+rez:  [RESISTANCE_WORK_MIN, RESISTANCE_REST_MIN]
+until (herhangi biri gerçekleşince sonraki faz):
+    minutes      fazda geçen süre (dk)
+    ambient_ge   ortam ortalaması >= değer
+    core_ge      en soğuk aktif prob >= değer
+    core_within  en soğuk aktif prob >= DESIRED_TEMP - değer
+Koşulu olmayan faz parti bitene kadar sürer. Tanımda olmayan anahtarlar
+settings.py'deki değerlerle çalışır.
+"""
+import json
+import datetime
+
+DEFAULT_RECIPES = {
+    "ISPM15": {
+        "phases": [
+            {"name": "SHOCK", "band": [98.0, 104.0], "fan": [3, 1],
+             "until": {"core_ge": 45.0, "minutes": 240}},
+            {"name": "APPROACH", "band": [83.0, 88.0], "fan": [2, 1],
+             "until": {"core_within": 3.0}},
+            {"name": "HOLD", "band": [76.0, 80.0]},
+        ]
+    }
+}
+
+_OVERRIDES = {
+    'band': ('RESISTANCE_MIN', 'RESISTANCE_MAX'),
+    'fan': ('DESIRED_ENGINE_MUNITE', 'ENGINE_RESTING_MUNITE'),
+    'rez': ('RESISTANCE_WORK_MIN', 'RESISTANCE_REST_MIN'),
+}
+
+_schema_ready = set()
+
+
+def ensure_schema(conn, path_key=None):
+    """Reçete tablolarını oluşturur ve varsayılan reçeteleri ekler (süreç başına bir kez)."""
+    if path_key is not None and path_key in _schema_ready:
+        return
+    conn.execute('CREATE TABLE IF NOT EXISTS "RECIPE" ('
+                 '"ID" INTEGER PRIMARY KEY, "NAME" TEXT UNIQUE, "DEFINITION" TEXT, "CREATED" DATETIME)')
+    conn.execute('CREATE TABLE IF NOT EXISTS "REPORT_RECIPE" ('
+                 '"REPORT_ID" INT UNIQUE, "RECIPE_ID" INT, "NAME" TEXT, "DEFINITION" TEXT)')
+    for name, definition in DEFAULT_RECIPES.items():
+        conn.execute("INSERT OR IGNORE INTO RECIPE(NAME, DEFINITION, CREATED) VALUES (?,?,?)",
+                     (name, json.dumps(definition), datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    conn.commit()
+    if path_key is not None:
+        _schema_ready.add(path_key)
+
+
+def validate(definition):
+    phases = definition.get("phases") if isinstance(definition, dict) else None
+    if not phases:
+        raise ValueError("Reçetede faz yok")
+    for i, phase in enumerate(phases):
+        for key in ('band', 'fan', 'rez'):
+            if key in phase and len(phase[key]) != 2:
+                raise ValueError(f"Faz {i + 1}: '{key}' iki değer olmalı")
+        if 'band' in phase and phase['band'][0] >= phase['band'][1]:
+            raise ValueError(f"Faz {i + 1}: band alt sınırı üst sınırdan küçük olmalı")
+    return definition
+
+
+def save_recipe(conn, name, definition):
+    validate(definition)
+    conn.execute("INSERT INTO RECIPE(NAME, DEFINITION, CREATED) VALUES (?,?,?) "
+                 "ON CONFLICT(NAME) DO UPDATE SET DEFINITION=excluded.DEFINITION",
+                 (name, json.dumps(definition), datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    conn.commit()
+
+
+def list_recipes(conn):
+    return [r[0] for r in conn.execute("SELECT NAME FROM RECIPE ORDER BY NAME")]
+
+
+def load_recipe(conn, name):
+    """{'id', 'name', 'definition'} ya da bulunamazsa None."""
+    row = conn.execute("SELECT ID, NAME, DEFINITION FROM RECIPE WHERE NAME=?", (name,)).fetchone()
+    if row is None:
+        return None
+    return {"id": row[0], "name": row[1], "definition": validate(json.loads(row[2]))}
+
+
+def load_active(conn, settings):
+    """settings.ACTIVE_RECIPE ile seçili reçete; boşsa ya da bulunamazsa None (tek band)."""
+    name = getattr(settings, 'ACTIVE_RECIPE', '')
+    if not name:
+        return None
+    try:
+        recipe = load_recipe(conn, name)
+    except ValueError as e:
+        print(f"Reçete '{name}' geçersiz ({e}), tek band ile devam ediliyor.")
+        return None
+    if recipe is None:
+        print(f"Reçete '{name}' bulunamadı, tek band ile devam ediliyor.")
+    return recipe
+
+
+def attach_to_report(conn, report_id, recipe):
+    """Partinin reçetesinin o anki tanımını rapora bağlar."""
+    if recipe is None:
+        return
+    conn.execute("INSERT OR REPLACE INTO REPORT_RECIPE(REPORT_ID, RECIPE_ID, NAME, DEFINITION) VALUES (?,?,?,?)",
+                 (report_id, recipe["id"], recipe["name"], json.dumps(recipe["definition"])))
+    conn.commit()
+
+
+def report_recipe(conn, report_id):
+    row = conn.execute("SELECT RECIPE_ID, NAME, DEFINITION FROM REPORT_RECIPE WHERE REPORT_ID=?",
+                       (report_id,)).fetchone()
+    if row is None:
+        return None
+    return {"id": row[0], "name": row[1], "definition": json.loads(row[2])}
+
+
+class PhaseSettings:
+    """Ayar modülünün üzerine geçerli fazın değerlerini bindirir."""
+
+    def __init__(self, base, overrides):
+        self._base = base
+        self._overrides = overrides
+
+    def __getattr__(self, name):
+        overrides = self.__dict__.get('_overrides', {})
+        if name in overrides:
+            return overrides[name]
+        return getattr(self._base, name)
+
+
+class RecipeEngine:
+    def __init__(self, recipe):
+        self.recipe = recipe
+        self.phases = recipe["definition"]["phases"]
+        self.index = 0
+        self.phase_start = None
+        self.resume_elapsed = 0.0   # kontrol noktasından dönüşte fazda geçmiş süre (sn)
+
+    @property
+    def phase(self):
+        return self.phases[self.index]
+
+    @property
+    def name(self):
+        return self.phase.get("name", f"FAZ {self.index + 1}")
+
+    def overrides(self):
+        phase = self.phase
+        out = {}
+        for key, attrs in _OVERRIDES.items():
+            if key in phase:
+                out[attrs[0]], out[attrs[1]] = phase[key]
+        if 'setpoint' in phase:
+            out['HEATER_PID_SETPOINT'] = phase['setpoint']
+        elif 'band' in phase:
+            out['HEATER_PID_SETPOINT'] = (phase['band'][0] + phase['band'][1]) / 2.0
+        return out
+
+    def apply(self, settings):
+        return PhaseSettings(settings, self.overrides())
+
+    def _done(self, until, elapsed_s, ambient, core, target_temp):
+        if 'minutes' in until and elapsed_s >= until['minutes'] * 60:
+            return True
+        if ambient is not None and 'ambient_ge' in until and ambient >= until['ambient_ge']:
+            return True
+        if core is not None:
+            if 'core_ge' in until and core >= until['core_ge']:
+                return True
+            if 'core_within' in until and core >= target_temp - until['core_within']:
+                return True
+        return False
+
+    def snapshot(self, now):
+        elapsed = 0.0 if self.phase_start is None or now is None else (now - self.phase_start).total_seconds()
+        return {'index': self.index, 'elapsed': max(0.0, elapsed)}
+
+    def restore(self, snap):
+        # Kesinti süresi faz süresine sayılmaz; faz kaldığı yerden devam eder
+        self.index = min(int(snap.get('index', 0)), len(self.phases) - 1)
+        self.phase_start = None
+        self.resume_elapsed = float(snap.get('elapsed', 0.0))
+
+    def update(self, now, ambient, core, target_temp):
+        """now: adımın zaman damgası (datetime). Faz değiştiyse True döner."""
+        if self.phase_start is None:
+            self.phase_start = now - datetime.timedelta(seconds=self.resume_elapsed)
+            self.resume_elapsed = 0.0
+        changed = False
+        # Bir adımda birden fazla koşul sağlanmışsa fazlar art arda geçilir
+        while self.index + 1 < len(self.phases):
+            until = self.phase.get("until")
+            elapsed = (now - self.phase_start).total_seconds()
+            if not until or not self._done(until, elapsed, ambient, core, target_temp):
+                break
+            self.index += 1
+            self.phase_start = now
+            changed = True
+        return changed
@@ -0,0 +1,313 @@
+"""
+Olay güdümlü röle zamanlayıcısı.
+
+Tüm röleler tek bir iş parçacığı ve karma zaman çarkı (hashed timer wheel)
+ile sürülür: her geçiş, tetikleneceği tik numarasının yuvasına konur ve
+iş parçacığı bir sonraki geçiş anına kadar uyur. Böylece röleler ölçüm
+periyodundan bağımsız olarak saniyesinde anahtarlanır ve stop() beklemeden
+döner. Sanal saatle çalışırken iş parçacığı yoktur (start(threaded=False) ya
+da detach()); çağıran next_due()/run_due() ile olayları zaman sırasıyla işler.
+
+Her röle bir görev çevrimi profiliyle tanımlanır: [(durum, süre_sn), ...]
+sırayla tekrarlanır, ör. fan için [(True, 120), (False, 60)].
+Röleler Active Low'dur: LOW=Açık, HIGH=Kapalı.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+
+class Relay:
+    def __init__(self, name, pin, profile, active_low=True):
+        self.name = name
+        self.pin = pin
+        self.profile = list(profile)
+        self.active_low = active_low
+        self.state = False
+        self.phase = 0            # profildeki geçerli adım
+        self.phase_start = None   # geçerli adımın başladığı an (monotonic)
+        self.token = 0            # eski çark girdilerini geçersiz kılar
+        self.manual = False       # True: profil durdu, durum dışarıdan verilir
+
+
+class RelayScheduler:
+    def __init__(self, gpio, tick_s=0.05, slots=4096, clock=time.monotonic, on_change=None):
+        self.gpio = gpio
+        self.tick_s = tick_s
+        self.clock = clock
+        self.on_change = on_change      # on_change(name, state)
+        self.relays = {}
+        self.interlocked = {}           # güvenlik kilidi: isim -> zorunlu durum
+        self.transitions = deque(maxlen=4096)   # (an, isim, durum)
+        self._wheel = [[] for _ in range(slots)]
+        self._t0 = clock()
+        self._cur = 0                   # son işlenen tik
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self.running = False
+        self._due = None                # sıradaki geçerli girdinin tiki (önbellek)
+
+    # --- çark ---
+    def _tick(self, t):
+        return int(math.ceil((t - self._t0) / self.tick_s - 1e-9))
+
+    def _schedule(self, relay, at):
+        relay.token += 1
+        # Geçmişte kalan geçişler bir sonraki işlenecek tikte tetiklenir
+        tick = max(self._tick(at), self._cur + 1)
+        self._wheel[tick % len(self._wheel)].append((tick, relay.name, relay.token))
+        if self._due is None or tick < self._due:
+            self._due = tick
+        self._cond.notify()
+
+    def _valid(self, entry):
+        tick, name, token = entry
+        return self.relays[name].token == token
+
+    def _expire(self, now_tick):
+        """_cur'dan now_tick'e kadar olan yuvaları işler, süresi dolan röleleri döner."""
+        fired = []
+        n = len(self._wheel)
+        span = now_tick - self._cur
+        ticks = range(self._cur + 1, now_tick + 1) if span < n else range(now_tick - n + 1, now_tick + 1)
+        for t in ticks:
+            slot = t % n
+            bucket = self._wheel[slot]
+            if not bucket:
+                continue
+            keep = []
+            for entry in bucket:
+                if not self._valid(entry):
+                    continue                    # iptal edilmiş girdi
+                if entry[0] <= now_tick:
+                    fired.append(self.relays[entry[1]])
+                else:
+                    keep.append(entry)          # sonraki turlardan birine ait
+            self._wheel[slot] = keep
+        self._cur = max(self._cur, now_tick)
+        return fired
+
+    def _next_tick(self):
+        n = len(self._wheel)
+        for k in range(1, n + 1):
+            t = self._cur + k
+            for entry in self._wheel[t % n]:
+                if entry[0] == t and self._valid(entry):
+                    return t
+        # Bir çark turundan uzak geçişler
+        ticks = [e[0] for bucket in self._wheel for e in bucket if self._valid(e)]
+        return min(ticks) if ticks else None
+
+    # --- röle ---
+    def _apply(self, relay, state, at=None):
+        state = self.interlocked.get(relay.name, state)
+        changed = relay.state != state
+        relay.state = state
+        level = (self.gpio.LOW if state else self.gpio.HIGH) if relay.active_low else \
+                (self.gpio.HIGH if state else self.gpio.LOW)
+        self.gpio.output(relay.pin, level)
+        if changed:
+            self.transitions.append((self.clock() if at is None else at, relay.name, state))
+            if self.on_change:
+                self.on_change(relay.name, state)
+
+    def _enter_phase(self, relay, phase, at):
+        # Süresi sıfır olan adımlar atlanır; hepsi sıfırsa röle ilk durumda kalır
+        for k in range(len(relay.profile)):
+            p = (phase + k) % len(relay.profile)
+            if relay.profile[p][1] > 0:
+                break
+        else:
+            relay.phase = 0
+            relay.phase_start = at
+            relay.token += 1
+            self._apply(relay, relay.profile[0][0], at)
+            return
+        relay.phase = p
+        relay.phase_start = at
+        state, duration = relay.profile[p]
+        self._apply(relay, state, at)
+        self._schedule(relay, at + duration)
+
+    def add_relay(self, name, pin, profile, active_low=True):
+        with self._cond:
+            relay = Relay(name, pin, profile, active_low)
+            self.relays[name] = relay
+            self.gpio.setup(pin, self.gpio.OUT, initial=self.gpio.HIGH if active_low else self.gpio.LOW)
+            if self.running:
+                self._enter_phase(relay, 0, self.clock())
+            return relay
+
+    def set_profile(self, name, profile):
+        """Profil değişirse geçerli adımın bitişi yeni süreye göre yeniden planlanır."""
+        with self._cond:
+            relay = self.relays[name]
+            profile = list(profile)
+            if profile == relay.profile:
+                return
+            relay.profile = profile
+            if relay.phase_start is not None and not relay.manual and self.running:
+                relay.phase %= len(profile)
+                if profile[relay.phase][1] > 0 and profile[relay.phase][0] == relay.state:
+                    self._schedule(relay, relay.phase_start + profile[relay.phase][1])
+                else:
+                    self._enter_phase(relay, relay.phase, self.clock())
+
+    def force(self, name, state):
+        """Röleyi profili durdurarak verilen duruma sabitler."""
+        with self._cond:
+            relay = self.relays[name]
+            relay.manual = True
+            relay.token += 1
+            self._apply(relay, state)
+
+    def release(self, name):
+        """force() sonrası profile baştan döner."""
+        with self._cond:
+            relay = self.relays[name]
+            relay.manual = False
+            self._enter_phase(relay, 0, self.clock())
+
+    def interlock(self, states):
+        """
+        Güvenlik: röleleri verilen duruma çeker ve release_interlock() çağrılana
+        kadar profil ya da force() ile değişmelerini engeller. Kilit bir tik
+        içinde alınamazsa (iş parçacığı takılı) çıkışlar yine hemen sürülür ve
+        iş parçacığının yarım kalan _apply'ından sonra kilit altında yeniden uygulanır.
+        """
+        states = dict(states)
+        if self._cond.acquire(timeout=self.tick_s):
+            try:
+                self._interlock(states)
+            finally:
+                self._cond.release()
+            return
+        self._interlock(states)
+        threading.Thread(target=self._reassert_interlock, name="relay-interlock", daemon=True).start()
+
+    def _interlock(self, states):
+        self.interlocked = states
+        for name, state in states.items():
+            self._apply(self.relays[name], state)
+
+    def _reassert_interlock(self):
+        with self._cond:
+            self._interlock(self.interlocked)
+
+    def release_interlock(self):
+        with self._cond:
+            self.interlocked = {}
+            for relay in self.relays.values():
+                if not relay.manual and self.running:
+                    self._enter_phase(relay, 0, self.clock())
+
+    def state(self, name):
+        return self.relays[name].state
+
+    def snapshot(self):
+        """Kontrol noktası için: isim -> {faz, fazda geçen süre, elle, durum}."""
+        with self._cond:
+            now = self.clock()
+            return {r.name: {'phase': r.phase, 'state': r.state, 'manual': r.manual,
+                             'elapsed': 0.0 if r.phase_start is None else max(0.0, now - r.phase_start)}
+                    for r in self.relays.values()}
+
+    def restore(self, name, snap):
+        """Röleyi kaydedilen fazına, fazda geçen süreyi koruyarak geri getirir."""
+        with self._cond:
+            relay = self.relays[name]
+            if snap.get('manual'):
+                relay.manual = True
+                relay.token += 1
+                self._apply(relay, bool(snap.get('state')))
+                return
+            relay.manual = False
+            phase = int(snap.get('phase', 0)) % len(relay.profile)
+            state, duration = relay.profile[phase]
+            if duration <= 0 or not self.running:
+                self._enter_phase(relay, phase, self.clock())
+                return
+            relay.phase = phase
+            relay.phase_start = self.clock() - min(float(snap.get('elapsed', 0.0)), duration)
+            self._apply(relay, state)
+            self._schedule(relay, relay.phase_start + duration)
+
+    # --- olay işleme ---
+    def _process(self, now):
+        now_tick = int(math.floor((now - self._t0) / self.tick_s + 1e-9))
+        for relay in self._expire(now_tick):
+            # Geçiş zamanı planlanan andır, kaymayı önlemek için 'now' kullanılmaz
+            at = relay.phase_start + relay.profile[relay.phase][1]
+            self._enter_phase(relay, relay.phase + 1, at)
+        self._due = self._next_tick()
+
+    def next_due(self):
+        """Sıradaki geçişin saat değeri; planlı geçiş yoksa None."""
+        with self._cond:
+            if self._due is None:
+                return None
+            return self._t0 + self._due * self.tick_s
+
+    def run_due(self, now):
+        """Sanal saat: now'a kadar süresi dolan geçişleri uygular."""
+        with self._cond:
+            self._process(now)
+
+    # --- iş parçacığı ---
+    def start(self, threaded=True):
+        with self._cond:
+            now = self.clock()
+            self._stop = False
+            # Çark başlangıcı start anına hizalanır; tam saniyelik süreler tik sınırına düşer
+            self._t0 = now
+            self._cur = 0
+            self._due = None
+            self._wheel = [[] for _ in self._wheel]
+            self.running = True
+            for relay in self.relays.values():
+                if not relay.manual:
+                    self._enter_phase(relay, 0, now)
+        if threaded:
+            self.attach()
+
+    def attach(self):
+        """Olayları işleyen iş parçacığını başlatır (gerçek zamanlı kip)."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="relay-scheduler", daemon=True)
+        self._thread.start()
+
+    def detach(self):
+        """İş parçacığını durdurur; röle durumları ve planlı geçişler korunur (sanal kip)."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        with self._cond:
+            while not self._stop:
+                self._process(self.clock())
+                nxt = self._due
+                timeout = None if nxt is None else max(0.0, self._t0 + nxt * self.tick_s - self.clock())
+                self._cond.wait(timeout)
+
+    def stop(self, all_off=True):
+        with self._cond:
+            self._stop = True
+            self.running = False
+            for relay in self.relays.values():
+                relay.token += 1
+                if all_off:
+                    self._apply(relay, False)
+            self._due = None
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Kayıtlı bir partiyi canlı edinim yerine oynatan ölçüm kaynağı.
+
+Report_Details'taki bir raporun satırları, canlı edinimle aynı yoldan
+(DataUpdateThread.data_updated -> Main.on_data -> tablo ve insert_report_step)
+gerçek hızda (1), N kat hızlı (N) ya da beklemeden (0) akıtılır. Arayüz,
+veritabanı ve dışa aktarma performans çalışmaları için standart yük
+üretecidir; oynatma raporu veritabanının geçici kopyasına yazılır, üretim
+raporları, kuyruk süre tahmini ve fırın modeli etkilenmez:
+
+    python3 mainS.py --replay 96 --speed 10
+
+PipelineMonitor her satırın aşamalarını ölçer:
+
+    signal : kaynağın yaydığı an -> on_data'nın başladığı an (olay kuyruğunda bekleme)
+    ui     : tablo/gösterge güncellemesi
+    db     : adım satırının yazılması
+    total  : yayım -> satırın tamamen işlenmesi
+
+Yayılan ama henüz işlenmemiş satır sayısı (birikme) izlenir; birikmenin
+büyüdüğü durumda darboğaz en uzun süren tüketici aşamasıdır.
+
+Arayüz olmadan (yalnızca sinyal kuyruğu ve veritabanı aşamaları) ölçmek
+için:
+
+    python3 replay_source.py --report 96 --speed 0
+"""
+import argparse
+import datetime
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+
+_TIME_FMT = '%Y-%m-%d %H:%M:%S'
+_COLUMNS = ", ".join([f"T{i}" for i in range(1, 14)] + ["AT1", "AT2", "STEPTIME", "STEPNO"])
+
+MAX_GAP_S = 300.0 # kayıttaki daha uzun boşluklar (duraklatma, devam) bu kadar oynatılır
+STAGES = ('signal', 'ui', 'db', 'total')
+
+
+def _float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def load_rows(conn, report_id):
+    """[(kayıttan saniye, 15 değer, kalan adım)]; boşluklar MAX_GAP_S ile sınırlanır."""
+    rows = conn.execute(f"SELECT {_COLUMNS} FROM Report_Details WHERE REPORT_ID=? ORDER BY ID",
+                        (report_id,)).fetchall()
+    out = []
+    offset = 0.0
+    prev = None
+    for r in rows:
+        try:
+            t = datetime.datetime.strptime(r[15], _TIME_FMT)
+        except (TypeError, ValueError):
+            t = None
+        if prev is not None and t is not None:
+            offset += min(MAX_GAP_S, max(0.0, (t - prev).total_seconds()))
+        if t is not None:
+            prev = t
+        rem = int(r[16]) if r[16] is not None else 0
+        out.append((offset, [_float(v) for v in r[:15]], rem))
+    return out
+
+
+class ReplaySource:
+    """
+    rows: load_rows sonucu
+    speed: 1 gerçek hız, N kat hızlı, 0 beklemeden
+    target_count: sayaç = target_count - kalan (on_data kalanı aynen geri hesaplar)
+    """
+
+    def __init__(self, rows, speed=1.0, target_count=0, start=None, clock=time.monotonic):
+        self.rows = rows
+        self.speed = float(speed)
+        self.target_count = target_count
+        self.start = start if start is not None else datetime.datetime.now()
+        self.clock = clock
+        self.sent = 0
+
+    def run(self, stop_event, pause_event, emit):
+        """emit(t_str, vals, counter) her satır için; tüm satırlar gönderildiyse True."""
+        t0 = self.clock()
+        for offset, vals, rem in self.rows:
+            if pause_event.is_set():
+                paused = self.clock()
+                while pause_event.is_set() and not stop_event.is_set():
+                    time.sleep(0.1)
+                t0 += self.clock() - paused
+            if self.speed > 0:
+                # Mutlak son tarih: tüketicinin yavaşlığı oynatma hızını kaydırmaz
+                delay = t0 + offset / self.speed - self.clock()
+                if delay > 0 and stop_event.wait(delay):
+                    return False
+            if stop_event.is_set():
+                return False
+            t_str = (self.start + datetime.timedelta(seconds=offset)).strftime(_TIME_FMT)
+            emit(t_str, vals, self.target_count - rem)
+            self.sent += 1
+        return True
+
+
+class PipelineMonitor:
+    """
+    Aşama gecikmeleri ve birikme. emitted() üretici iş parçacığında,
+    received()/lap()/handled() tüketicide (GUI) çağrılır; satırlar sırayla işlenir.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.pending = deque()
+        self.samples = {s: [] for s in STAGES}
+        self.backlog = []          # her işlenen satırda bekleyen satır sayısı
+        self.emitted_n = 0
+        self.handled_n = 0
+        self.first = None
+        self.last = None
+        self._emit_t = None
+        self._lap_t = None
+
+    def emitted(self):
+        now = self.clock()
+        if self.first is None:
+            self.first = now
+        self.pending.append(now)
+        self.emitted_n += 1
+
+    def received(self):
+        now = self.clock()
+        self._emit_t = self.pending.popleft() if self.pending else now
+        self._lap_t = now
+        self.samples['signal'].append(now - self._emit_t)
+        self.backlog.append(self.emitted_n - self.handled_n - 1)
+
+    def lap(self, stage):
+        now = self.clock()
+        self.samples[stage].append(now - self._lap_t)
+        self._lap_t = now
+
+    def handled(self):
+        now = self.clock()
+        self.samples['total'].append(now - self._emit_t)
+        self.handled_n += 1
+        self.last = now
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return None
+        ordered = sorted(values)
+        tenth = max(1, len(values) // 10)
+        head = sum(values[:tenth]) / tenth
+        tail = sum(values[-tenth:]) / tenth
+        return {'mean_ms': sum(values) / len(values) * 1000,
+                'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                'max_ms': ordered[-1] * 1000,
+                'trend': tail / head if head > 0 else None}
+
+    def report(self):
+        elapsed = (self.last - self.first) if self.handled_n and self.last > self.first else 0.0
+        stages = {s: self._summary(v) for s, v in self.samples.items()}
+        service = {s: sum(self.samples[s]) for s in ('ui', 'db') if self.samples[s]}
+        busy = sum(service.values())
+        bottleneck = max(service, key=service.get) if service else None
+        tenth = max(1, len(self.backlog) // 10)
+        return {
+            'rows': self.handled_n,
+            'elapsed_s': elapsed,
+            'rows_per_s': self.handled_n / elapsed if elapsed > 0 else None,
+            'stages': stages,
+            'max_backlog': max(self.backlog) if self.backlog else 0,
+            'backlog_growing': bool(self.backlog) and
+                               sum(self.backlog[-tenth:]) / tenth > sum(self.backlog[:tenth]) / tenth + 1,
+            'bottleneck': bottleneck,
+            'bottleneck_share': service[bottleneck] / busy if bottleneck and busy > 0 else None,
+        }
+
+    def format(self):
+        r = self.report()
+        rate = "-" if r['rows_per_s'] is None else f"{r['rows_per_s']:.1f}"
+        lines = [f"Oynatma: {r['rows']} satır, {r['elapsed_s']:.2f} sn, {rate} satır/sn",
+                 f"{'aşama':<8}{'ort. ms':>10}{'p95 ms':>10}{'maks ms':>10}{'son/ilk':>9}"]
+        for s in STAGES:
+            st = r['stages'][s]
+            if st is None:
+                continue
+            trend = "-" if st['trend'] is None else f"{st['trend']:.2f}"
+            lines.append(f"{s:<8}{st['mean_ms']:>10.2f}{st['p95_ms']:>10.2f}{st['max_ms']:>10.2f}{trend:>9}")
+        lines.append(f"Birikme: en fazla {r['max_backlog']} satır"
+                     f"{' (büyüyor)' if r['backlog_growing'] else ''}")
+        if r['bottleneck'] is not None:
+            lines.append(f"Darboğaz: {r['bottleneck']} (işlem süresinin %{r['bottleneck_share'] * 100:.0f}'i)")
+        return "\n".join(lines)
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    ap = argparse.ArgumentParser(description="Kayıtlı raporu arayüzsüz oynatır (sinyal kuyruğu + veritabanı).")
+    ap.add_argument('--report', type=int, required=True, help="oynatılacak rapor no")
+    ap.add_argument('--db', default=os.path.join(here, 'mainDb.sqlite'))
+    ap.add_argument('--speed', type=float, default=0.0, help="1 gerçek hız, N kat, 0 beklemeden")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    rows = load_rows(conn, args.report)
+    conn.close()
+    if not rows:
+        raise SystemExit(f"Rapor bulunamadı ya da boş: {args.report}")
+
+    # Canlı veritabanı kirlenmesin: geçici kopyaya yazılır
+    tmp_dir = tempfile.mkdtemp()
+    db_copy = os.path.join(tmp_dir, os.path.basename(args.db))
+    shutil.copyfile(args.db, db_copy)
+    conn = sqlite3.connect(db_copy)
+    rid = int(conn.execute("SELECT IFNULL(MAX(ID), 0) + 1 FROM REPORT").fetchone()[0])
+
+    monitor = PipelineMonitor()
+    q = queue.Queue()
+    stop_event, pause_event = threading.Event(), threading.Event()
+    source = ReplaySource(rows, args.speed, target_count=0)
+
+    def emit(t_str, vals, counter):
+        monitor.emitted()
+        q.put((t_str, vals, -counter))
+
+    def produce():
+        source.run(stop_event, pause_event, emit)
+        q.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            monitor.received()
+            t_str, vals, rem = item
+            db_vals = [f"{v:.2f}" for v in vals] # arayüz yok: ui aşaması yalnızca biçimlendirme
+            monitor.lap('ui')
+            # mainS.insert_report_step gibi satır başına commit; bağlantı açma maliyeti ölçüme girmez
+            conn.execute("INSERT INTO Report_Details VALUES (NULL,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                         (rid, *db_vals, "0", "0", t_str, rem))
+            conn.commit()
+            monitor.lap('db')
+            monitor.handled()
+    except KeyboardInterrupt:
+        stop_event.set()
+    finally:
+        conn.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print(monitor.format())
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+"""
+Ölçüm döngüsünden, arayüzden ve veritabanından bağımsız aşırı sıcaklık koruması.
+
+Denetçi kendi iş parçacığında ortam kanallarını saniyede birkaç kez okur ve
+aşağıdaki durumlardan biri olursa trip(reason) çağırır:
+
+    over_temp   : ortam sıcaklığı >= SAFETY_MAX_TEMP
+    stale       : son örnek SAFETY_STALE_S + sample_period_s saniyeden eski
+    no_reading  : okuma None/NaN ya da hata verdi
+
+Trip kilitlenir (latch); reset() çağrılana kadar tekrar tetiklenmez ve
+kontrol tarafı çıkışları güvenli durumda tutar. En kötü tepki süresi bir
+kontrol periyodu (1 / SAFETY_RATE_HZ) artı trip çağrısının süresidir;
+gerçekleşen döngü aralıkları stats() ile izlenir.
+
+read_sample(): (sıcaklık °C, örnek anı) döner. Örnek anı okumanın değil
+ölçümün (dönüşüm/simülasyon adımı) anıdır ve denetçinin saatiyle (varsayılan
+time.monotonic) aynı tabanda olmalıdır. Örneği yalnızca belli aralıklarla
+yenilenen kaynaklarda (simülasyon adımı) bu aralık sample_period_s ile verilir.
+"""
+import math
+import os
+import threading
+import time
+
+TRIP_OVER_TEMP = 'over_temp'
+TRIP_STALE = 'stale'
+TRIP_NO_READING = 'no_reading'
+
+TRIP_TEXT = {
+    TRIP_OVER_TEMP: "Aşırı sıcaklık",
+    TRIP_STALE: "Ortam ölçümü güncel değil",
+    TRIP_NO_READING: "Ortam ölçümü okunamadı",
+}
+
+
+class SafetySupervisor:
+    def __init__(self, read_sample, trip, max_temp=110.0, stale_s=2.0, rate_hz=20.0,
+                 clock=time.monotonic, nice=None, sample_period_s=0.0):
+        self.read_sample = read_sample
+        self.trip = trip
+        self.max_temp = float(max_temp)
+        self.stale_s = float(stale_s)
+        self.sample_period_s = float(sample_period_s)
+        self.period = 1.0 / max(1.0, float(rate_hz))
+        self.clock = clock
+        self.nice = nice
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.trips = []             # her trip: {'reason', 'temp', 'age_s', 'time', 'action_s'}
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, settings, read_sample, trip, sample_period_s=0.0):
+        return cls(read_sample, trip,
+                   max_temp=getattr(settings, 'SAFETY_MAX_TEMP', 110.0),
+                   stale_s=getattr(settings, 'SAFETY_STALE_S', 2.0),
+                   rate_hz=getattr(settings, 'SAFETY_RATE_HZ', 20.0),
+                   nice=getattr(settings, 'SAFETY_NICE', None),
+                   sample_period_s=sample_period_s)
+
+    @property
+    def budget_s(self):
+        """Garanti edilen en kötü algılama süresi (trip çağrısı hariç)."""
+        return self.period
+
+    def reset(self):
+        """Kilidi açar; çıkışları serbest bırakmak çağıranın işidir."""
+        self.tripped = None
+        self.last_check = None
+        self.max_gap = 0.0
+        self.checks = 0
+
+    def _evaluate(self, now):
+        try:
+            sample = self.read_sample()
+        except Exception:
+            return TRIP_NO_READING, None, None
+        if sample is None:
+            return TRIP_NO_READING, None, None
+        temp, stamp = sample
+        age = None if stamp is None else max(0.0, now - stamp)
+        if temp is None or math.isnan(temp):
+            return TRIP_NO_READING, None, age
+        if temp >= self.max_temp:
+            return TRIP_OVER_TEMP, temp, age
+        if age is None or age > self.stale_s + self.sample_period_s:
+            return TRIP_STALE, temp, age
+        return None, temp, age
+
+    def tick(self, now=None):
+        """Tek kontrol. Bu çağrıda trip olduysa sebebi, yoksa None döner."""
+        if now is None:
+            now = self.clock()
+        if self.last_check is not None:
+            self.max_gap = max(self.max_gap, now - self.last_check)
+        self.last_check = now
+        self.checks += 1
+        if self.tripped is not None:
+            return None
+        reason, temp, age = self._evaluate(now)
+        if reason is None:
+            return None
+        self.tripped = reason
+        t0 = self.clock()
+        try:
+            self.trip(reason)
+        finally:
+            action = self.clock() - t0
+            self.trips.append({'reason': reason, 'temp': temp, 'age_s': age, 'time': now, 'action_s': action})
+            temp_str = "-" if temp is None else f"{temp:.1f}°C"
+            age_str = "-" if age is None else f"{age:.2f} sn"
+            print(f"GÜVENLİK TRİP: {TRIP_TEXT[reason]} (ortam {temp_str}, örnek yaşı {age_str}, "
+                  f"çıkışlar {action * 1000:.1f} ms'de güvenli)")
+        return reason
+
+    def stats(self):
+        return {'checks': self.checks, 'max_gap_s': self.max_gap, 'budget_s': self.budget_s,
+                'tripped': self.tripped, 'trips': len(self.trips)}
+
+    def _raise_priority(self):
+        # Linux'ta iş parçacığı kimliğiyle öncelik verilebilir; yetki yoksa sessizce geçilir
+        if self.nice is None or not hasattr(os, 'setpriority'):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), int(self.nice))
+        except (OSError, AttributeError):
+            pass
+
+    def _run(self):
+        self._raise_priority()
+        next_t = self.clock()
+        while not self.stop_event.is_set():
+            self.tick()
+            next_t += self.period
+            delay = next_t - self.clock()
+            if delay < 0:
+                next_t = self.clock()
+                delay = 0
+            self.stop_event.wait(delay)
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="safety-supervisor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
@@ -59,7 +59,7 @@ DESIRED_SUCCESS_COUNT = 30
 
 
 
-DESIRED_SECONDS=60 # ölçüm alma sayiyesi -3 verilir run time ortalama 3-4 saniye olduğu için
+DESIRED_SECONDS=60 # ölçüm periyodu (sn); adımlar mutlak zamanlıdır, iş süresi için pay düşmeye gerek yok
 DESIRED_TEMP_DIFFERENCE=405 #405 10 yaparsan 10 derece fark gorunce programı kalan 29a atar
 DESIRED_ENGINE_MUNITE = 2
 RESISTANCE_WORK_MIN = 2
@@ -134,3 +134,33 @@ alert_green_pin = 99 # 24 Fan'a verildi, çakışmaması için değiştirildi
 IP='0.41'
 
 
+OVERSAMPLE_COUNT = 16 # adım başına kanal örnek sayısı
+OVERSAMPLE_DRATE = 'ADS1256_1000SPS'
+OVERSAMPLE_METHOD = 'median' # mean / median / trimmed
+OVERSAMPLE_TRIM = 0.1
+OVERSAMPLE_MODE = 'scan' # scan / stream
+ACQ_OUT_OF_PROCESS = False # True: ölçüm/kontrol ayrı süreçte çalışır, GUI yalnızca okur
+ACQ_SOURCE = 'sim' # sim / adc; adc: sensörler config.ADC_BOARDS/SENSOR_CHANNELS ile ADS1256 kartlarından okunur
+HEATER_CONTROL = 'off' # off / hysteresis / pid; off dışında rezistans ortam sıcaklığıyla sürülür, RESISTANCE_WORK/REST kullanılmaz
+HEATER_RATE_HZ = 4 # ortam okuma/karar sıklığı
+HEATER_MIN_DWELL_S = 10 # röle en az bu kadar aynı durumda kalır
+HEATER_PID_KP = 0.08
+HEATER_PID_KI = 0.002
+HEATER_PID_KD = 0.0
+HEATER_PID_WINDOW_S = 30 # PID görev oranının röleye çevrildiği pencere
+ACTIVE_RECIPE = '' # Boş: tek band (RESISTANCE_MIN/MAX). Ör. 'ISPM15': şok/yaklaşma/tutma fazları (RECIPE tablosu)
+SUCCESS_RULES = [] # Boş: sayaç yalnızca hedef sinyaliyle (tüm problar >= DESIRED_TEMP) ilerler. Orijinal programın kuralları: ['temperature', 'ambient_highest', 'max_diff'] (simülasyonda ortam kanalları problara yaklaşabilir)
+SAFETY_MAX_TEMP = 110.0 # ortam bu değere ulaşırsa rezistans/fan kilitlenerek kapatılır ve parti durur
+SAFETY_STALE_S = 2.0 # ortam örneği bu süreden eskiyse trip
+SAFETY_RATE_HZ = 20 # güvenlik kontrol sıklığı; en kötü tepki süresi 1/SAFETY_RATE_HZ
+SAFETY_FAN_ON_TRIP = False # True: tripte fan açık tutulur (False: red_light gibi kapalı)
+SAFETY_NICE = -10 # güvenlik iş parçacığı önceliği (yetki yoksa yok sayılır)
+GPIO_BACKEND = 'auto' # auto / rpi / lgpio (Pi 5) / fake; auto: rpi -> lgpio -> fake
+SIM_SEED = None # Sayı verilirse simülasyon gürültüsü tekrarlanabilir (turbo oynatmayla aynı sonuç)
+SIM_START_TEMP = None # Sayı verilirse dış sıcaklık internetten sorgulanmaz
+BATCH_COOLDOWN_MIN = 30 # kuyrukta 'soğuma sonrası' kapılı parti bu kadar dakika bekler
+SIM_PLANT_MODEL = '' # Boş: elle seçilmiş simülasyon sabitleri. Ör. 'plant_model.json': geçmiş raporlardan uydurulan model (python3 plant_model.py; her parti sonunda güncellenir)
+WEATHER_PROVIDER = 'online' # online / off (ağ yok) / 'modül.fonksiyon' (°C döndüren yerel sağlayıcı)
+WEATHER_CACHE = 'weather_cache.json' # son dış sıcaklık; simülasyon başlangıcı ağı beklemez
+WEATHER_CACHE_TTL_MIN = 60 # önbellek bu kadar dakikadan eskiyse arka planda yenilenir
+WEATHER_FALLBACK_TEMP = 18.0 # önbellek boşken kullanılan başlangıç sıcaklığı (°C)
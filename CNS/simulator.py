@@ -0,0 +1,380 @@
+"""
+ISPM-15 fırın simülasyonu. PyQt bağımlılığı yoktur; kontrol çekirdeği hem
+GUI içindeki thread'de hem de ayrı edinim sürecinde kullanır.
+
+ISPM15BatchSimulator aynı fiziği NumPy dizileriyle B bağımsız fırın için
+tek seferde adımlar (test ve ayar taraması için).
+"""
+import sys
+import random
+import numpy as np
+import weather
+
+
+# --- HAVA DURUMU (Simülasyon Başlangıcı) ---
+def get_online_temperature():
+    # Ağı beklemez: önbellekteki son değer ya da yedek döner, yenileme arka planda (weather.py)
+    return weather.current_temperature()
+
+
+# --- GELİŞMİŞ SİMÜLASYON FİZİĞİ ---
+class ISPM15Simulator:
+    def __init__(self, settings=None, seed=None, start_temp=None, model=None):
+        # settings: RESISTANCE_MAX/MIN okunan ayar modülü (None ise yüklü olan)
+        # seed: verilirse tüm gürültü bu tohumla üretilir (sanal saatle tekrarlanabilir oynatma)
+        # start_temp: verilirse hava durumu sorgulanmaz
+        # model: plant_model.PlantModel; verilirse elle seçilmiş sabitler yerine
+        #        geçmiş raporlardan kestirilen katsayılar (dakikalık, adım süresine ölçeklenir)
+        self.settings = settings if settings is not None else sys.modules.get("settings")
+        self.rng = random.Random(seed)
+        self.start_temp = get_online_temperature() if start_temp is None else float(start_temp)
+        print(f"Simülasyon Başlatıldı. Dış Ortam: {self.start_temp:.2f}°C")
+        
+        # RUHSAT RAPORU SENARYOSU (Egemsoon & Parti 1)
+        self.target_shock = 102.0
+        self.target_approach = 85.0
+        self.target_hold = 78.0
+        
+        self.firin_set_degeri = self.target_shock
+        
+        # Dinamik Ortam Isınma Hızı (Dış sıcaklığa bağlı)
+        # Yeni Formül (Tuning): Base 1.8, Sensitivity 0.01
+        base_rate = 1.8
+        temp_factor = 1.0 + (self.start_temp - 20.0) * 0.01
+        temp_factor = max(0.5, min(1.5, temp_factor))
+        
+        self.hava_isinma_hizi = base_rate * temp_factor
+        self.drop_rate = 0.8
+        step_min = getattr(self.settings, 'DESIRED_SECONDS', 60) / 60.0
+        if model is not None:
+            self.hava_isinma_hizi = model.heating_rate(self.start_temp) * step_min
+            self.drop_rate = model.cool_rate * step_min
+        print(f"Dinamik Isınma Hızı: {self.hava_isinma_hizi:.2f} (Dış Sıcaklık: {self.start_temp:.1f}°C)")
+        
+        # FİZİKSEL MODELLER (Sensör Profilleri)
+        # Kullanıcı İsteği: Tüm sensörler (13 adet) başta birbirine yakın olsun (+/- 0.5 fark).
+        # Zamanla açılsınlar (Farklı ısınma hızları).
+        
+        self.sensor_states = []
+        
+        # Ortam Sensörleri (AT1, AT2)
+        self.at_states = [
+            {"val": self.start_temp + self.rng.uniform(-0.2, 0.2)}, # AT1
+            {"val": self.start_temp + self.rng.uniform(-0.2, 0.2)}  # AT2
+        ]
+        
+        # Takoz Sensörleri (13 Adet)
+        for i in range(13):
+            # Başlangıç Değeri: Hepsi ortama çok yakın başlar
+            start_val = self.start_temp + self.rng.uniform(-0.5, 0.5)
+            
+            # Isınma Hızı (İletim Katsayısı)
+            # Yavaş Grup: 1, 9, 11, 13 (Index: 0, 8, 10, 12)
+            # Diğerleri: Hızlı Grup
+            if i in [0, 8, 10, 12]:
+                # Yavaşlar (Sırasıyla biraz artar)
+                iletim = 0.0065 + (i * 0.0005) 
+            else:
+                # Hızlılar (Daha hızlı artar, makas açılır)
+                iletim = 0.0100 + (i * 0.0020)
+            if model is not None:
+                iletim = model.iletim[i] * step_min
+
+            self.sensor_states.append({
+                "val": start_val,
+                "iletim": iletim
+            })
+        
+        self.rezistans_aktif = True
+        self.sogutma_modu = False
+        self.sterilizasyon_basladi = False
+        self.phase = "SHOCK" 
+        self.virtual_heater_on = True 
+        # Dış denetleyici (heater_control) varsa son adımdaki rezistans açık kalma oranı;
+        # None ise aşağıdaki sanal termostat kullanılır
+        self.heater_duty = None
+
+    def snapshot(self):
+        """JSON'a yazılabilir tam durum: restore sonrası adımlar kesintisiz koşuyla aynıdır."""
+        version, internal, gauss = self.rng.getstate()
+        return {'start_temp': self.start_temp, 'hava_isinma_hizi': self.hava_isinma_hizi,
+                'drop_rate': self.drop_rate,
+                'at': [a["val"] for a in self.at_states], 'probes': [p["val"] for p in self.sensor_states],
+                'iletim': [p["iletim"] for p in self.sensor_states],
+                'virtual_heater_on': self.virtual_heater_on, 'sogutma_modu': self.sogutma_modu,
+                'rng': [version, list(internal), gauss]}
+
+    def restore(self, snap):
+        self.start_temp = snap.get('start_temp', self.start_temp)
+        self.hava_isinma_hizi = snap.get('hava_isinma_hizi', self.hava_isinma_hizi)
+        self.drop_rate = snap.get('drop_rate', self.drop_rate)
+        for a, v in zip(self.at_states, snap.get('at', [])):
+            a["val"] = v
+        for p, v in zip(self.sensor_states, snap.get('probes', [])):
+            p["val"] = v
+        for p, v in zip(self.sensor_states, snap.get('iletim', [])):
+            p["iletim"] = v
+        self.virtual_heater_on = snap.get('virtual_heater_on', self.virtual_heater_on)
+        self.sogutma_modu = snap.get('sogutma_modu', self.sogutma_modu)
+        if snap.get('rng') is not None:
+            # Eski kontrol noktalarında yoktur; o durumda gürültü yeni tohumla sürer
+            version, internal, gauss = snap['rng']
+            self.rng.setstate((version, tuple(internal), gauss))
+
+    def ambient_temperature(self):
+        return (self.at_states[0]["val"] + self.at_states[1]["val"]) / 2.0
+
+    def calculate_step(self, active_sensors_mask, desired_temp):
+        # 1. AKTİF SENSÖRLERİ TESPİT ET
+        # active_sensors_mask: 15 elemanlı (13 prob + 2 ortam)
+        output_values = [0.0] * 15
+        current_takoz_vals = []
+        
+        # 2. SENSÖR HESAPLAMALARI
+        for i in range(13):
+            if active_sensors_mask[i]:
+                # Mevcut değer
+                val = self.sensor_states[i]["val"]
+                
+                # Çözünürlük ve Dalgalanma (Noise)
+                noise = self.rng.uniform(-0.03, 0.03)
+                val_with_noise = val + noise
+                
+                output_values[i] = val_with_noise
+                
+                # Sadece Yavaş Grubun (1, 9, 11, 13) değerlerini kontrol döngüsüne al
+                # Çünkü süreci en yavaşlar belirler.
+                if i in [0, 8, 10, 12]:
+                    current_takoz_vals.append(val_with_noise)
+
+        # Ortam Değerleri
+        at1_val = self.at_states[0]["val"]
+        at2_val = self.at_states[1]["val"]
+        
+        # Ortam Noise
+        at1_out = at1_val + self.rng.uniform(-0.05, 0.05)
+        at2_out = at2_val + self.rng.uniform(-0.05, 0.05)
+        
+        if active_sensors_mask[13]: output_values[13] = at1_out
+        if active_sensors_mask[14]: output_values[14] = at2_out
+
+        # 3. KONTROL VE FAZ MANTIĞI (Sanal Termostat)
+        avg_ortam = (at1_val + at2_val) / 2.0
+        
+        if avg_ortam >= self.settings.RESISTANCE_MAX:
+            self.virtual_heater_on = False
+        elif avg_ortam <= self.settings.RESISTANCE_MIN:
+            self.virtual_heater_on = True
+            
+        effective_heating = self.rezistans_aktif and self.virtual_heater_on
+        if self.heater_duty is None:
+            duty = 1.0 if effective_heating else 0.0
+        else:
+            duty = self.heater_duty
+
+        # Sayaç Sinyali
+        if not current_takoz_vals:
+             min_takoz = avg_ortam
+        else:
+             min_takoz = min(current_takoz_vals)
+             
+        target_hit = (min_takoz >= desired_temp)
+
+        # 4. ORTAM FİZİĞİ
+        noise_at = self.rng.uniform(-1.2, 1.2)
+        
+        if not self.sogutma_modu:
+            # Adım boyunca rezistansın açık kaldığı oranda ısınma, kalanında soğuma
+            if duty > 0:
+                delta = self.hava_isinma_hizi + noise_at
+                self.at_states[0]["val"] += max(0.2, delta) * duty
+                self.at_states[1]["val"] += max(0.2, delta + self.rng.uniform(-0.5, 0.5)) * duty
+            if duty < 1:
+                drop_rate = self.drop_rate
+                self.at_states[0]["val"] -= (drop_rate + abs(noise_at * 0.2)) * (1 - duty)
+                self.at_states[1]["val"] -= (drop_rate + abs(noise_at * 0.2)) * (1 - duty)
+        else:
+            self.at_states[0]["val"] -= 2.2 + noise_at
+            self.at_states[1]["val"] -= 2.2 + noise_at
+
+        # 5. TAKOZ FİZİĞİ (Isı Transferi)
+        ort_ortam = (self.at_states[0]["val"] + self.at_states[1]["val"]) / 2
+        
+        for i in range(13):
+            # Her sensör kendi state'ini günceller
+            state = self.sensor_states[i]
+            noise_t = self.rng.uniform(-0.02, 0.02)
+            fark = ort_ortam - state["val"]
+            
+            if fark > 0:
+                # Isınma
+                base_iletim = state["iletim"]
+                dynamic_iletim = base_iletim * (1.0 + (fark / 100.0))
+                
+                # Kalıcı Isı Farkı (Strict Thermal Gap) - Kullanıcı İsteği
+                if fark < 9.0:
+                    # 9 Derece altına inince ISINMA DURUR. Sadece dalgalanma olur.
+                    # Bu sayede 9 derece fark korunur.
+                    artis = self.rng.uniform(-0.05, 0.05)
+                    state["val"] += artis
+                elif fark < 12.0:
+                    # 12 Derece altına inince çok yavaşlar (%75 azalır)
+                    dynamic_iletim *= 0.25 
+                    artis = (fark * dynamic_iletim) + noise_t
+                    # Zorunlu minimum artışı kaldırıyoruz (max(0.008, ...) YOK)
+                    state["val"] += max(0.002, artis) # Çok küçük bir min değer
+                else:
+                    # Normal Isınma
+                    artis = (fark * dynamic_iletim) + noise_t
+                    state["val"] += max(0.008, artis)
+                
+            elif fark < -0.5: 
+                # Overshoot engelleme
+                state["val"] -= 0.05 
+                
+            elif self.sogutma_modu:
+                # Soğuma
+                state["val"] += (fark * state["iletim"] * 0.5)
+
+        return output_values, target_hit
+
+
+# --- VEKTÖREL SİMÜLASYON (B fırın) ---
+SLOW_PROBES = [0, 8, 10, 12] # Yavaş grup: 1, 9, 11, 13
+
+
+def probe_conductance():
+    """13 probun iletim katsayıları (ISPM15Simulator ile aynı)."""
+    i = np.arange(13)
+    iletim = 0.0100 + i * 0.0020
+    iletim[SLOW_PROBES] = 0.0065 + np.array(SLOW_PROBES) * 0.0005
+    return iletim
+
+
+NOISE_BLOCK = 64 # adım
+# Adım başına fırın başına gürültü sütunları ([-1, 1) düzgün, kullanıldığı yerde ölçeklenir)
+_N_PROBE_MEAS, _N_AT_MEAS, _N_AT, _N_AT2, _N_TRANSFER, _N_GAP = 13, 2, 1, 1, 13, 13
+_NOISE_COLS = np.cumsum([0, _N_PROBE_MEAS, _N_AT_MEAS, _N_AT, _N_AT2, _N_TRANSFER, _N_GAP])
+
+
+class ISPM15BatchSimulator:
+    """
+    ISPM15Simulator fiziğinin B fırınlık vektörel hali.
+
+    Durumlar (B, 13) prob ve (B, 2) ortam dizilerinde tutulur; her adım
+    (B, 15) çıkış ve (B,) hedef sinyali döner. Her fırının kendi gürültü
+    akışı vardır (SeedSequence(seed).spawn(B)); i. fırın B'den bağımsız
+    olarak aynı seed ile aynı sonucu verir. Gürültü her fırın için
+    NOISE_BLOCK adımlık bloklar halinde çekilir, adım vektörel kalır.
+
+    start_temp, resistance_min, resistance_max: sayı ya da (B,) dizi.
+    start_temp verilmezse her fırın için 15-20°C arası çekilir (hava durumu
+    sorgulanmaz); band verilmezse settings.RESISTANCE_MIN/MAX kullanılır.
+    model: plant_model.PlantModel (ISPM15Simulator ile aynı anlamda).
+    """
+
+    def __init__(self, n, settings=None, seed=None, start_temp=None, resistance_min=None, resistance_max=None,
+                 model=None):
+        settings = settings if settings is not None else sys.modules.get("settings")
+        self.n = int(n)
+        self.rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(self.n)]
+        self._noise_block = np.empty((self.n, 0, _NOISE_COLS[-1]))
+        self._noise_pos = 0
+        if start_temp is None:
+            start_temp = [g.uniform(15.0, 20.0) for g in self.rngs]
+        self.start_temp = np.broadcast_to(np.asarray(start_temp, dtype=np.float64), (self.n,)).copy()
+        self.resistance_min = np.broadcast_to(np.asarray(
+            settings.RESISTANCE_MIN if resistance_min is None else resistance_min, dtype=np.float64), (self.n,)).copy()
+        self.resistance_max = np.broadcast_to(np.asarray(
+            settings.RESISTANCE_MAX if resistance_max is None else resistance_max, dtype=np.float64), (self.n,)).copy()
+
+        if model is None:
+            temp_factor = np.clip(1.0 + (self.start_temp - 20.0) * 0.01, 0.5, 1.5)
+            self.hava_isinma_hizi = 1.8 * temp_factor
+            self.drop_rate = 0.8
+            self.iletim = probe_conductance()
+        else:
+            step_min = getattr(settings, 'DESIRED_SECONDS', 60) / 60.0
+            temp_factor = np.clip(1.0 + (self.start_temp - 20.0) * model.heat_sensitivity, 0.5, 1.5)
+            self.hava_isinma_hizi = model.heat_base * temp_factor * step_min
+            self.drop_rate = model.cool_rate * step_min
+            self.iletim = np.asarray(model.iletim, dtype=np.float64) * step_min
+        self.at = self.start_temp[:, None] + np.array([g.uniform(-0.2, 0.2, 2) for g in self.rngs]).reshape(self.n, 2)
+        self.probes = self.start_temp[:, None] + np.array([g.uniform(-0.5, 0.5, 13) for g in self.rngs]).reshape(self.n, 13)
+
+        self.rezistans_aktif = np.ones(self.n, dtype=bool)
+        self.sogutma_modu = np.zeros(self.n, dtype=bool)
+        self.virtual_heater_on = np.ones(self.n, dtype=bool)
+        # (B,) rezistans görev oranı; None ise sanal termostat kullanılır
+        self.heater_duty = None
+
+    def ambient_temperature(self):
+        return self.at.mean(axis=1)
+
+    def _noise(self):
+        """Bu adımın gürültüsü: sütun grupları _NOISE_COLS sırasıyla (B, k) dizileri."""
+        if self._noise_pos >= self._noise_block.shape[1]:
+            self._noise_block = np.stack([g.uniform(-1.0, 1.0, (NOISE_BLOCK, _NOISE_COLS[-1])) for g in self.rngs])
+            self._noise_pos = 0
+        u = self._noise_block[:, self._noise_pos]
+        self._noise_pos += 1
+        return [u[:, a:b] for a, b in zip(_NOISE_COLS[:-1], _NOISE_COLS[1:])]
+
+    def calculate_step(self, active_sensors_mask, desired_temp):
+        """active_sensors_mask: 15 elemanlı ya da (B, 15). Dönüş: (B, 15) çıkış, (B,) hedef sinyali."""
+        mask = np.broadcast_to(np.asarray(active_sensors_mask, dtype=bool), (self.n, 15))
+        n = self.n
+        u_probe, u_at_meas, u_at, u_at2, u_transfer, u_gap = self._noise()
+
+        # Ölçümler (gürültülü); pasif sensörler 0
+        out = np.empty((n, 15))
+        out[:, :13] = self.probes + 0.03 * u_probe
+        out[:, 13:] = self.at + 0.05 * u_at_meas
+        out[~mask] = 0.0
+
+        # Sayaç sinyali: aktif yavaş probların en soğuğu (yoksa ortam ortalaması)
+        avg_ortam = self.at.mean(axis=1)
+        slow = np.where(mask[:, SLOW_PROBES], out[:, SLOW_PROBES], np.inf)
+        min_takoz = slow.min(axis=1)
+        min_takoz = np.where(np.isinf(min_takoz), avg_ortam, min_takoz)
+        target_hit = min_takoz >= desired_temp
+
+        # Sanal termostat
+        self.virtual_heater_on = np.where(avg_ortam >= self.resistance_max, False,
+                                          np.where(avg_ortam <= self.resistance_min, True, self.virtual_heater_on))
+        if self.heater_duty is None:
+            duty = (self.rezistans_aktif & self.virtual_heater_on).astype(np.float64)
+        else:
+            duty = np.broadcast_to(np.asarray(self.heater_duty, dtype=np.float64), (n,))
+
+        # Ortam fiziği
+        noise_at = 1.2 * u_at[:, 0]
+        delta = self.hava_isinma_hizi + noise_at
+        heat = np.stack([np.maximum(0.2, delta), np.maximum(0.2, delta + 0.5 * u_at2[:, 0])], axis=1)
+        drop = (self.drop_rate + np.abs(noise_at * 0.2))[:, None]
+        normal = self.at + heat * duty[:, None] - drop * (1.0 - duty)[:, None]
+        cooling = self.at - (2.2 + noise_at)[:, None]
+        self.at = np.where(self.sogutma_modu[:, None], cooling, normal)
+
+        # Takoz fiziği (ısı transferi, 9/12 derece ısıl boşluk kuralı)
+        ort_ortam = self.at.mean(axis=1)[:, None]
+        fark = ort_ortam - self.probes
+        noise_t = 0.02 * u_transfer
+        dynamic = self.iletim * (1.0 + fark / 100.0)
+        heating = np.select(
+            [fark < 9.0, fark < 12.0],
+            [0.05 * u_gap,
+             np.maximum(0.002, fark * dynamic * 0.25 + noise_t)],
+            np.maximum(0.008, fark * dynamic + noise_t))
+        cool = np.where(self.sogutma_modu[:, None], fark * self.iletim * 0.5, 0.0)
+        self.probes = self.probes + np.select([fark > 0, fark < -0.5], [heating, -0.05], cool)
+
+        return out, target_hit
+
+    def run(self, steps, active_sensors_mask, desired_temp):
+        """steps adım: (steps, B, 15) çıkışlar ve (steps, B) hedef sinyalleri."""
+        outs = np.empty((steps, self.n, 15))
+        hits = np.empty((steps, self.n), dtype=bool)
+        for k in range(steps):
+            outs[k], hits[k] = self.calculate_step(active_sensors_mask, desired_temp)
+        return outs, hits
@@ -0,0 +1,98 @@
+"""
+Mutlak son tarihli adım zamanlayıcısı.
+
+k. adımın son tarihi t0 + k * period'dur (monotonic saat). Ölçüm, veritabanı
+ve arayüz süresi bir sonraki beklemeye eklenmez; bu yüzden periyot
+kaymaz ve DESIRED_SECONDS'tan elle pay düşmek gerekmez. Uzun süren bir
+adım ya da duraklatma sonrası kaçırılan son tarihler toplu olarak atlanır,
+ızgara yerinde kalır.
+"""
+import math
+import time
+
+
+class StepScheduler:
+    def __init__(self, period_s, clock=time.monotonic):
+        self.period = float(period_s)
+        self.clock = clock
+        self.start_time = None
+        self.index = 0           # sıradaki adımın ızgara indeksi
+        self.missed = 0          # geç kalındığı için atlanan son tarihler
+        self.paused_slots = 0    # duraklatma sırasında geçen son tarihler
+        self.last_lateness = 0.0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max = 0.0
+
+    def start(self, now=None):
+        self.start_time = self.clock() if now is None else now
+        self.index = 0
+
+    def deadline(self):
+        return self.start_time + self.index * self.period
+
+    def set_period(self, period_s):
+        """Periyot değişirse ızgara sıradaki son tarihten yeniden kurulur."""
+        period_s = float(period_s)
+        if period_s != self.period and self.start_time is not None:
+            self.start_time = self.deadline()
+            self.index = 0
+        self.period = period_s
+
+    def _record(self, late):
+        self.last_lateness = late
+        self._n += 1
+        d = late - self._mean
+        self._mean += d / self._n
+        self._m2 += d * (late - self._mean)
+        self._max = max(self._max, late)
+
+    def wait(self, stop_event):
+        """Sıradaki son tarihe kadar uyur. Durdurulursa False döner."""
+        if self.start_time is None:
+            self.start()
+        while True:
+            remaining = self.deadline() - self.clock()
+            if remaining <= 0:
+                break
+            if stop_event.wait(remaining):
+                return False
+        late = self.clock() - self.deadline()
+        if late >= self.period:
+            skip = int(late // self.period)
+            self.missed += skip
+            self.index += skip
+            late -= skip * self.period
+        self._record(late)
+        self.index += 1
+        return True
+
+    def take(self):
+        """Sanal saat: sıradaki son tarihi döner ve ızgarada ilerler (beklemeden)."""
+        if self.start_time is None:
+            self.start()
+        deadline = self.deadline()
+        self.index += 1
+        return deadline
+
+    def resume(self, now=None):
+        """Duraklatma bitti: arada geçen son tarihler gecikme sayılmadan atlanır."""
+        if self.start_time is None:
+            return
+        now = self.clock() if now is None else now
+        behind = now - self.deadline()
+        if behind > 0:
+            skip = int(math.ceil(behind / self.period))
+            self.paused_slots += skip
+            self.index += skip
+
+    def stats(self):
+        return {
+            'steps': self._n,
+            'lateness_mean_s': self._mean,
+            'jitter_s': math.sqrt(self._m2 / self._n) if self._n > 1 else 0.0,
+            'lateness_max_s': self._max,
+            'missed': self.missed,
+            'paused_slots': self.paused_slots,
+        }
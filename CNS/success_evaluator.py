@@ -0,0 +1,103 @@
+"""
+Başarı sayacının adım kuralları, sabit bellek ve sabit işlemle.
+
+Orijinal programdaki üç kural:
+    temperature_check   : aktif her sensör >= DESIRED_TEMP
+    compare_last_two    : ortam sensörleri (AT1, AT2) tüm problardan sıcak
+    check_last_two_diff : sayaç sıfırdan büyükken her kanalın bir önceki
+                          ölçüme farkı <= DESIRED_TEMP_DIFFERENCE
+Tüm ölçüm geçmişi yerine yalnızca bir önceki ölçüm tutulur; kontroller
+aktif sensörlerin NumPy vektörü üzerinde yapılır.
+
+Sayaç her zaman ölçüm kaynağının hedef sinyaline (calculate_step'in
+target_hit'i) bağlıdır; simülasyon programındaki sayaç budur. Yukarıdaki
+kurallar SUCCESS_RULES ayarıyla bunun üzerine eklenir; varsayılan boştur
+(settings.py ile aynı), ORIGINAL_RULES orijinal programın üç kuralıdır.
+"""
+import numpy as np
+
+REASON_BELOW_TARGET = 'below_target'
+REASON_AMBIENT_NOT_HIGHEST = 'ambient_not_highest'
+REASON_FAST_CHANGE = 'fast_change'
+
+RULE_TEMPERATURE = 'temperature'
+RULE_AMBIENT_HIGHEST = 'ambient_highest'
+RULE_MAX_DIFF = 'max_diff'
+DEFAULT_RULES = ()
+ORIGINAL_RULES = (RULE_TEMPERATURE, RULE_AMBIENT_HIGHEST, RULE_MAX_DIFF)
+
+REASON_TEXT = {
+    REASON_BELOW_TARGET: "Isınma devam ediyor; eşik altında",
+    REASON_AMBIENT_NOT_HIGHEST: "Ortam sıcaklığı problardan yüksek değil",
+    REASON_FAST_CHANGE: "Hızlı sıcaklık değişimi, adım sıfırlandı",
+}
+
+
+class SuccessEvaluator:
+    def __init__(self, target_temp, target_count, max_diff, mask, n_ambient=2, rules=DEFAULT_RULES):
+        self.target_count = target_count
+        self.n_ambient = n_ambient
+        self.prev = None
+        self.counter = 0
+        self.reason = None          # son adımda sayaç neden ilerlemedi (None: ilerledi)
+        self.resets = {}            # sebep -> sıfırlama sayısı
+        self.configure(target_temp, max_diff, mask, rules)
+
+    @classmethod
+    def from_settings(cls, settings, mask):
+        return cls(settings.DESIRED_TEMP, settings.DESIRED_SUCCESS_COUNT,
+                   getattr(settings, 'DESIRED_TEMP_DIFFERENCE', float('inf')), mask,
+                   rules=getattr(settings, 'SUCCESS_RULES', DEFAULT_RULES))
+
+    def configure(self, target_temp, max_diff, mask, rules=DEFAULT_RULES):
+        self.rules = frozenset(rules)
+        self.target_temp = float(target_temp)
+        self.max_diff = float(max_diff)
+        self.mask = np.asarray(mask, dtype=bool)
+        self.active = np.flatnonzero(self.mask)
+
+    def snapshot(self):
+        return {'counter': self.counter, 'resets': dict(self.resets),
+                'prev': None if self.prev is None else self.prev.tolist()}
+
+    def restore(self, snap):
+        self.counter = int(snap.get('counter', 0))
+        self.resets = dict(snap.get('resets', {}))
+        prev = snap.get('prev')
+        self.prev = None if prev is None else np.asarray(prev, dtype=np.float64)
+
+    @property
+    def remaining(self):
+        return max(0, self.target_count - self.counter)
+
+    def done(self):
+        return self.counter >= self.target_count
+
+    def _check(self, v):
+        act = v[self.active]
+        # Sıfır okunan kanal devre dışı sayılır (orijinal temperature_check gibi)
+        if RULE_TEMPERATURE in self.rules and np.any((act != 0.0) & (act < self.target_temp)):
+            return REASON_BELOW_TARGET
+        if RULE_AMBIENT_HIGHEST in self.rules:
+            ambient = v[-self.n_ambient:]
+            probes = v[:-self.n_ambient]
+            if probes.size == 0 or np.any(probes >= ambient.min()):
+                return REASON_AMBIENT_NOT_HIGHEST
+        if RULE_MAX_DIFF in self.rules and self.counter > 0 and self.prev is not None:
+            if np.any(np.abs(act - self.prev[self.active]) > self.max_diff):
+                return REASON_FAST_CHANGE
+        return None
+
+    def update(self, values, target_hit=True):
+        """Bir adımın 15 değeri (pasif sensörler 0) ve kaynağın hedef sinyali. Güncel sayacı döner."""
+        v = np.asarray(values, dtype=np.float64)
+        v = np.where(self.mask, v, 0.0)
+        self.reason = self._check(v) if target_hit else REASON_BELOW_TARGET
+        if self.reason is None:
+            self.counter += 1
+        else:
+            if self.counter > 0:
+                self.resets[self.reason] = self.resets.get(self.reason, 0) + 1
+            self.counter = 0
+        self.prev = v
+        return self.counter
@@ -0,0 +1,97 @@
+import pytest
+
+import ads1256_emulator
+from ads1256_emulator import EmulatedADS1256, celsius
+
+ads1256_emulator.install()              # config sahte spidev/RPi.GPIO ile yüklenir
+
+import ADS1256                          # noqa: E402
+import config                           # noqa: E402
+
+
+def _temp(code):
+    return code * 5.0 / 0x7FFFFF / 0.01 - 4
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CAL_CACHE_FILE', str(tmp_path / 'adc_calibration.json'))
+    monkeypatch.setattr(config, 'board_temperature', lambda: 45.0)
+    return ads1256_emulator.install(chip=EmulatedADS1256(waveforms={3: celsius(70.0)}))
+
+
+@pytest.fixture
+def adc(board):
+    a = ADS1256.ADS1256()
+    assert a.ADS1256_init() == 0
+    return a
+
+
+def test_pipelined_scan_keeps_channel_order(adc):
+    values, stamps = adc.ADS1256_ScanChannels([3, 0, 5])
+    assert [round(_temp(v)) for v in values] == [70, 25, 30]
+    assert stamps == sorted(stamps) and adc.scan_stats['channels'] == 3
+
+
+def test_stream_channel_returns_count_codes(adc):
+    codes = adc.ADS1256_StreamChannel(3, 50)
+    assert len(codes) == 50 and all(abs(_temp(c) - 70.0) < 0.1 for c in codes)
+    assert not adc.continuous
+    assert abs(_temp(adc.ADS1256_GetChannalValue(0)) - 25.0) < 0.1      # RDATAC sonrası tek okuma
+
+
+def test_register_read_is_one_cs_frame(adc, board):
+    calls, writes = board.spi_calls, board.gpio_writes
+    regs = adc.ADS1256_ReadRegs(ADS1256.REG_E['REG_STATUS'], 4)
+    assert len(regs) == 4 and regs[0] >> 4 == 3                  # STATUS: ID=3
+    assert board.spi_calls - calls == 2                           # komut + t6 + veri
+    assert board.gpio_writes - writes == 2                        # CS bir kez düşer, bir kez kalkar
+
+
+def test_calibration_is_cached_until_temperature_moves(adc, monkeypatch):
+    cache = config.load_cal_cache()
+    assert str(adc.cs_pin) in cache                      # ilk açılışta kalibre edilip saklandı
+    gain, drate = cache[str(adc.cs_pin)]['gain'], cache[str(adc.cs_pin)]['drate']
+    assert adc.ADS1256_ApplyCalibration(gain, drate) is False
+    monkeypatch.setattr(config, 'board_temperature', lambda: 45.0 + config.CAL_MAX_TEMP_DELTA + 1)
+    assert adc.ADS1256_ApplyCalibration(gain, drate) is True
+    assert adc.ADS1256_ApplyCalibration(gain, drate) is False
+
+
+def test_cold_start_loads_cached_calibration(adc, tmp_path):
+    cached = config.load_cal_cache()[str(adc.cs_pin)]['regs']
+    chip = EmulatedADS1256()                              # güç kesildi: yonga sıfırdan açılır
+    ads1256_emulator.install(chip=chip)
+    cold = ADS1256.ADS1256()
+    assert cold.ADS1256_init() == 0
+    assert chip.stats.get('calibrations', 0) == 0         # ne ACAL ne SELFCAL
+    assert cold.ADS1256_ReadCalibration() == cached
+    assert abs(_temp(cold.ADS1256_GetChannalValue(0)) - 25.0) < 0.1
+
+
+def test_cold_start_without_cache_calibrates(board):
+    chip = board.chips[0][0]
+    adc = ADS1256.ADS1256()
+    assert adc.ADS1256_init() == 0
+    assert chip.stats['calibrations'] > 0                 # ACAL yazımı
+    assert str(adc.cs_pin) in config.load_cal_cache()
+
+
+def test_array_resets_shared_line_once_before_configuring(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CAL_CACHE_FILE', str(tmp_path / 'adc_calibration.json'))
+    monkeypatch.setattr(config, 'DRDY_TIMEOUT_MS', 20)
+    board = ads1256_emulator.EmulatedBoard()
+    first, second = EmulatedADS1256(), EmulatedADS1256(seed=1)
+    board.attach(first)
+    board.attach(second, cs_pin=23, drdy_pin=27)            # aynı RST hattı (18)
+    second.halted = True                                    # yanıt vermeyen kart
+    ads1256_emulator.install(board=board)
+    resets = []
+    for chip in (first, second):
+        monkeypatch.setattr(chip, 'reset', lambda chip=chip, f=chip.reset: (resets.append(chip), f()))
+    array = ADS1256.ADS1256_Array(boards=[{'cs': 22, 'drdy': 17, 'rst': 18}, {'cs': 23, 'drdy': 27, 'rst': 18}],
+                                  sensor_channels={'T1': (0, 0), 'T2': (1, 0)})
+    drate = ADS1256.ADS1256_DRATE_E['ADS1256_1000SPS']
+    assert array.ADS1256_init(ADS1256.ADS1256_GAIN_E['ADS1256_GAIN_1'], drate) == 0
+    assert resets == [first, second]                        # tek darbe, iki yonga
+    assert first.regs[3] == drate and second.regs[3] == drate
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+import acquisition_daemon as ad
+from acquisition_daemon import LatestValuesBoard, BoardReadTimeout, STATUS_RUNNING, RING_SIZE
+
+
+@pytest.fixture
+def board():
+    b = LatestValuesBoard(create=True)
+    yield b
+    b.close()
+    b.unlink()
+
+
+def _set_seq(board, seq):
+    ad._SEQ.pack_into(board.buf, 0, seq)
+
+
+def test_publish_and_read(board):
+    board.publish(3, 100.0, 2, STATUS_RUNNING, [1, 0], [float(i) for i in range(15)])
+    rec = board.read()
+    assert rec['step_no'] == 3 and rec['counter'] == 2 and rec['status'] == STATUS_RUNNING
+    assert rec['relays'][:2] == [1, 0] and rec['values'][14] == 14.0
+    assert rec['seq'] % 2 == 0 and not rec['stale']
+
+
+def test_read_returns_stale_copy_when_writer_dies_mid_write(board):
+    board.publish(1, 1.0, 0, STATUS_RUNNING, [0, 0], [5.0] * 15)
+    board.read()
+    _set_seq(board, board.read()['seq'] + 1)     # yazım yarıda kaldı
+    t0 = time.monotonic()
+    rec = board.read(timeout=0.05)
+    assert time.monotonic() - t0 < 1.0
+    assert rec['stale'] and rec['step_no'] == 1 and rec['values'] == [5.0] * 15
+
+
+def test_read_raises_when_never_consistent(board):
+    _set_seq(board, 1)
+    with pytest.raises(BoardReadTimeout):
+        board.read(timeout=0.02)
+
+
+def test_concurrent_reads_are_never_torn(board):
+    stop = threading.Event()
+
+    def writer():
+        n = 0
+        while not stop.is_set():
+            n += 1
+            board.publish(n, float(n), n, STATUS_RUNNING, [n & 1] * 8, [float(n)] * 15)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        for _ in range(2000):
+            rec = board.read()
+            n = rec['step_no']
+            assert rec['counter'] == n and rec['values'] == [float(n)] * 15
+    finally:
+        stop.set()
+        t.join()
+
+
+def test_read_new_steps_from_resumed_step(board):
+    for n in range(501, 506):
+        board.publish(n, float(n), n, STATUS_RUNNING, [0, 0], [float(n)] * 15)
+    # Devam eden partide okuyucu kaldığı adımdan başlar: kayıp sayılmaz
+    steps, lost = board.read_new_steps(500)
+    assert [s[0] for s in steps] == [501, 502, 503, 504, 505] and lost == 0
+    assert board.reader_lag(505) == 0
+    steps, lost = board.read_new_steps(0)
+    assert lost == 505 - len(steps)
+
+
+def test_ring_overrun_counts_lost_steps(board):
+    for n in range(1, RING_SIZE + 11):
+        board.publish(n, float(n), 0, STATUS_RUNNING, [0, 0], [0.0] * 15)
+    steps, lost = board.read_new_steps(0)
+    assert lost == 10 and steps[0][0] == 11
+
+
+def test_relay_change_between_steps_keeps_step_fields(board):
+    board.publish(7, 70.0, 3, STATUS_RUNNING, [0, 0], [1.0] * 15)
+    board.set_relays([1, 0])
+    rec = board.read()
+    assert rec['relays'][:2] == [1, 0] and rec['step_no'] == 7 and rec['values'] == [1.0] * 15
+    steps, _ = board.read_new_steps(6)
+    assert [s[0] for s in steps] == [7]                  # yeni adım sayılmaz
+
+
+def test_process_is_spawned_not_forked():
+    proc = ad.AcquisitionProcess('settings.py')
+    try:
+        assert proc.ctx.get_start_method() == 'spawn'
+    finally:
+        proc.close()
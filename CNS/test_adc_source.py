@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+import ads1256_emulator
+from ads1256_emulator import EmulatedADS1256, EmulatedBoard, celsius
+
+# config.ADC_BOARDS ile aynı iki kart: T1..T8 kart 0'da, T9..T13/AT1/AT2 kart 1'de
+_board = EmulatedBoard()
+_board.attach(EmulatedADS1256())
+_board.attach(EmulatedADS1256(waveforms={0: celsius(50.0), 5: celsius(60.0), 6: celsius(62.0)}, seed=1),
+              cs_pin=23, drdy_pin=27)
+ads1256_emulator.install(board=_board)
+
+import ADS1256                            # noqa: E402
+import config                             # noqa: E402
+import settings                           # noqa: E402
+from adc_source import ADCSource          # noqa: E402
+from control_core import make_source      # noqa: E402
+from safety_supervisor import SafetySupervisor, TRIP_STALE     # noqa: E402
+
+MASK = [True] * 15
+
+
+@pytest.fixture(scope='module')
+def source(tmp_path_factory, sim_settings):
+    ads1256_emulator.install(board=_board)      # başka test modülü kendi kartını kurmuş olabilir
+    s = sim_settings(ACQ_SOURCE='adc', OVERSAMPLE_COUNT=4)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(config, 'CAL_CACHE_FILE', str(tmp_path_factory.mktemp('cal') / 'adc_calibration.json'))
+        yield make_source(s)
+
+
+def test_boards_start_at_oversampling_rate(source):
+    drate = ADS1256.ADS1256_DRATE_E[settings.OVERSAMPLE_DRATE]
+    assert [chip.regs[3] for chip, *_ in _board.chips] == [drate, drate]
+    cache = config.load_cal_cache()
+    assert [cache[str(adc.cs_pin)]['drate'] for adc in source.adc.adcs] == [drate, drate]
+
+
+def test_make_source_builds_adc_source(source):
+    assert isinstance(source, ADCSource)
+    assert source.adc.names[13:] == ['AT1', 'AT2']
+
+
+def test_step_reads_mapped_columns(source):
+    vals, hit = source.calculate_step(MASK, 56.0)
+    assert abs(vals[0] - 25.0) < 0.2 and abs(vals[7] - 32.0) < 0.2     # kart 0: AIN i = 25+i
+    assert abs(vals[8] - 50.0) < 0.2                                    # T9: kart 1 AIN0
+    assert abs(vals[13] - 60.0) < 0.2 and abs(vals[14] - 62.0) < 0.2
+    assert not hit
+
+
+def test_inactive_columns_read_zero(source):
+    mask = [False] * 13 + [True, True]
+    vals, _ = source.calculate_step(mask, 56.0)
+    assert vals[:13] == [0.0] * 13 and vals[13] > 0
+
+
+def test_ambient_sample_is_stamped_at_conversion(source):
+    t0 = time.monotonic()
+    temp, stamp = source.ambient_sample()
+    assert abs(temp - 61.0) < 0.2
+    assert t0 <= stamp <= time.monotonic()
+    assert source.ambient_temperature() == pytest.approx(61.0, abs=0.2)
+
+
+def test_failed_ambient_read_keeps_old_stamp(source, monkeypatch):
+    temp, stamp = source.ambient_sample()
+
+    def timeout(channels):
+        raise ADS1256.DRDYTimeoutError("DRDY")
+
+    monkeypatch.setattr(source.adc, 'ADS1256_ScanChannels', timeout)
+    assert source.ambient_sample() == (temp, stamp)
+
+
+def test_supervisor_does_not_wait_for_a_running_step(source):
+    temp, stamp = source.ambient_sample()
+    sup = SafetySupervisor(source.ambient_sample, lambda reason: None, stale_s=0.05)
+    with source.lock:                               # ölçüm adımı sürüyor
+        t0 = time.monotonic()
+        assert sup.tick() is None
+        assert source.ambient_sample() == (temp, stamp)
+        time.sleep(0.1)
+        assert sup.tick() == TRIP_STALE
+        assert time.monotonic() - t0 < 0.1 + sup.budget_s
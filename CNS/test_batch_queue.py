@@ -0,0 +1,86 @@
+import datetime
+import sqlite3
+import types
+
+import pytest
+
+import batch_queue as bq
+import recipes
+
+NOW = datetime.datetime(2026, 3, 2, 8, 0, 0)
+SETTINGS = types.SimpleNamespace(DESIRED_SUCCESS_COUNT=30, DESIRED_SECONDS=60, BATCH_COOLDOWN_MIN=30)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.execute('CREATE TABLE "REPORT" ("ID" INTEGER UNIQUE, "FIRM_ID" INT, "START_TIME" DATETIME, '
+              '"END_TIME" DATETIME, "TYPE" TEXT, "M3" TEXT, "PIECES" TEXT, "REPORT_INFO" TEXT)')
+    recipes.ensure_schema(c)
+    bq.ensure_schema(c)
+    yield c
+    c.close()
+
+
+def _report(conn, rid, hours, recipe=None):
+    start = datetime.datetime(2026, 1, 1, 8, 0, 0)
+    end = start + datetime.timedelta(hours=hours)
+    conn.execute("INSERT INTO REPORT(ID, START_TIME, END_TIME) VALUES (?,?,?)",
+                 (rid, start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S')))
+    if recipe:
+        conn.execute("INSERT INTO REPORT_RECIPE(REPORT_ID, NAME) VALUES (?,?)", (rid, recipe))
+
+
+def test_typical_duration_prefers_same_recipe(conn):
+    assert bq.typical_duration_s(conn) is None
+    _report(conn, 1, 4)
+    _report(conn, 2, 6)
+    _report(conn, 3, 10, 'ISPM15')
+    conn.execute("INSERT INTO REPORT(ID, START_TIME, END_TIME) VALUES (4, '2026-01-02 08:00:00', 'IP')")
+    assert bq.typical_duration_s(conn, 'ISPM15') == 10 * 3600
+    assert bq.typical_duration_s(conn) == 5 * 3600
+    assert bq.typical_duration_s(conn, 'BAŞKA') == 6 * 3600          # reçetesiz: hepsinin ortancası
+
+
+def test_plan_chains_waiting_batches_with_gates(conn):
+    _report(conn, 1, 5)
+    a = bq.enqueue(conn, 'Palet', '10', '100', '')
+    b = bq.enqueue(conn, 'Palet', '12', '120', '', gate=bq.GATE_COOLDOWN)
+    schedule = bq.plan(conn, SETTINGS, NOW)
+    assert [it['id'] for it, *_ in schedule] == [a, b]
+    (_, s1, e1, p1), (_, s2, e2, _) = schedule
+    assert s1 == NOW and e1 == NOW + datetime.timedelta(hours=5) and p1 == 0.0
+    assert s2 == e1 + datetime.timedelta(minutes=30) and e2 == s2 + datetime.timedelta(hours=5)
+
+
+def test_plan_without_history_uses_minimum_duration(conn):
+    bq.enqueue(conn, 'Palet', '10', '100', '')
+    (_, start, end, _), = bq.plan(conn, SETTINGS, NOW)
+    assert end - start == datetime.timedelta(seconds=30 * 60)
+
+
+def test_plan_running_batch_estimates_remaining(conn):
+    _report(conn, 1, 5)
+    first = bq.enqueue(conn, 'Palet', '10', '100', '')
+    second = bq.enqueue(conn, 'Palet', '10', '100', '')
+    bq.mark_running(conn, first, 1)
+    running = {'elapsed_s': 4 * 3600, 'counter': 0, 'recipe': ''}
+    (it, start, end, progress), (_, next_start, _, _) = bq.plan(conn, SETTINGS, NOW, running)
+    assert it['id'] == first and start == NOW - datetime.timedelta(hours=4)
+    assert end == NOW + datetime.timedelta(hours=1) and progress == pytest.approx(0.8)
+    assert next_start == end
+    # Ortanca süre geçildiyse en az kalan sayaç adımları kadar sürer
+    running = {'elapsed_s': 6 * 3600, 'counter': 20, 'recipe': ''}
+    (_, _, end, _), _ = bq.plan(conn, SETTINGS, NOW, running)
+    assert end == NOW + datetime.timedelta(minutes=10)
+    bq.mark_done(conn, 1)
+    assert [it['id'] for it in bq.items(conn)] == [second]
+
+
+def test_orphaned_running_batch_is_requeued(conn):
+    item = bq.enqueue(conn, 'Palet', '10', '100', '')
+    bq.mark_running(conn, item, 99)          # rapor silinmiş
+    bq.requeue_orphans(conn)
+    assert bq.next_item(conn)['id'] == item
+    bq.remove(conn, item)
+    assert bq.items(conn) == []
@@ -0,0 +1,59 @@
+import json
+import sqlite3
+
+import checkpoint
+from control_clock import ControlClock
+from control_core import ControlCore
+from gpio_backend import CachedGPIO, FakeBackend
+
+
+def _db():
+    conn = sqlite3.connect(":memory:")
+    checkpoint.ensure_schema(conn)
+    return conn
+
+
+def _core(s, conn=None):
+    save = None if conn is None else (lambda state: checkpoint.save(conn, 5, state))
+    return ControlCore(lambda: s, CachedGPIO(FakeBackend()), clock=ControlClock(virtual=True), checkpointer=save)
+
+
+def test_save_load_delete():
+    conn = _db()
+    assert checkpoint.load(conn, 5) is None
+    checkpoint.save(conn, 5, {"version": checkpoint.VERSION, "step_no": 3})
+    checkpoint.save(conn, 5, {"version": checkpoint.VERSION, "step_no": 4})
+    assert checkpoint.load(conn, 5)["step_no"] == 4
+    assert conn.execute("SELECT COUNT(*) FROM RUN_CHECKPOINT").fetchone()[0] == 1
+    checkpoint.delete(conn, 5)
+    assert checkpoint.load(conn, 5) is None
+
+
+def test_incompatible_checkpoint_is_ignored():
+    conn = _db()
+    conn.execute("INSERT INTO RUN_CHECKPOINT VALUES (5, 1, '', ?)",
+                 (json.dumps({"version": checkpoint.VERSION + 1, "step_no": 1}),))
+    conn.execute("INSERT INTO RUN_CHECKPOINT VALUES (6, 1, '', 'bozuk')")
+    assert checkpoint.load(conn, 5) is None and checkpoint.load(conn, 6) is None
+
+
+def test_core_resumes_from_last_step(sim_settings):
+    s = sim_settings()
+    conn = _db()
+    first = _core(s, conn)
+    first.setup(virtual=True)
+    for _ in range(25):
+        first.virtual_step()
+    first.shutdown()
+
+    state = checkpoint.load(conn, 5)
+    assert state["step_no"] == 25
+    resumed = _core(s)
+    resumed.restore(state)
+    resumed.setup(virtual=True)
+    assert resumed.step_no == 25 and resumed.counter == first.counter
+    assert resumed.last_values == first.last_values
+    assert resumed.sim.snapshot() == first.sim.snapshot()
+    assert {k: v['phase'] for k, v in resumed.relays.snapshot().items()} == \
+           {k: v['phase'] for k, v in state['relays'].items()}
+    assert resumed.virtual_step() and resumed.step_no == 26
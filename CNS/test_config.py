@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+import ads1256_emulator
+
+ads1256_emulator.install()              # config sahte spidev/RPi.GPIO ile yüklenir
+
+import config                           # noqa: E402
+import gpio_backend                     # noqa: E402
+from gpio_backend import FakeBackend, HIGH, LOW    # noqa: E402
+
+DRDY = 17
+
+
+class RacingBackend(FakeBackend):
+    """DRDY seviyesi okunduktan hemen sonra düşer (okuma ile bekleme arasındaki kenar)."""
+
+    def __init__(self):
+        super().__init__()
+        self.fall_after_read = False
+
+    def read(self, pin):
+        level = super().read(pin)
+        if pin == DRDY and self.fall_after_read:
+            self.fall_after_read = False
+            self.write(pin, LOW)
+        return level
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    be = RacingBackend()
+    monkeypatch.setattr(config, 'DRDY_WAIT_MODE', 'edge')
+    config.GPIO.use_backend(be)
+    config.GPIO.setup(DRDY, config.GPIO.IN, pull_up_down=config.GPIO.PUD_UP)
+    yield be
+    config.GPIO.use_backend(gpio_backend.RPiGPIOBackend())
+
+
+def test_config_uses_the_shared_gpio_cache():
+    assert config.GPIO is gpio_backend.GPIO
+    assert not hasattr(config, '_pin_state')
+
+
+def test_digital_write_skips_redundant_levels(backend):
+    config.digital_write(22, HIGH)
+    writes = backend.writes
+    config.digital_write(22, HIGH)
+    assert backend.writes == writes
+    assert config.GPIO.level(22) == HIGH
+
+
+def test_wait_drdy_returns_at_once_when_low(backend):
+    backend.write(DRDY, LOW)
+    t0 = time.monotonic()
+    assert config.wait_drdy(DRDY, 500)
+    assert time.monotonic() - t0 < 0.1
+
+
+def test_wait_drdy_catches_edge_right_after_level_check(backend):
+    backend.fall_after_read = True
+    t0 = time.monotonic()
+    assert config.wait_drdy(DRDY, 2000)
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_wait_drdy_wakes_on_edge_and_times_out(backend):
+    threading.Timer(0.05, backend.write, (DRDY, LOW)).start()
+    assert config.wait_drdy(DRDY, 2000)
+    backend.write(DRDY, HIGH)
+    t0 = time.monotonic()
+    assert not config.wait_drdy(DRDY, 50)
+    assert 0.04 < time.monotonic() - t0 < 0.5
+
+
+def test_emulated_board_reads_through_edge_wait():
+    import ADS1256
+    adc = ADS1256.ADS1256()
+    assert adc.ADS1256_init() == 0
+    t0 = time.monotonic()
+    code = adc.ADS1256_GetChannalValue(0)
+    assert time.monotonic() - t0 < 0.5
+    volts = code * 5.0 / 0x7FFFFF
+    assert abs((volts / 0.01) - 4 - 25.0) < 0.1      # emülatör AIN0: 25°C
@@ -0,0 +1,52 @@
+import datetime
+import time
+
+import pytest
+
+import settings
+from control_clock import ControlClock
+from control_core import ControlCore
+from gpio_backend import CachedGPIO, FakeBackend
+
+
+def test_virtual_clock_only_moves_forward():
+    clock = ControlClock(virtual=True, start_datetime=datetime.datetime(2026, 1, 1, 8, 0, 0))
+    assert clock.monotonic() == 0.0
+    clock.advance_to(90.0)
+    clock.advance_to(30.0)
+    assert clock.monotonic() == 90.0
+    assert clock.now() == datetime.datetime(2026, 1, 1, 8, 1, 30)
+
+
+def test_mode_switch_keeps_time_continuous():
+    clock = ControlClock(virtual=True)
+    clock.advance_to(3600.0)
+    clock.set_virtual(False)
+    assert 3600.0 <= clock.monotonic() < 3601.0
+    time.sleep(0.01)
+    t = clock.monotonic()
+    assert t > 3600.0
+    clock.set_virtual(True)
+    assert clock.monotonic() >= t
+    with pytest.raises(RuntimeError):
+        ControlClock().advance_to(1.0)
+
+
+def _run(s, steps):
+    rows = []
+    core = ControlCore(lambda: s, CachedGPIO(FakeBackend()), on_step=lambda t, v, c: rows.append((t, v, c)),
+                       clock=ControlClock(virtual=True, start_datetime=datetime.datetime(2026, 1, 1, 8, 0, 0)))
+    core.setup(virtual=True)
+    for _ in range(steps):
+        assert core.virtual_step()
+    core.shutdown()
+    return rows, list(core.relays.transitions)
+
+
+def test_virtual_replay_is_repeatable(sim_settings):
+    s = sim_settings(SIM_SEED=8, SIM_START_TEMP=18.0, HEATER_CONTROL='hysteresis')
+    rows, transitions = _run(s, 120)
+    assert (rows, transitions) == _run(s, 120)
+    assert rows[0][0] == '2026-01-01 08:00:00' and rows[-1][0] == '2026-01-01 09:59:00'
+    # Rezistans denetleyicisi ve röle çevrimleri adımlar arasında kendi anlarında anahtarlanır
+    assert any(t % settings.DESIRED_SECONDS for t, _, _ in transitions)
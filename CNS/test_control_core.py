@@ -0,0 +1,65 @@
+import time
+
+from control_clock import ControlClock
+from control_core import ControlCore
+from gpio_backend import CachedGPIO, FakeBackend
+from safety_supervisor import TRIP_STALE
+from simulator import ISPM15Simulator
+
+
+def _core(s, sim=None):
+    gpio = CachedGPIO(FakeBackend())
+    core = ControlCore(lambda: s, gpio, sim=sim, clock=ControlClock(virtual=True))
+    core.setup(virtual=True)
+    return core, gpio
+
+
+def test_simulated_steps_stay_fresh(sim_settings):
+    s = sim_settings()
+    core, _ = _core(s)
+    for _ in range(30):
+        assert core.virtual_step()
+    assert not core.tripped()
+    temp, stamp = core.read_ambient_sample()
+    assert stamp == core.clock.monotonic()          # son adımın anı, okuma anı değil
+
+
+def test_frozen_simulated_ambient_trips_stale(sim_settings):
+    s = sim_settings()
+    core, gpio = _core(s)
+    for _ in range(5):
+        assert core.virtual_step()
+    core.relays.force('rez', True)
+    stamp = core.read_ambient_sample()[1]
+    # Ölçüm durur: saat ilerler ama adım atılmaz, ortam örneği donar
+    core.clock.advance_to(stamp + s.DESIRED_SECONDS + s.SAFETY_STALE_S - 0.5)
+    assert core.safety.tick() is None
+    core.clock.advance_to(stamp + s.DESIRED_SECONDS + s.SAFETY_STALE_S + 0.5)
+    assert core.read_ambient_sample()[1] == stamp
+    assert core.safety.tick() == TRIP_STALE
+    assert core.tripped() and core.safety.trips[0]['age_s'] > s.DESIRED_SECONDS
+    assert gpio.level(s.resistance_pin) == gpio.HIGH     # Active Low: HIGH=Kapalı
+    assert not core.virtual_step()
+
+
+def test_frozen_conversion_stamp_trips_stale(sim_settings):
+    s = sim_settings(SAFETY_STALE_S=0.05)
+    sim = ISPM15Simulator(s, seed=1, start_temp=20.0)
+    drdy = time.monotonic()
+    sim.ambient_sample = lambda: (sim.ambient_temperature(), drdy)     # DRDY takıldı
+    core, _ = _core(s, sim)
+    assert core.safety.sample_period_s == 0.0
+    assert core.safety.tick() is None
+    time.sleep(0.1)
+    assert core.safety.tick() == TRIP_STALE
+
+
+def test_relay_changes_are_reported_as_they_happen(sim_settings):
+    s = sim_settings()
+    changes = []
+    core = ControlCore(lambda: s, CachedGPIO(FakeBackend()), clock=ControlClock(virtual=True),
+                       on_relay=lambda name, state: changes.append((name, state)))
+    core.setup(virtual=True)
+    for _ in range(30):
+        core.virtual_step()
+    assert changes and changes == [(name, state) for _, name, state in core.relays.transitions]
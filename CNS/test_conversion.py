@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+
+from conversion import SensorConverter, load_calibration, REFERENCE_VOLTAGE, MAX_ADC_VALUE, SENSOR_NAMES
+
+CAL = {"default": {"offset": -4.0, "gain": 100.0},
+       "sensors": {"T2": {"offset": -3.5, "gain": 101.0}, "AT1": {"poly": [-4.1, 100.0, 0.15]}}}
+
+
+def _codes(volts):
+    return np.round(np.asarray(volts) * MAX_ADC_VALUE / REFERENCE_VOLTAGE).astype(np.int32)
+
+
+def test_matches_per_sensor_formulas():
+    volts = np.full(15, 0.6)
+    temps = SensorConverter(calibration=CAL).convert(_codes(volts))
+    v = _codes(0.6) * REFERENCE_VOLTAGE / MAX_ADC_VALUE
+    np.testing.assert_allclose(temps[[0, 1, 13]], [v * 100 - 4, v * 101 - 3.5, -4.1 + 100 * v + 0.15 * v * v])
+
+
+def test_converts_sample_blocks():
+    conv = SensorConverter(calibration=CAL)
+    block = _codes(np.linspace(0.2, 1.2, 4 * 15).reshape(4, 15))
+    out = conv.convert(block)
+    assert out.shape == (4, 15)
+    np.testing.assert_allclose(out[2], conv.convert(block[2]))
+
+
+def test_lut_is_close_to_polynomial():
+    exact = SensorConverter(calibration=CAL)
+    lut = SensorConverter(calibration=CAL, use_lut=True)
+    codes = _codes(np.random.default_rng(0).uniform(0.0, 1.5, (50, 15)))
+    np.testing.assert_allclose(lut.convert(codes), exact.convert(codes), atol=1e-3)
+
+
+def test_noise_uses_linear_term():
+    conv = SensorConverter(names=["T1"], calibration=CAL)
+    std = conv.convert_std([MAX_ADC_VALUE / REFERENCE_VOLTAGE * 0.001])   # 1 mV
+    np.testing.assert_allclose(std, [0.1])
+
+
+def test_calibration_file_and_fallback(tmp_path):
+    missing = load_calibration(str(tmp_path / "yok.json"))
+    assert missing["default"] == {"offset": -4.0, "gain": 100.0}
+    path = tmp_path / "calibration.json"
+    path.write_text(json.dumps({"sensors": {"T1": {"gain": 50.0}}}))
+    cal = load_calibration(str(path))
+    assert cal["default"]["gain"] == 100.0 and cal["sensors"]["T1"]["gain"] == 50.0
+    path.write_text("{")
+    assert load_calibration(str(path))["sensors"] == {}
+    assert SensorConverter(calibration=missing).names == SENSOR_NAMES
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from gpio_backend import CachedGPIO, FakeBackend, HIGH, LOW
+
+
+def test_redundant_writes_are_skipped():
+    backend = FakeBackend()
+    gpio = CachedGPIO(backend)
+    gpio.setup(5, gpio.OUT)
+    gpio.output(5, HIGH)
+    gpio.output(5, HIGH)
+    gpio.output(5, LOW)
+    assert backend.writes == 3          # kurulum + iki geçiş
+    assert gpio.skipped == 1
+    assert [lvl for _, pin, lvl in gpio.transitions(5)] == [LOW, HIGH, LOW]
+
+
+def test_setup_of_existing_output_keeps_level_unless_given():
+    backend = FakeBackend()
+    gpio = CachedGPIO(backend)
+    gpio.setup(7, gpio.OUT, initial=HIGH)
+    gpio.setup(7, gpio.OUT, initial=HIGH)
+    assert backend.writes == 1 and gpio.level(7) == HIGH
+
+
+def test_inputs_are_read_from_backend():
+    backend = FakeBackend()
+    gpio = CachedGPIO(backend)
+    gpio.setup(17, gpio.IN, pull_up_down=gpio.PUD_UP)
+    assert gpio.input(17) == HIGH
+    backend.write(17, LOW)
+    assert gpio.input(17) == LOW
+
+
+def test_edge_event_is_armed_once_and_set_on_falling_edge():
+    backend = FakeBackend()
+    gpio = CachedGPIO(backend)
+    gpio.setup(17, gpio.IN, pull_up_down=gpio.PUD_UP)
+    event = gpio.edge_event(17)
+    assert gpio.edge_event(17) is event
+    backend.write(17, LOW)
+    assert event.is_set()
+    event.clear()
+    backend.write(17, LOW)               # seviye zaten düşük: kenar yok
+    assert not event.is_set()
+
+
+def test_edge_event_unsupported_backend_raises():
+    class NoEdges:
+        name = 'noedge'
+
+        def setup_input(self, pin, pull_up=False):
+            pass
+
+    with pytest.raises(RuntimeError):
+        CachedGPIO(NoEdges()).edge_event(17)
+
+
+def test_use_backend_drops_cached_state():
+    gpio = CachedGPIO(FakeBackend())
+    gpio.output(3, HIGH)
+    gpio.edge_event(4)
+    fresh = FakeBackend()
+    gpio.use_backend(fresh)
+    assert gpio.level(3) is None and not gpio.edges
+    gpio.output(3, HIGH)
+    assert fresh.levels[3] == HIGH
+
+
+def test_concurrent_writers_do_not_lose_transitions():
+    gpio = CachedGPIO(FakeBackend())
+    gpio.setup(9, gpio.OUT)
+
+    def toggle():
+        for i in range(500):
+            gpio.output(9, i & 1)
+
+    threads = [threading.Thread(target=toggle) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    levels = [lvl for _, _, lvl in gpio.transitions(9)]
+    assert all(a != b for a, b in zip(levels, levels[1:]))
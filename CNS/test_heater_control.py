@@ -0,0 +1,87 @@
+import types
+
+import settings
+from heater_control import HeaterController, HysteresisStrategy, PIDStrategy, strategy_from_settings
+
+
+class Ambient:
+    def __init__(self, temp):
+        self.temp = temp
+
+    def __call__(self):
+        return self.temp
+
+
+def controller(strategy, temp, **kwargs):
+    ambient = Ambient(temp)
+    switches = []
+    ctl = HeaterController(ambient, switches.append, strategy, clock=lambda: 0.0, **kwargs)
+    return ctl, ambient, switches
+
+
+def test_shipped_default_is_off():
+    assert settings.HEATER_CONTROL == 'off'
+    assert strategy_from_settings(settings) is None
+
+
+def test_strategy_from_settings():
+    s = types.SimpleNamespace(RESISTANCE_MIN=80, RESISTANCE_MAX=90, HEATER_CONTROL='hysteresis')
+    assert isinstance(strategy_from_settings(s), HysteresisStrategy)
+    s.HEATER_CONTROL = 'pid'
+    pid = strategy_from_settings(s)
+    assert isinstance(pid, PIDStrategy) and pid.setpoint == 85
+
+
+def test_hysteresis_band():
+    h = HysteresisStrategy(80, 90)
+    assert h.update(85, 0) is True
+    assert h.update(90, 1) is False
+    assert h.update(85, 2) is False
+    assert h.update(80, 3) is True
+
+
+def test_min_dwell_holds_relay():
+    ctl, ambient, switches = controller(HysteresisStrategy(80, 90), 70.0, min_dwell_s=10.0)
+    assert ctl.tick(0.0) is True
+    ambient.temp = 95.0
+    assert ctl.tick(5.0) is True       # dwell dolmadı
+    assert ctl.tick(10.0) is False
+    assert switches == [True, False]
+
+
+def test_lost_reading_switches_off_immediately():
+    ctl, ambient, switches = controller(HysteresisStrategy(80, 90), 70.0, min_dwell_s=10.0)
+    ctl.tick(0.0)
+    ambient.temp = float('nan')
+    assert ctl.tick(1.0) is False
+    assert switches == [True, False]
+
+
+def test_take_duty_integrates_on_time():
+    ctl, ambient, _ = controller(HysteresisStrategy(80, 90), 70.0, min_dwell_s=0.0)
+    ctl.tick(0.0)
+    ambient.temp = 95.0
+    ctl.tick(15.0)
+    assert abs(ctl.take_duty(60.0) - 0.25) < 1e-9
+    assert ctl.take_duty(120.0) == 0.0
+
+
+def test_pid_output_clamped_without_windup():
+    pid = PIDStrategy(85.0, kp=0.1, ki=0.01)
+    for t in range(0, 1000, 10):
+        assert pid.update(20.0, float(t)) == 1.0
+    # Doygunlukta integral büyümediği için ölçüm set değerini geçince çıkış hemen düşer
+    assert pid.integral == 0.0
+    assert pid.update(90.0, 1010.0) == 0.0
+
+
+def test_pid_duty_window_rounds_short_slices():
+    pid = PIDStrategy(85.0, kp=0.02, ki=0.0)
+    ctl, ambient, _ = controller(pid, 80.0, window_s=30.0, min_dwell_s=10.0)
+    # Görev oranı 0.1: 3 sn açık dilim dwell süresinden kısa, pencere tamamen kapalı
+    assert not ctl.tick(0.0)
+    ambient.temp = 60.0
+    # Yeni pencere: 0.5 -> ilk 15 sn açık
+    assert ctl.tick(30.0) is True
+    assert ctl.tick(44.0) is True
+    assert ctl.tick(46.0) is False
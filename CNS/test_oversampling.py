@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import ads1256_emulator
+
+ads1256_emulator.install()              # oversampling, ADS1256 sürücüsünü import eder
+
+from oversampling import Oversampler, reduce_samples    # noqa: E402
+
+
+class FakeADC:
+    def __init__(self):
+        self.scans = 0
+
+    def ADS1256_ScanChannels(self, channels):
+        self.scans += 1
+        return [ch * 100 + self.scans for ch in channels], [float(self.scans)] * len(channels)
+
+    def ADS1256_StreamChannel(self, channel, count):
+        return [channel * 100 + i for i in range(count)]
+
+
+def test_reductions():
+    samples = np.array([[1.0, 10.0], [2.0, 10.0], [3.0, 10.0], [100.0, 10.0]])
+    values, std = reduce_samples(samples, 'mean')
+    np.testing.assert_allclose(values, [26.5, 10.0])
+    values, _ = reduce_samples(samples, 'median')
+    np.testing.assert_allclose(values, [2.5, 10.0])
+    values, _ = reduce_samples(samples, 'trimmed', trim=0.25)       # uçlardan birer örnek atılır
+    np.testing.assert_allclose(values, [2.5, 10.0])
+    assert std[1] == 0.0 and std[0] > 0
+    with pytest.raises(ValueError):
+        reduce_samples(samples, 'mode')
+
+
+def test_scan_mode_collects_count_rounds():
+    adc = FakeADC()
+    sampler = Oversampler(adc, count=4, method='mean')
+    values, std = sampler.read([2, 5])
+    assert adc.scans == 4
+    np.testing.assert_allclose(values, [202.5, 502.5])
+    assert sampler.last_stamps == [4.0, 4.0]
+
+
+def test_stream_mode_reads_each_channel_in_turn():
+    sampler = Oversampler(FakeADC(), count=8, method='median', mode='stream')
+    values, _ = sampler.read([1, 3])
+    np.testing.assert_allclose(values, [103.5, 303.5])
+    assert len(sampler.last_stamps) == 2 and sampler.last_stamps[0] <= sampler.last_stamps[1]
+
+
+def test_buffer_is_reused_for_same_shape():
+    sampler = Oversampler(FakeADC(), count=4)
+    first = sampler.collect([0, 1])
+    assert sampler.collect([2, 3]) is first
+    assert sampler.collect([0, 1, 2]) is not first
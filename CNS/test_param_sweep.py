@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+import settings
+from param_sweep import parse_grid, combinations, summarize, run_one
+
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.py')
+
+
+def test_parse_grid_values():
+    grid = parse_grid(['RESISTANCE_MAX=88,92.5', 'HEATER_CONTROL=pid,hysteresis', 'SIM_PLANT_MODEL=""'])
+    assert grid == {'RESISTANCE_MAX': [88, 92.5], 'HEATER_CONTROL': ['pid', 'hysteresis'],
+                    'SIM_PLANT_MODEL': ['']}
+    assert len(combinations(grid)) == 4
+    with pytest.raises(ValueError):
+        parse_grid(['RESISTANCE_MAX'])
+
+
+def _result(value, seed, cycle_h, tripped=None, max_ambient=95.0, resets=0):
+    return {'params': {'X': value}, 'seed': seed, 'finished': cycle_h is not None, 'tripped': tripped,
+            'reached_h': 1.0, 'cycle_h': cycle_h, 'duty': 0.5, 'resets': resets,
+            'max_ambient': max_ambient, 'safe_limit': 110.0}
+
+
+def test_summarize_ranks_safe_finished_fastest_first():
+    results = [_result(1, 0, 9.0), _result(1, 1, 11.0),
+               _result(2, 0, 6.0), _result(2, 1, 6.0, max_ambient=112.0),     # hızlı ama güvensiz
+               _result(3, 0, 8.0), _result(3, 1, None),                        # bir seed bitmedi
+               _result(4, 0, 9.5, resets=2), _result(4, 1, 10.5, resets=2)]
+    rows = summarize(results, ['X'])
+    assert [r['params']['X'] for r in rows[:2]] == [1, 4]
+    assert rows[0]['cycle_h'] == 10.0 and rows[0]['runs'] == 2
+    assert not next(r for r in rows if r['params']['X'] == 2)['safe']
+
+
+def test_run_one_is_repeatable(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'settings', settings)      # load_settings modülü değiştirir
+    task = (SETTINGS_PATH, {'HEATER_CONTROL': 'hysteresis'}, 3, 18.0, None, 1.0)
+    first = run_one(task)
+    assert first == run_one(task)
+    assert first['tripped'] is None and not first['finished']
+    assert 0.0 < first['duty'] <= 1.0 and first['max_ambient'] > 18.0
@@ -0,0 +1,109 @@
+import datetime
+import sqlite3
+
+import numpy as np
+import pytest
+
+import plant_model
+from plant_model import PlantModel, GAP_SLOW
+
+TRUE_ILETIM = [0.03 + 0.002 * i for i in range(13)]
+
+
+def _create(path):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "REPORT" ("ID" INTEGER UNIQUE, "START_TIME" DATETIME, "END_TIME" DATETIME)')
+    cols = ", ".join([f'"T{i}" TEXT' for i in range(1, 14)] + ['"AT1" TEXT', '"AT2" TEXT', '"STEPTIME" TEXT'])
+    conn.execute(f'CREATE TABLE "REPORT_DETAILS" ("ID" INTEGER PRIMARY KEY, "REPORT_ID" INT, {cols})')
+    return conn
+
+
+def _add_report(conn, rid, outside, heat_min=80, cool_min=20, end='2026-01-01 12:00:00',
+                start='2026-01-01 08:00:00'):
+    """Bilinen katsayılarla 1 dk adımlı rapor: önce ısınma, sonra soğuma."""
+    true = PlantModel(heat_base=2.0, heat_sensitivity=0.02, cool_rate=0.5, iletim=TRUE_ILETIM)
+    conn.execute("INSERT INTO REPORT VALUES (?, ?, ?)", (rid, start, end))
+    t0 = datetime.datetime(2026, 1, 1, 8, 0, 0)
+    ambient, probes = float(outside), np.full(13, float(outside))
+    iletim = np.asarray(TRUE_ILETIM)
+    for k in range(heat_min + cool_min):
+        stamp = (t0 + datetime.timedelta(minutes=k)).strftime('%Y-%m-%d %H:%M:%S')
+        conn.execute("INSERT INTO REPORT_DETAILS VALUES (NULL,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                     (rid, *[repr(float(p)) for p in probes], repr(ambient), repr(ambient), stamp))
+        fark = ambient - probes
+        probes = probes + np.where(fark >= GAP_SLOW, iletim * fark * (1.0 + fark / 100.0), 0.0)
+        ambient += true.heating_rate(outside) if k < heat_min else -true.cool_rate
+    conn.commit()
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "ovens.sqlite")
+    conn = _create(path)
+    _add_report(conn, 1, 15.0)
+    _add_report(conn, 2, 25.0)
+    conn.execute("INSERT INTO REPORT VALUES (3, '2026-01-02 08:00:00', 'IP')")    # süren parti
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_fit_recovers_known_coefficients(db, tmp_path):
+    model, added = plant_model.update([db], str(tmp_path / "model.json"))
+    assert added == 2 and model.reports == 2
+    assert model.heat_base == pytest.approx(2.0, rel=1e-6)
+    assert model.heat_sensitivity == pytest.approx(0.02, rel=1e-6)
+    assert model.cool_rate == pytest.approx(0.5, rel=1e-6)
+    np.testing.assert_allclose(model.iletim, TRUE_ILETIM, rtol=1e-6)
+
+
+def test_update_is_incremental(db, tmp_path):
+    out = str(tmp_path / "model.json")
+    plant_model.update([db], out)
+    model, added = plant_model.update([db], out)
+    assert added == 0 and model.reports == 2
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE REPORT SET END_TIME='2026-01-02 12:00:00' WHERE ID=3")
+    _add_report(conn, 4, 20.0)
+    conn.close()
+    model, added = plant_model.update([db], out)
+    assert added == 2 and model.reports == 4          # rapor 3 satırsız: sayılır ama katkısı yok
+    assert model.heat_base == pytest.approx(2.0, rel=1e-6)
+    assert plant_model.load(out).to_dict() == model.to_dict()
+    _, added = plant_model.update([db], out, full=True)
+    assert added == 4
+
+
+def test_recycled_ids_and_same_named_dbs_are_new_reports(db, tmp_path):
+    out = str(tmp_path / "model.json")
+    plant_model.update([db], out)
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM REPORT_DETAILS WHERE REPORT_ID=2")
+    conn.execute("DELETE FROM REPORT WHERE ID=2")
+    _add_report(conn, 2, 20.0, start='2026-01-03 08:00:00')          # ID yeniden kullanıldı
+    conn.close()
+    model, added = plant_model.update([db], out)
+    assert added == 1 and model.reports == 3
+
+    other = tmp_path / "yedek"
+    other.mkdir()
+    conn = _create(str(other / "ovens.sqlite"))                       # aynı dosya adı, başka klasör
+    _add_report(conn, 1, 15.0)
+    conn.close()
+    model, added = plant_model.update([db, str(other / "ovens.sqlite")], out)
+    assert added == 1 and model.reports == 4
+
+
+def test_missing_data_keeps_defaults():
+    model = plant_model.solve(plant_model._empty_stats())
+    assert model.to_dict() == PlantModel().to_dict()
+
+
+def test_predict_heats_ambient_and_probes():
+    model = PlantModel(iletim=TRUE_ILETIM)
+    ambient, probes = model.predict(60.0, [30.0] * 13, duty=1.0, minutes=10)
+    assert ambient == pytest.approx(60.0 + 10 * model.heating_rate(20.0))
+    assert (probes > 30.0).all()
+    ambient, _ = model.predict(60.0, [30.0] * 13, duty=0.0, minutes=10)
+    assert ambient == pytest.approx(60.0 - 10 * model.cool_rate)
@@ -0,0 +1,89 @@
+import datetime
+import sqlite3
+import types
+
+import pytest
+
+import recipes
+from recipes import RecipeEngine
+
+T0 = datetime.datetime(2026, 1, 1, 8, 0, 0)
+BASE = types.SimpleNamespace(RESISTANCE_MIN=80, RESISTANCE_MAX=90, DESIRED_ENGINE_MUNITE=2,
+                             ENGINE_RESTING_MUNITE=1, DESIRED_TEMP=56)
+
+
+def _engine(name="ISPM15"):
+    conn = sqlite3.connect(":memory:")
+    recipes.ensure_schema(conn)
+    recipe = recipes.load_recipe(conn, name)
+    conn.close()
+    return RecipeEngine(recipe)
+
+
+def _at(minutes):
+    return T0 + datetime.timedelta(minutes=minutes)
+
+
+def test_default_recipe_bands():
+    eng = _engine()
+    assert [p.get("band") for p in eng.phases] == [[98.0, 104.0], [83.0, 88.0], [76.0, 80.0]]
+
+
+def test_phase_overrides_settings():
+    eng = _engine()
+    s = eng.apply(BASE)
+    assert (s.RESISTANCE_MIN, s.RESISTANCE_MAX) == (98.0, 104.0)
+    assert (s.DESIRED_ENGINE_MUNITE, s.ENGINE_RESTING_MUNITE) == (3, 1)
+    assert s.HEATER_PID_SETPOINT == 101.0 and s.DESIRED_TEMP == 56
+
+
+def test_phases_advance_on_conditions():
+    eng = _engine()
+    assert not eng.update(_at(0), 100.0, 20.0, 56.0)
+    assert eng.update(_at(30), 100.0, 45.0, 56.0) and eng.name == "APPROACH"
+    assert not eng.update(_at(60), 85.0, 52.0, 56.0)
+    assert eng.update(_at(90), 85.0, 53.0, 56.0) and eng.name == "HOLD"
+    assert not eng.update(_at(900), 78.0, 60.0, 56.0)           # son faz parti bitene kadar
+
+
+def test_shock_phase_ends_on_time_limit():
+    eng = _engine()
+    eng.update(_at(0), 100.0, 20.0, 56.0)
+    assert not eng.update(_at(239), 100.0, 30.0, 56.0)
+    assert eng.update(_at(240), 100.0, 30.0, 56.0) and eng.index == 1
+
+
+def test_several_conditions_met_in_one_step_skip_phases():
+    eng = _engine()
+    eng.update(_at(0), 100.0, 20.0, 56.0)
+    assert eng.update(_at(10), 100.0, 55.0, 56.0) and eng.name == "HOLD"
+
+
+def test_restore_keeps_elapsed_phase_time():
+    eng = _engine()
+    eng.update(_at(0), 100.0, 20.0, 56.0)
+    snap = eng.snapshot(_at(200))
+    resumed = _engine()
+    resumed.restore(snap)
+    # Kesinti bir saat sürdü; kalan 40 dk'dan sonra şok fazı biter
+    assert not resumed.update(_at(260), 100.0, 30.0, 56.0)
+    assert resumed.update(_at(300), 100.0, 30.0, 56.0)
+
+
+def test_validate_rejects_bad_definitions():
+    with pytest.raises(ValueError):
+        recipes.validate({"phases": []})
+    with pytest.raises(ValueError):
+        recipes.validate({"phases": [{"band": [90, 80]}]})
+    with pytest.raises(ValueError):
+        recipes.validate({"phases": [{"fan": [1, 2, 3]}]})
+
+
+def test_report_keeps_recipe_copy():
+    conn = sqlite3.connect(":memory:")
+    recipes.ensure_schema(conn)
+    recipe = recipes.load_recipe(conn, "ISPM15")
+    recipes.attach_to_report(conn, 7, recipe)
+    recipes.save_recipe(conn, "ISPM15", {"phases": [{"name": "HOLD", "band": [70, 75]}]})
+    assert recipes.report_recipe(conn, 7)["definition"] == recipe["definition"]
+    assert recipes.load_active(conn, types.SimpleNamespace(ACTIVE_RECIPE="YOK")) is None
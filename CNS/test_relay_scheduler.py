@@ -0,0 +1,135 @@
+import threading
+
+from gpio_backend import CachedGPIO, FakeBackend, HIGH, LOW
+from relay_scheduler import RelayScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _scheduler(**kwargs):
+    clock = Clock()
+    gpio = CachedGPIO(FakeBackend())
+    return RelayScheduler(gpio, clock=clock, **kwargs), clock, gpio
+
+
+def _run_until(sched, clock, end):
+    # Sanal saat: olaylar zaman sırasıyla, planlanan anlarında işlenir
+    while True:
+        due = sched.next_due()
+        if due is None or due > end:
+            break
+        clock.t = due
+        sched.run_due(due)
+    clock.t = end
+
+
+def test_duty_cycle_switches_at_planned_times():
+    sched, clock, gpio = _scheduler()
+    sched.add_relay('fan', 20, [(True, 120), (False, 60)])
+    sched.start(threaded=False)
+    assert gpio.level(20) == LOW                     # Active Low: LOW=Açık
+    _run_until(sched, clock, 400)
+    assert [(t, s) for t, _, s in sched.transitions] == [(0.0, True), (120.0, False), (180.0, True),
+                                                        (300.0, False), (360.0, True)]
+    assert gpio.level(20) == LOW
+
+
+def test_transitions_beyond_one_wheel_turn():
+    sched, clock, _ = _scheduler(tick_s=1.0, slots=8)
+    sched.add_relay('rez', 16, [(True, 30), (False, 20)])
+    sched.start(threaded=False)
+    _run_until(sched, clock, 100)
+    assert [t for t, _, _ in sched.transitions] == [0.0, 30.0, 50.0, 80.0, 100.0]
+
+
+def test_profile_change_reschedules_current_phase():
+    sched, clock, _ = _scheduler()
+    sched.add_relay('fan', 20, [(True, 120), (False, 60)])
+    sched.start(threaded=False)
+    _run_until(sched, clock, 50)
+    sched.set_profile('fan', [(True, 90), (False, 60)])
+    assert sched.next_due() == 90.0
+    sched.set_profile('fan', [(True, 30), (False, 60)])     # süre geçmiş: ilk işlemede biter
+    sched.run_due(clock.t)
+    assert sched.state('fan') is False
+    assert sched.next_due() == 90.0                         # kapalı faz planlanan 30. saniyeden sayılır
+
+
+def test_force_stops_profile_and_release_restarts_it():
+    sched, clock, gpio = _scheduler()
+    sched.add_relay('rez', 16, [(True, 60), (False, 60)])
+    sched.start(threaded=False)
+    sched.force('rez', False)
+    _run_until(sched, clock, 300)
+    assert sched.state('rez') is False and sched.next_due() is None
+    sched.release('rez')
+    assert sched.state('rez') is True and sched.next_due() == 360.0
+
+
+def test_interlock_overrides_profile_and_force():
+    sched, clock, gpio = _scheduler()
+    sched.add_relay('rez', 16, [(True, 60), (False, 60)])
+    sched.add_relay('fan', 20, [(True, 60), (False, 60)])
+    sched.start(threaded=False)
+    sched.interlock({'rez': False, 'fan': False})
+    assert gpio.level(16) == HIGH and gpio.level(20) == HIGH
+    sched.force('rez', True)
+    _run_until(sched, clock, 200)
+    assert not sched.state('rez') and not sched.state('fan')
+    sched.release_interlock()
+    assert sched.state('fan') is True
+
+
+def test_interlock_wins_over_a_stuck_workers_pending_apply():
+    sched, clock, gpio = _scheduler(tick_s=0.01)
+    sched.add_relay('rez', 16, [(True, 60), (False, 60)])
+    sched.start(threaded=False)
+    holding, go = threading.Event(), threading.Event()
+
+    def stuck_apply():
+        # İş parçacığı interlock'tan önce 'açık' kararını vermiş, yazmayı bekliyor
+        with sched._cond:
+            holding.set()
+            go.wait()
+            gpio.output(16, LOW)
+
+    worker = threading.Thread(target=stuck_apply)
+    worker.start()
+    holding.wait()
+    sched.interlock({'rez': False})
+    assert gpio.level(16) == HIGH               # kilit beklenmeden güvenli
+    go.set()
+    worker.join()
+    for t in threading.enumerate():             # kilit bırakılınca yeniden uygulanır
+        if t.name == 'relay-interlock':
+            t.join()
+    assert gpio.level(16) == HIGH and not sched.state('rez')
+
+
+def test_snapshot_restore_keeps_elapsed_time():
+    sched, clock, _ = _scheduler()
+    sched.add_relay('fan', 20, [(True, 120), (False, 60)])
+    sched.start(threaded=False)
+    _run_until(sched, clock, 150)
+    snap = sched.snapshot()['fan']
+    assert snap['phase'] == 1 and snap['elapsed'] == 30.0
+
+    other, clock2, _ = _scheduler()
+    other.add_relay('fan', 20, [(True, 120), (False, 60)])
+    other.start(threaded=False)
+    other.restore('fan', snap)
+    assert other.state('fan') is False and other.next_due() == 30.0
+
+
+def test_stop_turns_everything_off():
+    sched, clock, gpio = _scheduler()
+    sched.add_relay('fan', 20, [(True, 120), (False, 60)])
+    sched.start(threaded=False)
+    sched.stop(all_off=True)
+    assert gpio.level(20) == HIGH and sched.next_due() is None
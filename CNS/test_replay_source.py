@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+
+from replay_source import load_rows, ReplaySource, PipelineMonitor, MAX_GAP_S
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def tick(self, dt):
+        self.t += dt
+
+
+def _db(times):
+    conn = sqlite3.connect(":memory:")
+    cols = ", ".join([f"T{i} TEXT" for i in range(1, 14)] + ["AT1 TEXT", "AT2 TEXT", "STEPTIME TEXT", "STEPNO TEXT"])
+    conn.execute(f"CREATE TABLE Report_Details (ID INTEGER PRIMARY KEY, REPORT_ID INTEGER, {cols})")
+    for i, t in enumerate(times):
+        conn.execute("INSERT INTO Report_Details VALUES (NULL,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                     (7, *[str(50 + i)] * 13, "80", None, t, str(len(times) - i)))
+    return conn
+
+
+def test_load_rows_offsets_and_caps_gaps():
+    conn = _db(["2026-01-01 08:00:00", "2026-01-01 08:01:00", "2026-01-01 12:01:00"])
+    rows = load_rows(conn, 7)
+    assert [r[0] for r in rows] == [0.0, 60.0, 60.0 + MAX_GAP_S]
+    assert rows[1][1][0] == 51.0 and rows[0][1][14] == 0.0   # boş değer 0 okunur
+    assert [r[2] for r in rows] == [3, 2, 1]
+    assert load_rows(conn, 8) == []
+
+
+def test_replay_without_delay_emits_every_row():
+    rows = [(0.0, [1.0] * 15, 3), (60.0, [2.0] * 15, 2), (120.0, [3.0] * 15, 1)]
+    out = []
+    src = ReplaySource(rows, speed=0, target_count=10)
+    assert src.run(threading.Event(), threading.Event(), lambda t, v, c: out.append((t, v[0], c)))
+    assert [o[2] for o in out] == [7, 8, 9]
+    assert src.sent == 3
+
+
+def test_replay_stops_on_request():
+    rows = [(0.0, [1.0] * 15, 2), (3600.0, [2.0] * 15, 1)]
+    stop = threading.Event()
+    out = []
+
+    def emit(t, v, c):
+        out.append(c)
+        stop.set()
+
+    assert not ReplaySource(rows, speed=1).run(stop, threading.Event(), emit)
+    assert len(out) == 1
+
+
+def test_monitor_stages_and_bottleneck():
+    clock = Clock()
+    mon = PipelineMonitor(clock=clock)
+    for _ in range(3):
+        mon.emitted()
+    for _ in range(3):
+        clock.tick(0.001)
+        mon.received()
+        clock.tick(0.002)
+        mon.lap('ui')
+        clock.tick(0.010)
+        mon.lap('db')
+        mon.handled()
+    r = mon.report()
+    assert r['rows'] == 3 and r['bottleneck'] == 'db'
+    assert abs(r['stages']['db']['mean_ms'] - 10.0) < 1e-6
+    assert r['max_backlog'] == 2
+    assert "Darboğaz: db" in mon.format()
@@ -0,0 +1,65 @@
+import math
+import threading
+import time
+
+from safety_supervisor import SafetySupervisor, TRIP_OVER_TEMP, TRIP_STALE, TRIP_NO_READING
+
+
+class Probe:
+    def __init__(self, temp=60.0, stamp=0.0):
+        self.sample = (temp, stamp)
+        self.error = None
+
+    def __call__(self):
+        if self.error:
+            raise self.error
+        return self.sample
+
+
+def _supervisor(probe, **kwargs):
+    trips = []
+    sup = SafetySupervisor(probe, trips.append, max_temp=110.0, stale_s=2.0, clock=lambda: 0.0, **kwargs)
+    return sup, trips
+
+
+def test_over_temperature_trips_once_and_latches():
+    probe = Probe()
+    sup, trips = _supervisor(probe)
+    assert sup.tick(1.0) is None
+    probe.sample = (110.0, 1.0)
+    assert sup.tick(1.1) == TRIP_OVER_TEMP
+    assert sup.tick(1.2) is None and trips == [TRIP_OVER_TEMP]
+    sup.reset()
+    probe.sample = (60.0, 1.2)
+    assert sup.tick(1.3) is None and sup.tripped is None
+
+
+def test_stale_limit_includes_sample_period():
+    probe = Probe(stamp=0.0)
+    sup, _ = _supervisor(probe, sample_period_s=60.0)
+    assert sup.tick(61.9) is None
+    assert sup.tick(62.1) == TRIP_STALE
+    assert sup.trips[0]['age_s'] == 62.1
+
+
+def test_missing_stamp_is_stale():
+    sup, _ = _supervisor(Probe(stamp=None))
+    assert sup.tick(0.0) == TRIP_STALE
+
+
+def test_bad_readings_trip():
+    for sample, error in ((None, None), ((math.nan, 0.0), None), ((60.0, 0.0), OSError("spi"))):
+        probe = Probe()
+        probe.sample, probe.error = sample, error
+        sup, trips = _supervisor(probe)
+        assert sup.tick(0.5) == TRIP_NO_READING and trips == [TRIP_NO_READING]
+
+
+def test_thread_checks_at_rate():
+    seen = threading.Event()
+    sup = SafetySupervisor(lambda: (60.0, time.monotonic()), lambda reason: seen.set(), rate_hz=50)
+    sup.start()
+    time.sleep(0.2)
+    sup.stop()
+    st = sup.stats()
+    assert st['checks'] >= 5 and st['tripped'] is None and not seen.is_set()
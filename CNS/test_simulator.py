@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+
+import settings
+from simulator import ISPM15Simulator, ISPM15BatchSimulator, NOISE_BLOCK
+
+MASK = [True] * 15
+
+
+def test_batch_oven_stream_does_not_depend_on_batch_size():
+    small, _ = ISPM15BatchSimulator(3, settings, seed=5).run(NOISE_BLOCK + 10, MASK, 56.0)
+    large, _ = ISPM15BatchSimulator(8, settings, seed=5).run(NOISE_BLOCK + 10, MASK, 56.0)
+    np.testing.assert_array_equal(small, large[:, :3])
+
+
+def test_batch_ovens_have_independent_noise():
+    sim = ISPM15BatchSimulator(2, settings, seed=1, start_temp=18.0)
+    outs, _ = sim.run(5, MASK, 56.0)
+    assert not np.array_equal(outs[:, 0], outs[:, 1])
+
+
+def test_batch_same_seed_same_result_and_target_signal():
+    a_out, a_hit = ISPM15BatchSimulator(2, settings, seed=3, start_temp=20.0).run(600, MASK, 56.0)
+    b_out, b_hit = ISPM15BatchSimulator(2, settings, seed=3, start_temp=20.0).run(600, MASK, 56.0)
+    np.testing.assert_array_equal(a_out, b_out)
+    np.testing.assert_array_equal(a_hit, b_hit)
+    assert a_hit[-1].all() and not a_hit[0].any()
+
+
+def test_batch_inactive_sensors_read_zero():
+    mask = [True] * 12 + [False, True, False]
+    out, _ = ISPM15BatchSimulator(2, settings, seed=0).calculate_step(mask, 56.0)
+    assert (out[:, 12] == 0.0).all() and (out[:, 14] == 0.0).all() and (out[:, 13] != 0.0).all()
+
+
+def test_snapshot_restore_continues_identically():
+    a = ISPM15Simulator(settings, seed=11, start_temp=18.0)
+    for _ in range(40):
+        a.calculate_step(MASK, 56.0)
+    a.sogutma_modu = True
+    snap = json.loads(json.dumps(a.snapshot()))     # kontrol noktası JSON olarak saklanır
+    expected = [a.calculate_step(MASK, 56.0) for _ in range(40)]
+
+    b = ISPM15Simulator(settings, seed=99, start_temp=25.0)
+    b.restore(snap)
+    assert b.sogutma_modu and b.drop_rate == a.drop_rate
+    assert [p["iletim"] for p in b.sensor_states] == [p["iletim"] for p in a.sensor_states]
+    assert [b.calculate_step(MASK, 56.0) for _ in range(40)] == expected
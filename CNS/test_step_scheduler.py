@@ -0,0 +1,70 @@
+import pytest
+
+from step_scheduler import StepScheduler
+
+
+class Clock:
+    """wait() uyumak yerine saati ilerletir; her adımın işi 'work' kadar sürer."""
+
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+    def wait(self, seconds):
+        self.t += seconds
+        return False
+
+
+def test_deadlines_do_not_drift_with_step_work():
+    clock = Clock()
+    sched = StepScheduler(60, clock=clock)
+    sched.start()
+    for _ in range(5):
+        assert sched.wait(clock)
+        clock.t += 7.5                     # ölçüm + veritabanı + arayüz
+    assert sched.deadline() == 100.0 + 5 * 60
+    assert sched.stats()['steps'] == 5 and sched.stats()['lateness_max_s'] == 0.0
+
+
+def test_overrun_skips_missed_deadlines_on_the_grid():
+    clock = Clock()
+    sched = StepScheduler(10, clock=clock)
+    sched.start()
+    sched.wait(clock)
+    clock.t += 35                          # 110 ve 120 kaçırıldı, adım 130'a 5 sn geç
+    sched.wait(clock)
+    st = sched.stats()
+    assert st['missed'] == 2 and st['lateness_max_s'] == pytest.approx(5.0)
+    assert sched.deadline() == 140.0
+
+
+def test_resume_after_pause_is_not_counted_late():
+    clock = Clock()
+    sched = StepScheduler(10, clock=clock)
+    sched.start()
+    sched.wait(clock)
+    clock.t += 95
+    sched.resume()
+    assert sched.paused_slots == 9 and sched.deadline() == 200.0
+    sched.wait(clock)
+    assert sched.stats()['missed'] == 0
+
+
+def test_period_change_rebuilds_grid_from_next_deadline():
+    sched = StepScheduler(60, clock=lambda: 0.0)
+    assert [sched.take() for _ in range(3)] == [0.0, 60.0, 120.0]
+    sched.set_period(30)
+    assert [sched.take() for _ in range(2)] == [180.0, 210.0]
+
+
+def test_stop_interrupts_wait():
+    class Stop:
+        def wait(self, seconds):
+            return True
+
+    sched = StepScheduler(60, clock=lambda: 0.0)
+    sched.start(now=0.0)
+    sched.take()
+    assert not sched.wait(Stop())
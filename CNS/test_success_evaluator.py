@@ -0,0 +1,70 @@
+import settings
+from success_evaluator import (SuccessEvaluator, DEFAULT_RULES, ORIGINAL_RULES, RULE_TEMPERATURE, RULE_MAX_DIFF,
+                               RULE_AMBIENT_HIGHEST, REASON_BELOW_TARGET, REASON_AMBIENT_NOT_HIGHEST, REASON_FAST_CHANGE)
+
+MASK = [True] * 15
+RULES = (RULE_TEMPERATURE, RULE_MAX_DIFF)
+
+
+def reading(probe, ambient):
+    return [probe] * 13 + [ambient] * 2
+
+
+def test_default_rules_match_settings():
+    assert list(DEFAULT_RULES) == list(settings.SUCCESS_RULES)
+
+
+def test_default_counter_follows_target_signal():
+    ev = SuccessEvaluator(56.0, 3, 1.0, MASK)
+    assert ev.update(reading(50.0, 40.0), target_hit=True) == 1      # simülasyon programındaki gibi
+    assert ev.update(reading(58.0, 70.0), target_hit=True) == 2
+    assert ev.update(reading(58.0, 70.0), target_hit=False) == 0
+    assert ev.reason == REASON_BELOW_TARGET
+    assert set(ORIGINAL_RULES) == {RULE_TEMPERATURE, RULE_AMBIENT_HIGHEST, RULE_MAX_DIFF}
+
+
+def test_counts_steps_above_target():
+    ev = SuccessEvaluator(56.0, 3, 1.0, MASK, rules=RULES)
+    assert ev.update(reading(55.0, 70.0)) == 0
+    assert ev.reason == REASON_BELOW_TARGET
+    assert ev.update(reading(56.0, 70.0)) == 1
+    assert ev.update(reading(56.5, 70.0)) == 2
+    assert not ev.done()
+    assert ev.update(reading(57.0, 70.0)) == 3
+    assert ev.done() and ev.remaining == 0
+
+
+def test_zero_reading_is_ignored_and_inactive_sensors_masked():
+    mask = [True] * 12 + [False] + [True, True]
+    ev = SuccessEvaluator(56.0, 10, 5.0, mask)
+    vals = reading(60.0, 70.0)
+    vals[0] = 0.0     # kopuk kanal
+    vals[12] = 20.0   # pasif sensör
+    assert ev.update(vals) == 1
+
+
+def test_fast_change_resets_counter_and_counts_reason():
+    ev = SuccessEvaluator(56.0, 10, 1.0, MASK, rules=RULES)
+    ev.update(reading(60.0, 70.0))
+    ev.update(reading(60.5, 70.0))
+    assert ev.update(reading(62.0, 70.0)) == 0
+    assert ev.reason == REASON_FAST_CHANGE
+    assert ev.resets == {REASON_FAST_CHANGE: 1}
+
+
+def test_ambient_highest_only_when_selected():
+    vals = reading(60.0, 59.0)
+    assert SuccessEvaluator(56.0, 10, 5.0, MASK).update(vals) == 1
+    ev = SuccessEvaluator(56.0, 10, 5.0, MASK, rules=DEFAULT_RULES + (RULE_AMBIENT_HIGHEST,))
+    assert ev.update(vals) == 0
+    assert ev.reason == REASON_AMBIENT_NOT_HIGHEST
+
+
+def test_snapshot_restore_continues_counting():
+    ev = SuccessEvaluator(56.0, 10, 1.0, MASK, rules=RULES)
+    ev.update(reading(60.0, 70.0))
+    ev.update(reading(60.5, 70.0))
+    other = SuccessEvaluator(56.0, 10, 1.0, MASK, rules=RULES)
+    other.restore(ev.snapshot())
+    assert other.update(reading(61.0, 70.0)) == 3
+    assert other.update(reading(63.0, 70.0)) == 0
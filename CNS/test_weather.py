@@ -0,0 +1,72 @@
+import json
+import threading
+
+from weather import WeatherLookup, DEFAULT_FALLBACK, provider_from_name
+
+
+class Clock:
+    def __init__(self, t=1000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def test_fallback_is_fixed_without_cache_or_provider():
+    lk = WeatherLookup(provider=None)
+    assert lk.temperature() == DEFAULT_FALLBACK == 18.0
+    assert WeatherLookup(provider=None, fallback=12.5).temperature() == 12.5
+
+
+def test_off_provider_never_touches_network():
+    assert provider_from_name('off') is None
+    assert provider_from_name('') is None
+
+
+def test_unknown_provider_falls_back_to_offline():
+    assert provider_from_name('yok_modul.sicaklik') is None
+    assert provider_from_name('weather.yok_fonksiyon') is None
+    assert provider_from_name('onlin') is None
+    assert provider_from_name('weather.online_temperature') is not None
+
+
+def test_returns_cached_value_and_refreshes_in_background(tmp_path):
+    path = str(tmp_path / "weather.json")
+    clock = Clock()
+    with open(path, "w") as f:
+        json.dump({'temp': 9.0, 'time': clock.t - 7200}, f)
+    release = threading.Event()
+
+    def slow_provider():
+        release.wait(5)
+        return 21.0
+
+    lk = WeatherLookup(slow_provider, path, ttl_s=3600, clock=clock)
+    # Önbellek eski: değer hemen döner, yenileme arka planda bekler
+    assert lk.temperature() == 9.0
+    assert lk.thread is not None and lk.thread.is_alive()
+    release.set()
+    lk.thread.join(5)
+    assert lk.temperature() == 21.0
+    with open(path) as f:
+        assert json.load(f)['temp'] == 21.0
+
+
+def test_fresh_cache_skips_provider(tmp_path):
+    path = str(tmp_path / "weather.json")
+    clock = Clock()
+    with open(path, "w") as f:
+        json.dump({'temp': 9.0, 'time': clock.t - 60}, f)
+    calls = []
+    lk = WeatherLookup(lambda: calls.append(1) or 30.0, path, ttl_s=3600, clock=clock)
+    assert lk.temperature() == 9.0
+    assert lk.thread is None and not calls
+
+
+def test_provider_error_keeps_fallback():
+    def broken():
+        raise RuntimeError("ağ yok")
+
+    lk = WeatherLookup(broken)
+    assert lk.refresh() is None
+    assert lk.temperature() == DEFAULT_FALLBACK
@@ -0,0 +1,171 @@
+"""
+Simülasyon başlangıcı için dış ortam sıcaklığı; ağı hiç beklemez.
+
+current_temperature() her zaman hemen döner:
+
+    1. önbellek (bellek ya da WEATHER_CACHE dosyası) WEATHER_CACHE_TTL_MIN
+       dakikadan yeniyse onun değeri
+    2. eskiyse yine önbellekteki son değer, yoksa yedek değer
+       (WEATHER_FALLBACK_TEMP, varsayılan 18°C)
+
+ve önbellek eskiyse arka planda tek bir yenileme başlatır. Sağlayıcı
+değiştirilebilir: WEATHER_PROVIDER ayarı 'online' (IP konumu + Open-Meteo),
+'off' (ağ yok, yalnızca önbellek/yedek) ya da 'modül.fonksiyon' biçiminde
+°C döndüren bir çağrılabilir olabilir; kod içinden set_provider() ile de
+verilebilir (ör. yerel sahte sağlayıcı).
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FALLBACK = 18.0
+
+
+def online_temperature(timeout=2):
+    """IP konumundan Open-Meteo anlık sıcaklığı (°C); engelleyicidir, hata verirse istisna."""
+    import requests # Hava durumu için
+    print("Konum ve hava durumu alınıyor...")
+    # 1. Konum Bul (IP-API)
+    loc_resp = requests.get("http://ip-api.com/json/", timeout=timeout)
+    if loc_resp.status_code != 200:
+        raise RuntimeError("Konum API hatası")
+    data = loc_resp.json()
+    lat, lon, city = data['lat'], data['lon'], data['city']
+    print(f"Konum: {city} ({lat}, {lon})")
+    # 2. Sıcaklık Çek (Open-Meteo)
+    weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
+    w_resp = requests.get(weather_url, timeout=timeout)
+    if w_resp.status_code != 200:
+        raise RuntimeError("Hava durumu API hatası")
+    temp = float(w_resp.json()['current_weather']['temperature'])
+    print(f"İnternetten Çekilen Sıcaklık: {temp}°C")
+    return temp
+
+
+def provider_from_name(name):
+    """
+    'online' / 'off' / 'modül.fonksiyon' -> çağrılabilir ya da None (ağ yok).
+    Bulunamayan sağlayıcı simülasyonu durdurmaz: uyarı yazılır ve 'off' gibi
+    yalnızca önbellek/yedek değer kullanılır.
+    """
+    if not name or name == 'off':
+        return None
+    if name == 'online':
+        return online_temperature
+    module, _, func = name.rpartition('.')
+    try:
+        return getattr(importlib.import_module(module), func)
+    except (ImportError, AttributeError, ValueError) as e:
+        print(f"Hava durumu sağlayıcısı '{name}' yüklenemedi ({e}), önbellek/yedek değer kullanılıyor.")
+        return None
+
+
+class WeatherLookup:
+    def __init__(self, provider=online_temperature, cache_path=None, ttl_s=3600.0, fallback=DEFAULT_FALLBACK,
+                 clock=time.time):
+        self.provider = provider
+        self.cache_path = cache_path
+        self.ttl_s = float(ttl_s)
+        self.fallback = fallback
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.thread = None
+        self.value = None
+        self.stamp = None
+        self._read_cache()
+
+    @classmethod
+    def from_settings(cls, settings, provider=None):
+        if provider is None:
+            provider = provider_from_name(getattr(settings, 'WEATHER_PROVIDER', 'online'))
+        path = getattr(settings, 'WEATHER_CACHE', 'weather_cache.json')
+        if path and not os.path.isabs(path):
+            path = os.path.join(HERE, path)
+        return cls(provider, path or None,
+                   ttl_s=getattr(settings, 'WEATHER_CACHE_TTL_MIN', 60) * 60.0,
+                   fallback=getattr(settings, 'WEATHER_FALLBACK_TEMP', DEFAULT_FALLBACK))
+
+    def _read_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            self.value, self.stamp = float(data['temp']), float(data['time'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _write_cache(self):
+        if not self.cache_path:
+            return
+        tmp = self.cache_path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({'temp': self.value, 'time': self.stamp}, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Hava durumu önbelleği yazılamadı: {e}")
+
+    def fresh(self):
+        return self.stamp is not None and self.clock() - self.stamp < self.ttl_s
+
+    def refresh(self):
+        """Sağlayıcıyı bu iş parçacığında çağırır; başarılıysa önbelleği günceller."""
+        if self.provider is None:
+            return None
+        try:
+            temp = float(self.provider())
+        except Exception as e:
+            print(f"Hava durumu alınamadı ({e}). Önbellek/varsayılan değer kullanılıyor.")
+            return None
+        with self.lock:
+            self.value, self.stamp = temp, self.clock()
+            self._write_cache()
+        return temp
+
+    def prefetch(self):
+        """Önbellek eskiyse arka planda tek bir yenileme başlatır (beklemez)."""
+        with self.lock:
+            if self.provider is None or self.fresh() or (self.thread is not None and self.thread.is_alive()):
+                return
+            self.thread = threading.Thread(target=self.refresh, name="weather", daemon=True)
+            self.thread.start()
+
+    def temperature(self):
+        """Hemen döner: önbellekteki son değer ya da yedek; gerekirse yenileme başlar."""
+        self.prefetch()
+        with self.lock:
+            value = self.value
+        if value is not None:
+            return value
+        # Yedek: ruhsat raporlarına göre 15-20 derece arası ideal başlangıç; sabit
+        # değer aynı SIM_SEED ile aynı koşuyu verir
+        return float(self.fallback) if self.fallback is not None else DEFAULT_FALLBACK
+
+
+_lookup = None
+
+
+def lookup():
+    """Yüklü ayarlarla kurulan ortak sorgulayıcı."""
+    global _lookup
+    if _lookup is None:
+        _lookup = WeatherLookup.from_settings(sys.modules.get("settings"))
+    return _lookup
+
+
+def set_provider(provider):
+    """Sağlayıcıyı değiştirir (None: ağ yok); önbellek korunur."""
+    lookup().provider = provider
+
+
+def current_temperature():
+    return lookup().temperature()
+
+
+def prefetch():
+    lookup().prefetch()